@@ -0,0 +1,104 @@
+"""
+Run the benchmarks of the hot paths on synthetic toolsets of increasing size.
+
+Run with `python -m benchmarks`, optionally saving the results as a baseline with
+`--save baseline.json`, or comparing them with a stored baseline with `--compare baseline.json`
+(exiting with status 1 if any benchmark is slower than the baseline by more than `--threshold`).
+"""
+
+import argparse
+import json
+import sys
+from typing import Callable, Optional
+
+from tool2schema import (
+    DumpToolEnabledSchemas,
+    FindToolEnabled,
+    FindToolEnabledSchemas,
+    LoadToolEnabled,
+)
+from tool2schema.schema import FunctionSchema, _validate_arguments
+
+from .harness import HEADER, compare, format_result, measure, save_baseline
+from .toolset import make_call, make_toolset
+
+
+def benchmarks(n: int, samples: int) -> dict[str, tuple[Callable[[int], object], int]]:
+    """
+    Create the benchmarks for a toolset of `n` functions.
+
+    :param n: Number of functions in the toolset
+    :param samples: Number of samples of the operations on a single function
+    :return: A dictionary with benchmark names as keys, and tuples consisting of the operation
+        and the number of samples as values
+    """
+    module = make_toolset(n)
+    tools = FindToolEnabled(module)
+    calls = [make_call(x) for x in tools]
+    arguments = [json.loads(x["arguments"]) for x in calls]
+    loaded = [LoadToolEnabled(module, x)[1] for x in calls]
+
+    # Operations on the whole toolset are run fewer times on large toolsets
+    module_samples = max(5, samples // n)
+
+    return {
+        # Creating the schema of a function from scratch (signature and docstring inspection)
+        "schema_create": (
+            lambda i: FunctionSchema(tools[i % n].func, tools[i % n].config).to_json(),
+            samples,
+        ),
+        "to_json": (lambda i: tools[i % n].to_json(), samples),
+        "FindToolEnabledSchemas": (lambda i: FindToolEnabledSchemas(module), module_samples),
+        "DumpToolEnabledSchemas": (lambda i: DumpToolEnabledSchemas(module), module_samples),
+        "LoadToolEnabled": (lambda i: LoadToolEnabled(module, calls[i % n]), samples),
+        "_validate_arguments": (
+            lambda i: _validate_arguments(tools[i % n], dict(arguments[i % n]), True),
+            samples,
+        ),
+        "ToolEnabled.__call__": (lambda i: tools[i % n](**loaded[i % n]), samples),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000],
+        help="Number of functions in the synthetic toolsets",
+    )
+    parser.add_argument(
+        "--samples", type=int, default=20000,
+        help="Number of samples of the operations on a single function",
+    )
+    parser.add_argument("--filter", help="Only run the benchmarks whose name contains this text")
+    parser.add_argument("--save", metavar="PATH", help="Save the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Compare the results with a baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="Relative slowdown reported as a regression when comparing (default: 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    results: dict[str, dict] = {}
+    print(HEADER)
+
+    for n in args.sizes:
+        for name, (op, samples) in benchmarks(n, args.samples).items():
+            name = f"{name}[{n}]"
+
+            if args.filter and args.filter not in name:
+                continue
+
+            results[name] = measure(op, samples)
+            print(format_result(name, results[name]), flush=True)
+
+    if args.save:
+        save_baseline(args.save, results)
+
+    if args.compare and compare(args.compare, results, args.threshold):
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
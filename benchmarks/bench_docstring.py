@@ -0,0 +1,67 @@
+"""
+Compare the single-pass docstring parser with extracting each description using regular
+expressions, on docstrings of increasing size up to 50 KB. The time per KB of the single-pass
+parser should remain roughly constant, showing that parsing scales linearly.
+
+Run with `python -m benchmarks.bench_docstring`.
+"""
+
+import re
+import timeit
+
+from tool2schema.docstring import Docstring
+
+LINE = "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor. "
+
+
+def make_docstring(size: int) -> tuple[str, list[str]]:
+    """
+    Create a docstring of approximately `size` bytes, with a parameter every 200 bytes.
+    """
+    lines, params = ["Function description.\n"], []
+
+    while sum(len(x) for x in lines) < size:
+        params.append(f"p{len(params)}")
+        lines.append(f"    :param {params[-1]}: {LINE}\n        {LINE}\n")
+
+    return "".join(lines), params
+
+
+def parse_regex(docstring: str, params: list[str]) -> None:
+    """
+    Extract the function description and each parameter description with regular expressions.
+    """
+    text = " ".join([x.strip() for x in docstring.replace("\n", " ").split()])
+    re.findall(r"(.*?):param", text)
+
+    for param in params:
+        text = " ".join([x.strip() for x in docstring.replace("\n", " ").split()])
+        for name, desc in re.findall(
+            r":param ([^:]*): (.*?)(?=:param|:type|:return|:rtype|$)", text
+        ):
+            if name == param and desc:
+                break
+
+
+def main():
+    print(
+        f"{'size (KB)':>10} {'params':>7} {'regex (ms)':>11} "
+        f"{'single-pass (ms)':>17} {'us/KB':>7}"
+    )
+
+    for kb in (1, 5, 10, 25, 50):
+        docstring, params = make_docstring(kb * 1024)
+        number = max(1, 50 // kb)
+
+        regex = timeit.timeit(lambda: parse_regex(docstring, params), number=number) / number
+        single = timeit.timeit(lambda: Docstring.parse.__wrapped__(docstring), number=number)
+        single /= number
+
+        print(
+            f"{kb:>10} {len(params):>7} {regex * 1e3:>11.2f} {single * 1e3:>17.3f} "
+            f"{single * 1e6 / kb:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
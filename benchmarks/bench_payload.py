@@ -0,0 +1,72 @@
+"""
+Compare loading tool calls with large argument payloads (about 1 MB) given as a dictionary,
+as Anthropic `tool_use` blocks are, when the arguments are deep-copied before validation
+(as `LoadToolEnabled` used to do) and with the current copy-free validation.
+
+Run with `python -m benchmarks.bench_payload`.
+"""
+
+import copy
+import json
+import timeit
+
+from tool2schema import EnableTool, LoadToolEnabled
+from tool2schema.schema import _validate_arguments
+
+from .toolset import make_toolset
+
+
+@EnableTool
+def ingest(rows: list[list[float]], labels: list[str], metadata: dict, batch: int = 0):
+    """
+    Ingest a batch of rows.
+
+    :param rows: Values of each row
+    :param labels: Label of each row
+    :param metadata: Additional metadata
+    :param batch: Number of the batch
+    """
+    return len(rows)
+
+
+def make_payload(size: int) -> dict:
+    """
+    Create the arguments of `ingest`, of approximately `size` bytes when serialised to JSON.
+    """
+    rows, labels = [], []
+    row = [0.125 * i for i in range(16)]
+
+    while len(rows) * (len(json.dumps(row)) + 12) < size:
+        rows.append(list(row))
+        labels.append(f"row-{len(rows)}")
+
+    return {"rows": rows, "labels": labels, "metadata": {"source": "benchmark"}, "batch": 1}
+
+
+def load_deepcopy(module, function: dict):
+    """
+    Load a tool call deep-copying the arguments before validating them.
+    """
+    arguments = copy.deepcopy(function["arguments"])
+    return ingest, _validate_arguments(ingest, arguments, True)
+
+
+def main():
+    module = make_toolset(0)
+    module.ingest = ingest
+
+    print(f"{'payload (KB)':>12} {'deepcopy (ms)':>14} {'copy-free (ms)':>15} {'speedup':>8}")
+
+    for kb in (16, 128, 1024):
+        arguments = make_payload(kb * 1024)
+        function = {"name": "ingest", "arguments": arguments}
+        number = max(5, 1024 // kb)
+
+        deep = timeit.timeit(lambda: load_deepcopy(module, function), number=number) / number
+        free = timeit.timeit(lambda: LoadToolEnabled(module, function), number=number) / number
+
+        print(f"{kb:>12} {deep * 1e3:>14.2f} {free * 1e3:>15.3f} {deep / free:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Measure the time taken to select the most relevant tools for a query with `RelevanceIndex`,
+for toolsets of increasing size, with a query sharing few terms with the tools and a query
+sharing terms with every tool (the worst case).
+
+Run with `python -m benchmarks.bench_relevance`.
+"""
+
+import timeit
+
+from tool2schema import RelevanceIndex
+
+from .toolset import make_toolset
+
+QUERIES = {
+    "selective": "please update the priority of tool 12 to high",
+    "worst": "value constraints interacts others tool number sentence detail",
+}
+
+
+def main():
+    print(f"{'tools':>6} {'build (ms)':>11} " + " ".join(f"{x + ' (us)':>15}" for x in QUERIES))
+
+    for n in (100, 400, 1600):
+        module = make_toolset(n)
+        build = timeit.timeit(lambda: RelevanceIndex(module), number=1)
+        index = RelevanceIndex(module)
+        times = []
+
+        for query in QUERIES.values():
+            index.search(query)  # Compute the weights of the terms
+            times.append(timeit.timeit(lambda: index.search(query), number=200) / 200)
+
+        print(f"{n:>6} {build * 1e3:>11.1f} " + " ".join(f"{x * 1e6:>15.1f}" for x in times))
+
+
+if __name__ == "__main__":
+    main()
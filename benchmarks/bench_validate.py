@@ -0,0 +1,81 @@
+"""
+Compare the compiled arguments validator used by `LoadToolEnabled` with validating
+each argument through the parameter type schemas.
+
+Run with `python -m benchmarks.bench_validate`.
+"""
+
+import timeit
+from inspect import Parameter
+from typing import Literal, Optional, Union
+
+from tool2schema import EnableTool
+from tool2schema.schema import ParseException, ToolEnabled, _validate_arguments
+
+# Parameter types and a valid value for each of them
+PARAMETER_TYPES = [
+    (int, 1),
+    (str, "a"),
+    (float, 1.5),
+    (Optional[int], None),
+    (list[int], [1, 2, 3]),
+    (Literal["a", "b"], "b"),
+    (Union[int, str], "x"),
+]
+
+
+def make_tool(n: int) -> tuple[ToolEnabled, dict]:
+    """
+    Create a tool with `n` parameters, and a dictionary of valid arguments for it.
+    """
+    namespace = {f"T{i}": t for i, (t, _) in enumerate(PARAMETER_TYPES)}
+    params = ", ".join(f"p{i}: T{i % len(PARAMETER_TYPES)}" for i in range(n))
+    exec(f"def tool_{n}({params}):\n    return None", namespace)
+
+    arguments = {f"p{i}": PARAMETER_TYPES[i % len(PARAMETER_TYPES)][1] for i in range(n)}
+    return EnableTool(namespace[f"tool_{n}"]), arguments
+
+
+def validate_arguments_uncompiled(f: ToolEnabled, arguments: dict) -> dict:
+    """
+    Validate the arguments by traversing the parameter schemas on every call.
+    """
+    validated = {}
+
+    for key, param in f.schema.parameter_schemas.items():
+        value = arguments.pop(key, Parameter.empty)
+
+        if value == Parameter.empty:
+            if param.parameter.default == Parameter.empty:
+                raise ParseException(f"Required argument '{key}' is missing")
+        else:
+            if not param.type_schema.validate(value):
+                raise ParseException(f"Argument '{key}' cannot accept value '{value}'")
+
+            validated[key] = value
+
+    return validated
+
+
+def main():
+    print(f"{'arguments':>10} {'uncompiled (us)':>16} {'compiled (us)':>14} {'speedup':>8}")
+
+    for n in (10, 100, 1000):
+        f, arguments = make_tool(n)
+        number = max(10, 20000 // n)
+
+        uncompiled = timeit.timeit(
+            lambda: validate_arguments_uncompiled(f, dict(arguments)), number=number
+        )
+        compiled = timeit.timeit(
+            lambda: _validate_arguments(f, dict(arguments), True), number=number
+        )
+
+        print(
+            f"{n:>10} {uncompiled / number * 1e6:>16.1f} "
+            f"{compiled / number * 1e6:>14.1f} {uncompiled / compiled:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Measurement of benchmark operations, and comparison of the results with a stored baseline.
+"""
+
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+import tool2schema
+
+# Percentiles of the latency reported for each benchmark
+PERCENTILES = (50, 90, 99)
+
+# Header of the results table, see `format_result`
+HEADER = (
+    f"{'benchmark':<40} {'ops/s':>12} "
+    + " ".join(f"{f'p{p} (us)':>9}" for p in PERCENTILES)
+    + f" {'peak (B/op)':>11} {'retained (B/op)':>15}"
+)
+
+
+def measure(op: Callable[[int], object], samples: int, alloc_samples: int = 200) -> dict:
+    """
+    Measure an operation, which is called with the index of the sample (so that consecutive
+    samples may operate on different functions of a toolset).
+
+    :param op: The operation to measure
+    :param samples: Number of times to run the operation when measuring its latency
+    :param alloc_samples: Number of times to run the operation when measuring its allocations,
+        which are measured separately since tracing allocations slows down the operation
+    :return: A dictionary with the throughput (operations per second), the latency
+        percentiles (in microseconds), and the bytes allocated per operation
+    """
+    for i in range(min(samples, 100)):
+        op(i)  # Warm up
+
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        for i in range(samples):
+            start = time.perf_counter_ns()
+            op(i)
+            timings.append(time.perf_counter_ns() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    timings.sort()
+    result = {"ops_per_sec": samples / (sum(timings) / 1e9)}
+
+    for p in PERCENTILES:
+        result[f"p{p}_us"] = timings[min(samples - 1, samples * p // 100)] / 1e3
+
+    alloc_samples = min(samples, alloc_samples)
+    peak, retained = 0, 0
+    tracemalloc.start()
+
+    try:
+        for i in range(alloc_samples):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            op(i)
+            current, highest = tracemalloc.get_traced_memory()
+            peak += highest - before
+            retained += current - before
+    finally:
+        tracemalloc.stop()
+
+    # Peak memory allocated while running the operation, and memory still allocated
+    # after it (e.g. the returned value and any cache entries it created)
+    result["peak_bytes"] = peak / alloc_samples
+    result["retained_bytes"] = retained / alloc_samples
+    return result
+
+
+def environment() -> dict:
+    """
+    Describe the environment the benchmarks run in, stored alongside the results.
+    """
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "tool2schema": tool2schema.__version__,
+    }
+
+
+def save_baseline(path: str, results: dict[str, dict]) -> None:
+    """
+    Save the benchmark results as a baseline.
+
+    :param path: Path of the baseline file
+    :param results: Dictionary with benchmark names as keys and measurements as values
+    """
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+
+
+def compare(baseline_path: str, results: dict[str, dict], threshold: float) -> list[str]:
+    """
+    Compare the benchmark results with a stored baseline. The median latency is compared,
+    being less sensitive to outliers than the throughput.
+
+    :param baseline_path: Path of the baseline file
+    :param results: Dictionary with benchmark names as keys and measurements as values
+    :param threshold: Relative slowdown above which a benchmark is reported as a regression
+    :return: The names of the benchmarks that regressed
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+
+    regressions = []
+    print(f"\n{'benchmark':<40} {'baseline p50 (us)':>18} {'current p50 (us)':>17} {'change':>8}")
+
+    for name, result in results.items():
+        if (base := baseline.get(name)) is None:
+            continue
+
+        change = result["p50_us"] / base["p50_us"] - 1
+        flag = ""
+
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+
+        print(
+            f"{name:<40} {base['p50_us']:>18.1f} {result['p50_us']:>17.1f} "
+            f"{change:>+7.1%}{flag}"
+        )
+
+    return regressions
+
+
+def format_result(name: str, result: dict) -> str:
+    """
+    Format a measurement as a row of the results table, see `HEADER`.
+    """
+    percentiles = " ".join(f"{result[f'p{p}_us']:>9.1f}" for p in PERCENTILES)
+    return (
+        f"{name:<40} {result['ops_per_sec']:>12,.0f} {percentiles} "
+        f"{result['peak_bytes']:>11,.0f} {result['retained_bytes']:>15,.0f}"
+    )
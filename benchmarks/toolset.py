@@ -0,0 +1,110 @@
+"""
+Synthetic toolsets used by the benchmarks, consisting of functions with a realistic mix of
+parameter types (`Literal`, `Enum`, `Optional`, `Union` and nested `list`) and long docstrings.
+"""
+
+import json
+import random
+import sys
+from enum import Enum
+from types import ModuleType
+from typing import Literal, Optional, Union
+
+from tool2schema import EnableTool
+
+
+class Colour(Enum):
+    RED = 0
+    GREEN = 1
+    BLUE = 2
+
+
+class Priority(Enum):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    URGENT = "urgent"
+
+
+# Parameter types, each with a valid JSON value, and their relative frequency
+PARAMETER_TYPES = [
+    (int, 42, 6),
+    (str, "the quick brown fox", 8),
+    (float, 3.5, 3),
+    (bool, True, 3),
+    (Optional[int], None, 3),
+    (Optional[str], "value", 3),
+    (Literal["asc", "desc"], "desc", 2),
+    (Literal[1, 2, 3, 5, 8], 5, 1),
+    (Colour, "GREEN", 2),
+    (Optional[Priority], "HIGH", 2),
+    (Union[int, str], "mixed", 2),
+    (list[int], [1, 2, 3, 4], 2),
+    (list[list[str]], [["a", "b"], ["c"]], 1),
+    (Optional[list[float]], [1.0, 2.5], 1),
+]
+
+SENTENCE = (
+    "This sentence pads the docstring to a realistic length, describing in some detail what "
+    "the value is used for, which constraints apply and how it interacts with the others. "
+)
+
+
+def make_toolset(n: int, seed: int = 0) -> ModuleType:
+    """
+    Create a module containing `n` functions with the EnableTool decorator. Each function
+    has between 1 and 12 parameters, and is tagged with one of 8 tags.
+
+    :param n: Number of functions
+    :param seed: Seed of the random generator, so that toolsets are reproducible
+    :return: A module, registered in `sys.modules` so that it can be imported by name
+    """
+    rng = random.Random(seed)
+    types = [t for t, _, _ in PARAMETER_TYPES]
+    weights = [w for _, _, w in PARAMETER_TYPES]
+
+    module = ModuleType(f"benchmarks.toolset_{n}_{seed}")
+    namespace = module.__dict__
+    namespace.update({f"T{i}": t for i, t in enumerate(types)})
+    namespace["EnableTool"] = EnableTool
+
+    for i in range(n):
+        indices = rng.choices(range(len(types)), weights, k=rng.randint(1, 12))
+        params = [f"p{j}: T{t}" for j, t in enumerate(indices)]
+
+        # Parameters after the first half are optional
+        for j in range(len(params) // 2, len(params)):
+            params[j] += f" = {PARAMETER_TYPES[indices[j]][1]!r}"
+
+        docstring = "\n".join(
+            [f"Tool number {i}. {SENTENCE * rng.randint(1, 4)}", ""]
+            + [f":param p{j}: {SENTENCE * rng.randint(1, 3)}" for j in range(len(params))]
+        )
+
+        source = (
+            f"@EnableTool(tags=['tag{i % 8}'])\n"
+            f"def tool_{i}({', '.join(params)}):\n"
+            f"    {docstring!r}\n"
+            f"    return None\n"
+        )
+        exec(source, namespace)
+
+    sys.modules[module.__name__] = module
+    return module
+
+
+def make_call(tool) -> dict:
+    """
+    Create a tool call with valid arguments for all parameters of the given function,
+    in the format returned by the OpenAI API (with the arguments serialised to JSON).
+
+    :param tool: Function with the EnableTool decorator
+    :return: A function dictionary, as accepted by `LoadToolEnabled`
+    """
+    types = [t for t, _, _ in PARAMETER_TYPES]
+    arguments = {}
+
+    for n, annotation in tool.func.__annotations__.items():
+        arguments[n] = PARAMETER_TYPES[types.index(annotation)][1]
+
+    return {"name": tool.__name__, "arguments": json.dumps(arguments)}
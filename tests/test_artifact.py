@@ -0,0 +1,188 @@
+import copy
+import typing
+
+import pytest
+
+from tool2schema import (
+    EnableTool,
+    FindToolEnabledSchemas,
+    LoadToolArtifact,
+    LoadToolEnabled,
+    SchemaType,
+    ToolArtifact,
+    ToolRegistry,
+    Toolset,
+    type_schema,
+)
+from tool2schema.__main__ import main
+from tool2schema.artifact import BuildToolArtifact, compile_plan
+from tool2schema.schema import ParseException
+from tool2schema.type_schema import TypeSchema
+
+from . import functions
+
+
+class Point:
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+
+
+@EnableTool
+def function_point(p: Point, n: int = 0):
+    """
+    This function has a parameter whose type schema does not support validation plans.
+
+    :param p: This is a parameter
+    :param n: This is another parameter
+    """
+    return p.x + p.y + n
+
+
+@pytest.fixture(scope="module")
+def artifact(tmp_path_factory) -> ToolArtifact:
+    path = tmp_path_factory.mktemp("artifact") / "tools.t2s"
+    assert main(["build", functions.__name__, "-o", str(path)]) == 0
+    return LoadToolArtifact(str(path))
+
+
+###########################
+#  Test artifact schemas  #
+###########################
+
+
+@pytest.mark.parametrize("schema_type", [None] + [schema for schema in SchemaType])
+def test_artifact_schemas(artifact, schema_type):
+    assert artifact.schemas(schema_type) == FindToolEnabledSchemas(functions, schema_type)
+
+
+def test_artifact_unsupported_format():
+    data = BuildToolArtifact(functions)
+    data["format"] = -1
+
+    with pytest.raises(ValueError):
+        ToolArtifact(data)
+
+
+###################################
+#  Test loading from an artifact  #
+###################################
+
+
+@pytest.mark.parametrize(
+    "function, arguments",
+    [
+        (functions.function, {"a": 1, "b": "test", "c": True, "d": [4, 5]}),
+        (functions.function, {"a": 1, "b": "test"}),
+        (functions.function_float, {"a": 1}),
+        (functions.function_no_params, {}),
+        (functions.function_literal, {"a": 1, "b": "b"}),
+        (functions.function_enum, {"a": functions.CustomEnum.Y.name}),
+        (functions.function_add_enum, {"a": "MAYBE"}),
+        (functions.function_union, {"a": None, "b": 1}),
+    ],
+)
+def test_artifact_load(artifact, function, arguments):
+    f_dict = {"name": function.__name__, "arguments": {**arguments, "hallucinated": 1}}
+
+    f, args = artifact.load(copy.deepcopy(f_dict))
+    assert (function, args) == LoadToolEnabled(functions, copy.deepcopy(f_dict))
+    assert f.resolve() is function
+    assert f(**args) == function(**args)
+
+    with pytest.raises(ParseException):
+        artifact.load(f_dict, ignore_hallucinations=False)
+
+
+@pytest.mark.parametrize(
+    "function, arguments",
+    [
+        (functions.function, {"a": 1}),
+        (functions.function, {"a": "x", "b": "test"}),
+        (functions.function, {"a": 1, "b": "", "c": True, "d": [1, "a"]}),
+        (functions.function_literal, {"a": 3}),
+        (functions.function_enum, {"a": "A"}),
+        (functions.function_add_enum, {"a": "PERHAPS"}),
+        (functions.function_union, {"a": "x", "b": 1}),
+    ],
+)
+def test_artifact_load_invalid(artifact, function, arguments):
+    with pytest.raises(ParseException):
+        artifact.load({"name": function.__name__, "arguments": arguments})
+
+
+@pytest.fixture
+def restore_type_schemas():
+    type_schemas = list(type_schema.TYPE_SCHEMAS)
+    yield
+    type_schema.TYPE_SCHEMAS[:] = type_schemas
+    type_schema.RESOLVED_TYPE_SCHEMAS.clear()
+
+
+def test_artifact_load_import_plan(restore_type_schemas):
+    @type_schema.ToolTypeSchema
+    class PointTypeSchema(TypeSchema):
+        @staticmethod
+        def matches(p_type) -> bool:
+            return p_type is Point
+
+        def _get_type(self) -> dict:
+            return {"type": "array", "items": {"type": "integer"}}
+
+        def validate(self, value) -> bool:
+            return type(value) is list and len(value) == 2
+
+        def decode(self, value):
+            return Point(*value)
+
+    # The parameter without a validation plan is validated by importing the function
+    data = BuildToolArtifact(Toolset(function_point))
+    assert [x[2] for x in data["tools"][0]["parameters"]] == [["import"], ["value", "builtins.int"]]
+
+    artifact = ToolArtifact(data)
+    f, args = artifact.load({"name": "function_point", "arguments": {"p": [1, 2]}})
+    assert f.resolve() is function_point
+    assert f(**args) == 3
+
+    with pytest.raises(ParseException):
+        artifact.load({"name": "function_point", "arguments": {"p": [1, 2, 3]}})
+
+
+def test_artifact_load_missing_function(artifact):
+    with pytest.raises(ParseException):
+        artifact.load({"name": functions.function_not_enabled.__name__, "arguments": {}})
+
+
+##############################
+#  Test artifact validation  #
+##############################
+
+# Type annotations not used in the test functions
+OTHER_TYPES = [
+    dict,
+    dict[str, int],
+    typing.Dict[str, int],
+    typing.Any,
+    list[dict[str, int]],
+    typing.Optional[dict[str, int]],
+]
+
+VALUES = [None, True, 0, 1.5, "a", "Y", "MAYBE", [], [1, 2], [1, "a"], {}, {"x": 1}]
+
+
+@pytest.mark.parametrize(
+    "type_schema",
+    [
+        p.type_schema
+        for tool in ToolRegistry.of(functions)
+        for p in tool.schema.parameter_schemas.values()
+    ]
+    + [TypeSchema.create(t) for t in OTHER_TYPES],
+)
+def test_artifact_validation(type_schema):
+    # Plans compiled from an artifact validate values in the same way as the type schemas
+    validate = compile_plan(type_schema.plan())
+    validator = type_schema.validator()
+
+    for value in VALUES:
+        assert validate(value) == validator(value) == type_schema.validate(value), value
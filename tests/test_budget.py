@@ -0,0 +1,162 @@
+import json
+
+import pytest
+
+from tool2schema import (
+    BudgetUnit,
+    DumpToolEnabledSchemas,
+    EnableTool,
+    EstimateTokens,
+    FitToolEnabledSchemas,
+    SchemaType,
+    TrimStep,
+)
+
+from . import functions
+
+
+@EnableTool
+def search(query: str, limit: int = 10, language: str = "en"):
+    """
+    Search the knowledge base for articles. The search is performed on the title and the body
+    of the articles, and the most relevant articles are returned first.
+
+    :param query: Text to search for. Any word of the text may appear in the articles found.
+    :param limit: Maximum number of articles to return, which is ten unless specified otherwise
+    :param language: Language of the articles to search, as a two letter code
+    """
+
+
+@EnableTool
+def ping():
+    """
+    Check that the service is up.
+    """
+
+
+TOOLS = [search, ping]
+
+
+def steps(fitted) -> list[tuple[str, TrimStep]]:
+    return [(x.function, x.step) for x in fitted.trimmed]
+
+
+#########################
+#  Test EstimateTokens  #
+#########################
+
+
+@pytest.mark.parametrize(
+    "text, tokens",
+    [
+        ("", 0),
+        ("word", 1),
+        ("a longer sentence", 4),
+        ("12345", 2),
+        ('{"a":1}', 5),
+        ("line\n\nline", 3),
+    ],
+)
+def test_estimate_tokens(text, tokens):
+    assert EstimateTokens(text) == tokens
+
+
+################################
+#  Test FitToolEnabledSchemas  #
+################################
+
+
+def test_fit_within_budget():
+    payload = DumpToolEnabledSchemas(TOOLS)
+    fitted = FitToolEnabledSchemas(TOOLS, EstimateTokens(payload))
+
+    assert fitted.payload == payload
+    assert fitted.schemas == [x.to_json() for x in TOOLS]
+    assert fitted.size == EstimateTokens(payload)
+    assert fitted.fits
+    assert fitted.trimmed == []
+
+
+@pytest.mark.parametrize("schema_type", list(SchemaType))
+def test_fit_steps(schema_type):
+    size = EstimateTokens(DumpToolEnabledSchemas(TOOLS, schema_type))
+    fitted = FitToolEnabledSchemas(TOOLS, size - 1, schema_type)
+
+    # The largest schema is trimmed first, only as much as needed
+    assert fitted.fits
+    assert steps(fitted) == [("search", TrimStep.TRUNCATE_DESCRIPTIONS)]
+    assert json.loads(fitted.payload) == fitted.schemas
+    assert fitted.size == EstimateTokens(fitted.payload) <= size - 1
+    assert fitted.trimmed[0].saved == size - fitted.size
+
+    description = json.dumps(fitted.schemas[0])
+    assert "Search the knowledge base for articles." in description
+    assert "most relevant articles" not in description
+    assert "Any word of the text" not in description
+
+    # Trimming the schemas does not modify the schemas of the functions
+    assert search.to_json(schema_type) != fitted.schemas[0]
+    assert ping.to_json(schema_type) == fitted.schemas[1]
+
+
+def test_fit_all_steps():
+    fitted = FitToolEnabledSchemas(TOOLS, 0)
+
+    assert not fitted.fits
+    assert steps(fitted) == [
+        ("search", TrimStep.TRUNCATE_DESCRIPTIONS),
+        ("search", TrimStep.DROP_DEFAULTS),
+        ("search", TrimStep.DROP_OPTIONAL_PARAMETER_DESCRIPTIONS),
+        ("search", TrimStep.DROP_PARAMETER_DESCRIPTIONS),
+        ("search", TrimStep.DROP_FUNCTION_DESCRIPTIONS),
+        ("ping", TrimStep.DROP_FUNCTION_DESCRIPTIONS),
+    ]
+    assert fitted.schemas == [
+        {
+            "type": "function",
+            "function": {
+                "name": "search",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string"},
+                        "limit": {"type": "integer"},
+                        "language": {"type": "string"},
+                    },
+                    "required": ["query"],
+                },
+            },
+        },
+        {"type": "function", "function": {"name": "ping"}},
+    ]
+
+
+def test_fit_custom_steps():
+    fitted = FitToolEnabledSchemas(
+        TOOLS, 0, steps=[TrimStep.DROP_DEFAULTS, TrimStep.DROP_OPTIONAL_PARAMETER_DESCRIPTIONS]
+    )
+
+    assert steps(fitted) == [
+        ("search", TrimStep.DROP_DEFAULTS),
+        ("search", TrimStep.DROP_OPTIONAL_PARAMETER_DESCRIPTIONS),
+    ]
+    properties = fitted.schemas[0]["function"]["parameters"]["properties"]
+    assert properties["query"]["description"].startswith("Text to search for. Any word")
+    assert "description" not in properties["limit"]
+
+
+def test_fit_bytes():
+    payload = DumpToolEnabledSchemas(functions)
+    fitted = FitToolEnabledSchemas(functions, len(payload) - 100, unit=BudgetUnit.BYTES)
+
+    assert fitted.fits
+    assert fitted.size == len(fitted.payload.encode()) <= len(payload) - 100
+    assert sum(x.saved for x in fitted.trimmed) == len(payload) - fitted.size
+
+
+def test_fit_estimator():
+    # Count words rather than tokens
+    fitted = FitToolEnabledSchemas(TOOLS, 40, estimator=lambda x: len(x.split()))
+
+    assert fitted.fits
+    assert len(fitted.payload.split()) == fitted.size <= 40
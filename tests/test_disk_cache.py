@@ -0,0 +1,221 @@
+import importlib.util
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from enum import Enum
+
+import pytest
+
+from tool2schema import (
+    EnableTool,
+    SchemaDiskCache,
+    SchemaType,
+    SetJsonBackend,
+    disk_cache,
+    json_backend,
+)
+from tool2schema.disk_cache import fingerprint
+
+
+def function(a: int, b: str = "b"):
+    """
+    This is a test function.
+
+    :param a: This is a parameter
+    :param b: This is another parameter
+    """
+    pass
+
+
+def function_defaults(when: date = date(2020, 1, 1), point: tuple = (1, 2)):
+    """
+    This is a test function with default values which are not JSON values.
+
+    :param when: This is a parameter
+    :param point: This is another parameter
+    """
+    pass
+
+
+@pytest.fixture
+def cache(tmp_path) -> SchemaDiskCache:
+    return SchemaDiskCache(str(tmp_path / "cache"))
+
+
+#########################
+#  Test cached schemas  #
+#########################
+
+
+def test_cache_miss_then_hit(cache):
+    schema = EnableTool(function, schema_cache=cache).to_json()
+    assert cache.stats() == {"hits": 0, "misses": 1, "writes": 1, "evictions": 0}
+
+    tool = EnableTool(function, schema_cache=cache)
+    assert tool.to_json() == schema
+    assert cache.hits == 1
+
+    # The function signature and docstring were not inspected
+    assert "_all_parameter_schemas" not in tool.schema.__dict__
+    assert "docstring" not in tool.schema.__dict__
+
+
+@pytest.mark.parametrize("schema_type", [schema for schema in SchemaType])
+def test_cache_schema_types(cache, schema_type):
+    expected = EnableTool(function).to_json(schema_type)
+
+    assert EnableTool(function, schema_cache=cache).to_json(schema_type) == expected
+    assert EnableTool(function, schema_cache=cache).to_json(schema_type) == expected
+    assert cache.hits == 1
+
+
+def test_cache_config_changes(cache):
+    EnableTool(function, schema_cache=cache).to_json()
+    tool = EnableTool(function, schema_cache=cache, ignore_parameters=["b"])
+
+    assert "b" not in tool.to_json()["function"]["parameters"]["properties"]
+    assert cache.hits == 0
+
+
+def test_cache_add_enum(cache):
+    EnableTool(function, schema_cache=cache).to_json()
+    tool = EnableTool(function, schema_cache=cache)
+    tool.schema.add_enum("b", ["x", "y"])
+
+    assert tool.to_json()["function"]["parameters"]["properties"]["b"]["enum"] == ["x", "y"]
+    assert cache.hits == 0
+
+
+def test_cache_unwritable(tmp_path):
+    path = tmp_path / "file"
+    path.write_text("")
+    cache = SchemaDiskCache(str(path / "cache"))  # Cannot create a directory inside a file
+
+    assert EnableTool(function, schema_cache=cache).to_json() == EnableTool(function).to_json()
+    assert cache.writes == 0
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [
+        pytest.param(
+            x,
+            marks=pytest.mark.skipif(
+                x != "stdlib" and importlib.util.find_spec(x) is None, reason=f"{x} not installed"
+            ),
+        )
+        for x in json_backend.BACKENDS
+    ],
+)
+def test_cache_not_json_values(cache, backend):
+    default = json_backend.name
+    SetJsonBackend(backend)
+
+    try:
+        # Schemas which cannot be stored unchanged are built every time instead of cached
+        expected = EnableTool(function_defaults).to_json()
+        assert EnableTool(function_defaults, schema_cache=cache).to_json() == expected
+        assert EnableTool(function_defaults, schema_cache=cache).to_json() == expected
+        assert cache.writes == 0
+    finally:
+        SetJsonBackend(default)
+
+
+def test_cache_concurrent_writes(cache):
+    value = {"name": "function", "values": list(range(1000))}
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda _: cache.put("key", value), range(64)))
+
+    assert cache.get("key") == value
+    assert os.listdir(cache.path) == ["key.json"]  # No temporary files left behind
+
+
+def test_cache_eviction(tmp_path):
+    cache = SchemaDiskCache(str(tmp_path), max_entries=10)
+
+    for i in range(20):
+        cache.put(f"key{i}", i)
+        os.utime(os.path.join(cache.path, f"key{i}.json"), (i, i))
+
+    assert len(os.listdir(cache.path)) <= 10
+    assert cache.evictions >= 10
+    assert cache.get("key19") == 19
+    assert cache.get("key0") is None
+
+
+def test_cache_eviction_scans(tmp_path, monkeypatch):
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or scandir(path))
+
+    cache = SchemaDiskCache(str(tmp_path), max_entries=100)
+
+    for i in range(500):
+        cache.put(f"key{i}", i)
+
+    # The directory is scanned on the first write, then only when the limits may be exceeded,
+    # which is once every 10 writes after evicting down to 90% of the limits
+    assert len(os.listdir(cache.path)) <= 100
+    assert len(scans) <= 1 + 500 // 10
+
+
+def test_cache_eviction_rescan(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "RESCAN_WRITES", 5)
+    cache = SchemaDiskCache(str(tmp_path), max_entries=10)
+    cache.put("key", 0)
+
+    # Entries written by other processes are found when the directory is scanned again
+    other = SchemaDiskCache(str(tmp_path), max_entries=1000)
+    for i in range(20):
+        other.put(f"other{i}", i)
+
+    for i in range(4):
+        cache.put(f"key{i}", i)
+
+    assert len(os.listdir(cache.path)) == 25
+
+    cache.put("key4", 4)
+    assert len(os.listdir(cache.path)) <= 10
+
+
+######################
+#  Test fingerprint  #
+######################
+
+
+def test_fingerprint_changes():
+    def f(a: int):
+        """Description"""
+
+    before = fingerprint(f)
+    assert fingerprint(f) == before
+    assert fingerprint(f, "state") != before
+
+    f.__doc__ = "Other description"
+    assert fingerprint(f) != before
+
+    f.__doc__ = "Description"
+    f.__annotations__["a"] = str
+    assert fingerprint(f) != before
+
+
+def test_fingerprint_enum_members():
+    class A(Enum):
+        X = 0
+
+    def f(a: A):
+        pass
+
+    before = fingerprint(f)
+
+    class A(Enum):  # noqa: F811
+        X = 0
+        Y = 1
+
+    f.__annotations__["a"] = A
+    assert fingerprint(f) != before
+
+
+def test_fingerprint_builtin():
+    assert fingerprint(len) is None
@@ -0,0 +1,106 @@
+import asyncio
+import inspect
+import sys
+import threading
+import time
+from enum import Enum
+
+import pytest
+
+from tool2schema import DispatchToolEnabled, EnableTool
+from tool2schema.schema import AsyncToolEnabled, ParseException
+
+
+class CustomEnum(Enum):
+    A = 1
+    B = 2
+
+
+@EnableTool
+async def async_function(a: CustomEnum, b: int = 0):
+    """
+    This is an async test function.
+
+    :param a: This is a parameter
+    :param b: This is another parameter
+    """
+    await asyncio.sleep(0)
+    return a, b
+
+
+@EnableTool
+async def async_function_slow(a: float):
+    """
+    This is an async test function.
+
+    :param a: Number of seconds to sleep
+    """
+    await asyncio.sleep(a)
+    return a
+
+
+@EnableTool
+def function_thread(a: int):
+    """
+    This is a test function.
+
+    :param a: This is a parameter
+    """
+    return a, threading.current_thread() is threading.main_thread()
+
+
+##########################
+#  Test async functions  #
+##########################
+
+
+def test_async_function():
+    assert isinstance(async_function, AsyncToolEnabled)
+    assert async_function.to_json()["function"]["name"] == "async_function"
+
+    # Verify the arguments are decoded when the function is awaited
+    assert asyncio.run(async_function("A", b=1)) == (CustomEnum.A, 1)
+    assert asyncio.run(async_function(a="B")) == (CustomEnum.B, 0)
+
+    if sys.version_info >= (3, 12):
+        assert inspect.iscoroutinefunction(async_function)
+
+
+##############################
+#  Test DispatchToolEnabled  #
+##############################
+
+
+def test_dispatch():
+    error = ParseException("Invalid tool call")
+    calls = [
+        (async_function, {"a": "A"}),
+        (function_thread, {"a": 1}),
+        error,
+    ]
+
+    results = asyncio.run(DispatchToolEnabled(calls))
+    assert results[0] == (CustomEnum.A, 0)
+    assert results[1] == (1, False)  # Regular functions run in a thread
+    assert results[2] is error
+
+
+def test_dispatch_concurrent():
+    calls = [(async_function_slow, {"a": 0.2}) for _ in range(5)]
+
+    start = time.perf_counter()
+    results = asyncio.run(DispatchToolEnabled(calls))
+    assert results == [0.2] * 5
+    assert time.perf_counter() - start < 0.2 * 5
+
+
+@pytest.mark.parametrize("timeout", [0.05, {"async_function_slow": 0.05}])
+def test_dispatch_timeout(timeout):
+    calls = [(async_function_slow, {"a": 5}), (async_function, {"a": "A"})]
+
+    results = asyncio.run(DispatchToolEnabled(calls, timeout=timeout))
+    assert isinstance(results[0], asyncio.TimeoutError)
+    assert results[1] == (CustomEnum.A, 0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(DispatchToolEnabled(calls, timeout=timeout, return_exceptions=False))
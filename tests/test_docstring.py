@@ -0,0 +1,71 @@
+import random
+import re
+
+import pytest
+
+from tool2schema.docstring import Docstring
+
+from . import test_schema
+
+########################################
+#  Reference (regex-based) extraction  #
+########################################
+
+
+def get_description(docstring: str) -> str:
+    docstring = " ".join([x.strip() for x in docstring.replace("\n", " ").split()])
+    if desc := re.findall(r"(.*?):param", docstring):
+        return desc[0].strip()
+    return docstring.strip()
+
+
+def get_parameters(docstring: str) -> dict[str, str]:
+    docstring = " ".join([x.strip() for x in docstring.replace("\n", " ").split()])
+    params = re.findall(r":param ([^:]*): (.*?)(?=:param|:type|:return|:rtype|$)", docstring)
+    parameters = {}
+    for name, desc in params:
+        if desc and name not in parameters:
+            parameters[name] = desc.strip()
+    return parameters
+
+
+##########################
+#  Test Docstring.parse  #
+##########################
+
+
+@pytest.mark.parametrize(
+    "docstring",
+    [
+        "",
+        "Description only.",
+        "\n    Description.\n\n    :param a: First\n    :param b: Second\n    ",
+        ":param a: No description",
+        ":param a:\n:param b:\n",
+        ":param a: First :param a: Duplicate",
+        ":param a: Text: with colon :type a: int :return: Nothing :rtype: None",
+        ":param a b: Name with space :paramx: Not a parameter :param c:d",
+        "Description :params a: Not a parameter :param b: Second",
+        test_schema.function_docstring.__doc__,
+    ],
+)
+def test_parse(docstring):
+    parsed = Docstring.parse(docstring)
+    assert parsed.description == get_description(docstring)
+    assert parsed.parameters == get_parameters(docstring)
+
+
+def test_parse_cached():
+    docstring = test_schema.function.__doc__
+    assert Docstring.parse(docstring) is Docstring.parse(docstring)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_parse_random(seed):
+    rng = random.Random(seed)
+    tokens = [":param", ":type", ":return", ":rtype", ":", " ", "\n", "a", "b", "c d", "x:"]
+    docstring = "".join(rng.choice(tokens) for _ in range(200))
+
+    parsed = Docstring.parse(docstring)
+    assert parsed.description == get_description(docstring)
+    assert parsed.parameters == get_parameters(docstring)
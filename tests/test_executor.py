@@ -0,0 +1,81 @@
+import asyncio
+import functools
+import os
+import pickle
+
+from tool2schema import DispatchToolEnabled, EnableTool, LoadToolEnabled, ToolExecutor
+
+from . import functions
+
+
+class Worker:
+    def __init__(self, factor: int):
+        self.factor = factor
+
+    @EnableTool(tags=["test"])
+    def scale(self, a: int) -> tuple[int, int]:
+        """
+        Scale a number by the factor of the worker.
+
+        :param a: Number to scale
+        """
+        return self.factor * a, os.getpid()
+
+######################################
+#  Test pickling ToolEnabled objects #
+######################################
+
+
+def test_pickle_by_reference():
+    data = pickle.dumps(functions.function_enum)
+    assert pickle.loads(data) is functions.function_enum
+    # The schema and configuration are not serialised
+    assert b"FunctionSchema" not in data and b"Config" not in data
+
+
+#######################
+#  Test ToolExecutor  #
+#######################
+
+
+def test_executor_routing():
+    with ToolExecutor(tags=["test"], max_workers=1) as executor:
+        assert executor.is_process_bound(functions.function_tags)
+        assert executor.is_process_bound(functools.partial(functions.function_tags, a=1))
+        assert not executor.is_process_bound(functions.function)
+        assert not executor.is_process_bound(os.getpid)
+
+
+def test_executor_submit():
+    f, args = LoadToolEnabled(
+        functions, {"name": "function_tags", "arguments": {"a": 1, "b": "x"}}
+    )
+
+    with ToolExecutor(tags=["test"], max_workers=1) as executor:
+        assert executor.submit(f, **args).result() == (1, "x", False, [1, 2, 3])
+        assert executor.submit(functions.function_enum, "Y").result() == functions.CustomEnum.Y
+
+
+def test_executor_bound_method():
+    worker = Worker(2)
+
+    with ToolExecutor(tags=["test"], max_workers=1) as executor:
+        # Methods bound to an instance are routed by the tags of the method
+        assert executor.is_process_bound(worker.scale)
+        assert executor.is_process_bound(functools.partial(worker.scale, a=1))
+
+        result, pid = executor.submit(worker.scale, 3).result()
+        assert result == 6
+        assert pid != os.getpid()
+
+
+def test_executor_dispatch():
+    calls = [
+        LoadToolEnabled(functions, {"name": "function_tags", "arguments": {"a": 1, "b": "x"}}),
+        LoadToolEnabled(functions, {"name": "function_enum", "arguments": {"a": "Z"}}),
+    ]
+
+    with ToolExecutor(tags=["test"], max_workers=1) as executor:
+        results = asyncio.run(DispatchToolEnabled(calls, executor=executor))
+
+    assert results == [(1, "x", False, [1, 2, 3]), functions.CustomEnum.Z]
@@ -0,0 +1,68 @@
+import importlib.util
+
+import pytest
+
+from tool2schema import LoadToolEnabled, SetJsonBackend, json_backend
+from tool2schema.schema import ParseException
+
+from . import functions
+
+BACKENDS = [
+    pytest.param(
+        x,
+        marks=pytest.mark.skipif(
+            x != "stdlib" and importlib.util.find_spec(x) is None, reason=f"{x} not installed"
+        ),
+    )
+    for x in json_backend.BACKENDS
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    default = json_backend.name
+    yield SetJsonBackend(request.param)
+    SetJsonBackend(default)
+
+
+########################
+#  Test JSON backends  #
+########################
+
+
+def test_backend_round_trip(backend):
+    value = {"a": [1, 2.5, None, True], "b": {"c": 'd/e "f" \u00e9'}}
+
+    assert json_backend.name == backend
+    assert json_backend.loads(json_backend.dumps(value)) == value
+    assert json_backend.dumps([1, {"a": 2}]) == '[1,{"a":2}]'
+
+
+def test_backend_load(backend):
+    function = {"name": "function", "arguments": '{"a": 1, "b": "b"}'}
+    assert LoadToolEnabled(functions, function) == (functions.function, {"a": 1, "b": "b"})
+
+
+@pytest.mark.parametrize("arguments", ['{"a": 1', "not json", "", '{"a": }'])
+def test_backend_invalid_json(backend, arguments):
+    with pytest.raises(ParseException):
+        LoadToolEnabled(functions, {"name": "function", "arguments": arguments})
+
+
+def test_backend_schema_string(backend):
+    # Serialised schemas are cached, and may have been serialised by another backend
+    assert json_backend.loads(functions.function.to_json_string()) == functions.function.to_json()
+
+
+def test_backend_detect():
+    default = json_backend.name
+
+    try:
+        assert SetJsonBackend() == default  # The default is the first installed backend
+    finally:
+        SetJsonBackend(default)
+
+
+def test_backend_unknown():
+    with pytest.raises(ValueError):
+        SetJsonBackend("unknown")
@@ -4,7 +4,7 @@ from typing import Callable, Union
 import pytest
 
 from tests import functions
-from tool2schema import LoadToolEnabled
+from tool2schema import LoadToolEnabled, LoadToolEnabledBatch
 from tool2schema.schema import ParseException
 
 ###############################################
@@ -148,3 +148,66 @@ def test_function_float():
     f, args = LoadToolEnabled(functions, get_function_dict(functions.function_float, {"a": 1}))
     assert f == functions.function_float
     assert args == {"a": 1}
+
+
+#######################################
+#  Test loading a batch of tool calls #
+#######################################
+
+
+def test_load_batch():
+    arguments = {"a": 1, "b": "test"}
+    calls = [
+        # Plain function dictionary
+        get_function_dict(functions.function, arguments),
+        # OpenAI tool call
+        {"id": "1", "type": "function", "function": get_function_dict(functions.function, {})},
+        # Anthropic tool use block
+        {"type": "tool_use", "id": "2", "name": "function_enum", "input": {"a": "X"}},
+        # Unknown function
+        {"type": "tool_use", "id": "3", "name": "function_not_enabled", "input": {}},
+        # Invalid call
+        23,
+        # Invalid function name
+        {"name": ["function"], "arguments": arguments},
+    ]
+
+    results = LoadToolEnabledBatch(functions, calls)
+    assert len(results) == len(calls)
+    assert results[0] == (functions.function, arguments)
+    assert isinstance(results[1], ParseException)  # Missing required arguments
+    assert results[2] == (functions.function_enum, {"a": "X"})
+    assert isinstance(results[3], ParseException)
+    assert isinstance(results[4], ParseException)
+    assert isinstance(results[5], ParseException)
+
+
+######################################
+#  Test arguments are never modified #
+######################################
+
+
+@pytest.mark.parametrize("validate", [True, False])
+def test_load_arguments_not_modified(validate):
+    d = list(range(1000))
+    arguments = {"a": 1, "b": "b", "d": d, "e": "hallucinated"}
+    f_obj = {"name": "function", "arguments": arguments}
+
+    f, args = LoadToolEnabled(functions, f_obj, validate=validate)
+    assert arguments == {"a": 1, "b": "b", "d": d, "e": "hallucinated"}
+    assert args is not arguments
+    assert args["d"] is d  # Values are not copied
+
+    args["a"] = 2
+    assert arguments["a"] == 1
+
+
+def test_load_hallucinated_arguments():
+    arguments = {"e": 1, "a": 1, "f": 2, "b": "b"}
+
+    with pytest.raises(ParseException, match="Hallucinated argument\\(s\\): e, f"):
+        LoadToolEnabled(functions, get_function_dict(functions.function, arguments), True, False)
+
+    arguments = {"a": 1, "b": "b", "c": True}
+    f_obj = get_function_dict(functions.function, arguments)
+    assert LoadToolEnabled(functions, f_obj, True, False) == (functions.function, arguments)
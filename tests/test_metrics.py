@@ -0,0 +1,189 @@
+import asyncio
+import threading
+
+import pytest
+
+from tool2schema import DisableMetrics, EnableMetrics, EnableTool, LoadToolEnabled, ToolMetrics
+from tool2schema import metrics as metrics_module
+from tool2schema.schema import ParseException
+
+from . import functions
+
+
+@EnableTool
+def function_raises(a: int):
+    """
+    This is a test function raising an exception.
+
+    :param a: This is a parameter
+    """
+    raise ValueError(a)
+
+
+@EnableTool
+async def async_function(a: int):
+    """
+    This is an async test function.
+
+    :param a: This is a parameter
+    """
+    await asyncio.sleep(0.05)
+    return a
+
+
+@EnableTool
+async def async_function_raises(a: int):
+    """
+    This is an async test function raising an exception.
+
+    :param a: This is a parameter
+    """
+    await asyncio.sleep(0)
+    raise ValueError(a)
+
+
+@pytest.fixture
+def metrics():
+    yield EnableMetrics()
+    DisableMetrics()
+
+
+##################################
+#  Test LoadToolEnabled metrics  #
+##################################
+
+
+def test_metrics_disabled_by_default():
+    assert metrics_module.ACTIVE is None
+    LoadToolEnabled(functions, {"name": "function", "arguments": '{"a": 1, "b": "b"}'})
+    assert metrics_module.ACTIVE is None
+
+
+def test_load_metrics(metrics):
+    function = {"name": "function", "arguments": '{"a": 1, "b": "b"}'}
+
+    for _ in range(3):
+        LoadToolEnabled(functions, function)
+
+    LoadToolEnabled(functions, function, validate=False)
+
+    snapshot = metrics.snapshot()["function"]
+    assert snapshot["counters"] == {"loads": 4}
+    assert snapshot["histograms"]["parse_seconds"]["count"] == 4
+    assert snapshot["histograms"]["lookup_seconds"]["count"] == 4
+    assert snapshot["histograms"]["validate_seconds"]["count"] == 3
+
+
+def test_load_error_metrics(metrics):
+    with pytest.raises(ParseException):
+        LoadToolEnabled(functions, {"name": "not_a_function", "arguments": {}})
+
+    with pytest.raises(ParseException):
+        LoadToolEnabled(functions, {"name": "function", "arguments": {"a": "x", "b": "b"}})
+
+    snapshot = metrics.snapshot()
+    assert snapshot[""]["counters"] == {"load_errors": 1}  # Function not found
+    assert snapshot["function"]["counters"] == {"load_errors": 1}
+
+
+##############################
+#  Test ToolEnabled metrics  #
+##############################
+
+
+def test_call_metrics(metrics):
+    assert functions.function_enum("X") == functions.CustomEnum.X
+
+    with pytest.raises(ValueError):
+        function_raises(1)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["function_enum"]["counters"] == {"calls": 1}
+    assert snapshot["function_enum"]["histograms"]["decode_seconds"]["count"] == 1
+    assert snapshot["function_enum"]["histograms"]["execute_seconds"]["count"] == 1
+    assert snapshot["function_raises"]["counters"] == {"calls": 1, "call_errors": 1}
+    assert snapshot["function_raises"]["histograms"]["execute_seconds"]["count"] == 1
+
+
+def test_async_call_metrics(metrics):
+    assert asyncio.run(async_function(1)) == 1
+
+    with pytest.raises(ValueError):
+        asyncio.run(async_function_raises(1))
+
+    snapshot = metrics.snapshot()
+    histograms = snapshot["async_function"]["histograms"]
+    assert snapshot["async_function"]["counters"] == {"calls": 1}
+    assert histograms["execute_seconds"]["count"] == 1
+    assert histograms["execute_seconds"]["sum"] >= 0.05  # The coroutine is awaited when measured
+    assert snapshot["async_function_raises"]["counters"] == {"calls": 1, "call_errors": 1}
+    assert snapshot["async_function_raises"]["histograms"]["execute_seconds"]["count"] == 1
+
+
+def test_metrics_threads(metrics):
+    def call():
+        for _ in range(100):
+            functions.function_no_params()
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snapshot = metrics.snapshot()["function_no_params"]
+    assert snapshot["counters"] == {"calls": 800}
+    assert snapshot["histograms"]["execute_seconds"]["count"] == 800
+
+
+def test_metrics_reset(metrics):
+    functions.function_no_params()
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_DisableMetrics():
+    metrics = EnableMetrics()
+    functions.function_no_params()
+
+    assert DisableMetrics() is metrics
+    functions.function_no_params()
+    assert metrics.snapshot()["function_no_params"]["counters"] == {"calls": 1}
+    assert DisableMetrics() is None
+
+
+#####################
+#  Test histograms  #
+#####################
+
+
+def test_histogram_buckets():
+    metrics = ToolMetrics([0.1, 1.0])
+
+    for seconds in (0.05, 0.1, 0.5, 2.0):
+        metrics.observe("tool", "execute_seconds", seconds)
+
+    histogram = metrics.snapshot()["tool"]["histograms"]["execute_seconds"]
+    assert histogram["buckets"] == {0.1: 2, 1.0: 3, float("inf"): 4}
+    assert histogram["count"] == 4
+    assert histogram["sum"] == pytest.approx(2.65)
+
+
+def test_render_prometheus():
+    metrics = ToolMetrics([0.1, 1.0])
+    metrics.increment('tool "a"', "calls")
+    metrics.observe('tool "a"', "execute_seconds", 0.5)
+
+    assert metrics.render_prometheus() == (
+        "# HELP tool2schema_calls_total Function invocations\n"
+        "# TYPE tool2schema_calls_total counter\n"
+        'tool2schema_calls_total{tool="tool \\"a\\""} 1\n'
+        "# HELP tool2schema_execute_seconds Time spent running functions\n"
+        "# TYPE tool2schema_execute_seconds histogram\n"
+        'tool2schema_execute_seconds_bucket{tool="tool \\"a\\"",le="0.1"} 0\n'
+        'tool2schema_execute_seconds_bucket{tool="tool \\"a\\"",le="1.0"} 1\n'
+        'tool2schema_execute_seconds_bucket{tool="tool \\"a\\"",le="+Inf"} 1\n'
+        'tool2schema_execute_seconds_sum{tool="tool \\"a\\""} 0.5\n'
+        'tool2schema_execute_seconds_count{tool="tool \\"a\\""} 1\n'
+    )
@@ -0,0 +1,78 @@
+import timeit
+import types
+
+from tool2schema import EnableTool, FindToolEnabledByName, ToolRegistry
+
+from . import functions
+
+#######################
+#  Test ToolRegistry  #
+#######################
+
+
+def test_registry_of_module():
+    registry = ToolRegistry.of(functions)
+    assert len(registry) == 8
+    assert registry.get("function") is functions.function
+    assert registry.get("function_not_enabled") is None
+    assert "function_tags" in registry
+    assert registry.get_by_tag("test") == [functions.function_tags]
+    assert registry.get_by_tag("missing") == []
+
+    # The registry is built once per module
+    assert ToolRegistry.of(functions) is registry
+
+
+def test_registry_of_module_refresh():
+    module = types.ModuleType("module")
+
+    @EnableTool(tags=["a"])
+    def function_a(a: int):
+        return a
+
+    module.function_a = function_a
+    registry = ToolRegistry.of(module)
+    assert registry.tools == [function_a]
+
+    @EnableTool(tags=["a", "b"])
+    def function_b(a: int):
+        return a
+
+    @EnableTool
+    def function_c(a: int):
+        return a
+
+    # Adding a function to the module rebuilds the registry
+    module.function_b = function_b
+    registry = ToolRegistry.of(module)
+    assert registry.tools == [function_a, function_b]
+    assert registry.get("function_b") is function_b
+    assert registry.get_by_tag("a") == [function_a, function_b]
+    assert registry.get_by_tag("b") == [function_b]
+
+    # Reassigning an attribute to another function rebuilds the registry
+    module.function_a = function_c
+    registry = ToolRegistry.of(module)
+    assert registry.tools == [function_c, function_b]
+    assert registry.get("function_a") is None
+    assert FindToolEnabledByName(module, "function_c") is function_c
+
+    module.function_b = 1
+    assert ToolRegistry.of(module).tools == [function_c]
+
+    # Entries of the module dictionary replaced directly are found when refreshing
+    module.__dict__["function_b"] = function_b
+    assert ToolRegistry.of(module).tools == [function_c]
+    assert ToolRegistry.of(module, refresh=True).tools == [function_c, function_b]
+
+
+def test_registry_of_module_lookup_time():
+    def lookup_time(n: int) -> float:
+        module = types.ModuleType(f"module_{n}")
+        module.__dict__.update({f"attribute_{i}": i for i in range(n)})
+        module.function = EnableTool(lambda a: a)
+        ToolRegistry.of(module)
+        return min(timeit.repeat(lambda: ToolRegistry.of(module), number=100, repeat=5))
+
+    # Modules are not scanned again when unchanged, regardless of their size
+    assert lookup_time(100_000) < 10 * lookup_time(10)
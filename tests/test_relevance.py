@@ -0,0 +1,104 @@
+from tool2schema import EnableTool, RelevanceIndex, Toolset
+
+from . import functions
+
+
+@EnableTool(tags=["billing"])
+def refund_invoice(invoice_id: int, amount: float):
+    """
+    Refund an invoice, fully or partially.
+
+    :param invoice_id: Identifier of the invoice to refund
+    :param amount: Amount of money to give back to the customer
+    """
+
+
+@EnableTool(tags=["billing"])
+def listInvoices(customer_id: int):
+    """
+    List the invoices sent to a customer.
+
+    :param customer_id: Identifier of the customer
+    """
+
+
+@EnableTool(tags=["crm"])
+def update_contact(customer_id: int, email: str):
+    """
+    Update the contact details of a customer.
+
+    :param customer_id: Identifier of the customer
+    :param email: New email address
+    """
+
+
+@EnableTool
+def get_weather(city: str):
+    """
+    Get the current weather forecast.
+
+    :param city: Name of the city
+    """
+
+
+TOOLS = [refund_invoice, listInvoices, update_contact, get_weather]
+
+
+def names(tools) -> list[str]:
+    return [x.__name__ for x in tools]
+
+
+#########################
+#  Test RelevanceIndex  #
+#########################
+
+
+def test_search():
+    index = RelevanceIndex(TOOLS)
+
+    assert len(index) == 4
+    assert names(index.search("Please refund my last invoice", 1)) == ["refund_invoice"]
+    assert names(index.search("list the invoices I was sent", 2)) == [
+        "listInvoices",
+        "refund_invoice",
+    ]
+    assert names(index.search("change the email of a customer", 1)) == ["update_contact"]
+    assert names(index.search("Will it rain in Paris? Check the forecast")) == ["get_weather"]
+    assert sorted(names(index.search("billing"))) == ["listInvoices", "refund_invoice"]
+
+
+def test_search_no_match():
+    index = RelevanceIndex(TOOLS)
+
+    assert index.search("") == []
+    assert index.search("the and of") == []  # Stop words only
+    assert index.search("spaceship") == []
+    assert RelevanceIndex().search("invoice") == []
+
+
+def test_search_limit():
+    index = RelevanceIndex(TOOLS)
+
+    assert len(index.search("customer identifier", 2)) == 2
+    assert len(index.search("customer identifier", 10)) == 3
+
+
+def test_add():
+    index = RelevanceIndex(TOOLS[:1])
+    assert names(index.search("customer")) == ["refund_invoice"]
+
+    for tool in TOOLS:
+        index.add(tool)  # Functions already in the index are ignored
+
+    assert len(index) == 4
+    assert update_contact in index
+    assert names(index.search("contact details of a customer", 1)) == ["update_contact"]
+
+
+def test_index_module_toolset():
+    index = RelevanceIndex(functions)
+    assert len(index) == len(Toolset(functions))
+    assert names(index.search("boolean parameter", 1)) in (["function"], ["function_tags"])
+
+    index = RelevanceIndex(Toolset(functions, TOOLS))
+    assert names(index.search("refund", 1)) == ["refund_invoice"]
@@ -1,4 +1,7 @@
 import copy
+import json
+import os
+import stat
 from enum import Enum
 from typing import Callable, List, Literal, Optional
 
@@ -6,6 +9,7 @@ import pytest
 
 import tool2schema
 from tool2schema import (
+    DumpToolEnabledSchemas,
     EnableTool,
     FindToolEnabled,
     FindToolEnabledByName,
@@ -13,7 +17,10 @@ from tool2schema import (
     FindToolEnabledByTag,
     FindToolEnabledByTagSchemas,
     FindToolEnabledSchemas,
+    SaveFormat,
+    SaveToolEnabled,
     SchemaType,
+    WarmupToolEnabled,
 )
 
 from . import functions
@@ -801,6 +808,15 @@ def test_function_custom_enum():
     assert a == CustomEnum.A
 
 
+def test_function_custom_enum_decode_plan():
+    positional, named = function_custom_enum.schema._get_decode_plan()
+    assert [i for i, _ in positional] == [0]
+    assert list(named) == ["a"]
+
+    # Parameters of types which do not require conversion are not decoded
+    assert function.schema._get_decode_plan() == ([], {})
+
+
 @EnableTool
 def function_custom_enum_default_value(
     a: int, b: CustomEnum = CustomEnum.B, c: bool = False, d: list[int] = [1, 2, 3]
@@ -1102,3 +1118,241 @@ def test_function_ignore_all_parameters_override(global_config):
     global_config.ignore_all_parameters = True
     rf = ReferenceSchema(function_ignore_all_parameters_override)
     assert function_ignore_all_parameters_override.to_json() == rf.schema
+
+
+#########################
+#  Test schema caching  #
+#########################
+
+
+@EnableTool
+def function_cached(a: int, b: str, c: bool = False, d: list[int] = [1, 2, 3]):
+    """
+    This is a test function.
+
+    :param a: This is a parameter
+    :param b: This is another parameter
+    :param c: This is a boolean parameter
+    :param d: This is a list parameter
+    """
+    return a, b, c, d
+
+
+def test_function_cached_copy():
+    rf = ReferenceSchema(function_cached)
+    schema = function_cached.to_json()
+    assert schema == rf.schema
+
+    # Modifying the returned schema must not affect the cached schema
+    schema["function"]["parameters"]["properties"].pop("a")
+    schema["function"]["parameters"]["properties"]["d"]["default"].append(4)
+    assert function_cached.to_json() == rf.schema
+    assert function_cached.to_json() is not function_cached.to_json()
+
+
+def test_function_cached_add_enum():
+    @EnableTool
+    def function_cached_enum(a: int):
+        """
+        This is a test function.
+
+        :param a: This is a parameter
+        """
+        return a
+
+    properties = function_cached_enum.to_json()["function"]["parameters"]["properties"]
+    assert "enum" not in properties["a"]
+    function_cached_enum.schema.add_enum("a", [1, 2])
+    properties = function_cached_enum.to_json()["function"]["parameters"]["properties"]
+    assert properties["a"]["enum"] == [1, 2]
+
+
+def test_function_cached_config(global_config):
+    rf = ReferenceSchema(function_cached)
+    assert function_cached.to_json() == rf.schema
+
+    # Changing the global configuration invalidates the cached schema
+    global_config.ignore_parameters = ["b"]
+    rf.remove_param("b")
+    assert function_cached.to_json() == rf.schema
+
+    # Changing the local configuration invalidates the cached schema
+    function_cached.config.ignore_function_description = True
+    rf.get_function().pop("description")
+    assert function_cached.to_json() == rf.schema
+    function_cached.config.reset_default()
+
+
+#################################
+#  Test configuration snapshot  #
+#################################
+
+
+def test_config_snapshot(global_config):
+    config = tool2schema.config.Config(global_config, ignore_all_parameters=True)
+    snapshot = config.snapshot()
+
+    assert snapshot.ignore_all_parameters is True
+    assert snapshot.ignore_parameters == ("self", "args", "kwargs")
+    assert snapshot.schema_type == SchemaType.OPENAI_API
+    assert config.snapshot() is snapshot  # Reused until any configuration is modified
+
+    global_config.ignore_parameters = ["a"]
+    assert config.snapshot().ignore_parameters == ("a",)
+
+    config.ignore_all_parameters = False
+    assert config.snapshot().ignore_all_parameters is False
+
+
+def test_config_version(global_config):
+    config = tool2schema.config.Config(global_config)
+    other = tool2schema.config.Config()
+    version, other_version = config.version, other.version
+
+    global_config.schema_type = SchemaType.OPENAI_TUNE  # Modifying a parent
+    assert config.version > version
+    version = config.version
+
+    config.ignore_parameters = ["a"]  # Modifying the configuration itself
+    assert config.version > version
+    version = config.version
+
+    other.ignore_function_description = True  # Modifying an unrelated configuration
+    assert config.version == version
+    assert other.version > other_version
+
+    config.reset_default()
+    assert config.version > version
+
+
+####################################
+#  Test serialised schema strings  #
+####################################
+
+
+@pytest.mark.parametrize("schema_type", [None] + [schema for schema in SchemaType])
+def test_DumpToolEnabledSchemas(schema_type):
+    dump = DumpToolEnabledSchemas(functions, schema_type)
+    assert json.loads(dump) == FindToolEnabledSchemas(functions, schema_type)
+    assert dump == json.dumps(json.loads(dump), separators=(",", ":"))  # Compact
+
+    # Serialise a subset of the functions
+    tools = FindToolEnabledByTag(functions, "test") + [functions.function]
+    assert json.loads(DumpToolEnabledSchemas(tools, schema_type)) == [
+        x.to_json(schema_type) for x in tools
+    ]
+    assert DumpToolEnabledSchemas([], schema_type) == "[]"
+
+
+def test_to_json_string_cached(global_config):
+    assert function_cached.to_json_string() is function_cached.to_json_string()
+    assert json.loads(function_cached.to_json_string()) == function_cached.to_json()
+
+    # Changing the configuration invalidates the cached string
+    global_config.ignore_function_description = True
+    assert json.loads(function_cached.to_json_string()) == function_cached.to_json()
+
+
+######################################
+#  Test lazy schema creation/warmup  #
+######################################
+
+
+def test_lazy_schema():
+    @EnableTool
+    def function_lazy(a: int):
+        """
+        This is a test function.
+
+        :param a: This is a parameter
+        """
+        return a
+
+    assert function_lazy._schema is None
+    assert function_lazy(1) == 1  # Calling the function creates the schema
+    assert function_lazy._schema is not None
+    assert function_lazy.schema is function_lazy.schema
+
+
+@pytest.mark.parametrize("parallel", [False, True, 2])
+def test_WarmupToolEnabled(parallel):
+    timings = WarmupToolEnabled(functions, parallel=parallel)
+    assert list(timings) == FindToolEnabled(functions)
+    assert all(t >= 0 for t in timings.values())
+    assert all(x._schema is not None for x in timings)
+
+
+##########################
+#  Test SaveToolEnabled  #
+##########################
+
+
+@pytest.mark.parametrize("schema_type", [None] + [schema for schema in SchemaType])
+def test_SaveToolEnabled(tmp_path, schema_type):
+    path = tmp_path / "schemas.json"
+    schemas = FindToolEnabledSchemas(functions, schema_type)
+
+    assert SaveToolEnabled(functions, str(path), schema_type)
+    assert path.read_text() == json.dumps(schemas)
+
+    assert SaveToolEnabled(functions, str(path), schema_type, SaveFormat.COMPACT)
+    assert path.read_text() == json.dumps(schemas, separators=(",", ":"))
+
+    assert SaveToolEnabled(functions, str(path), schema_type, SaveFormat.NDJSON)
+    assert [json.loads(x) for x in path.read_text().splitlines()] == schemas
+
+
+def test_SaveToolEnabled_unchanged(tmp_path):
+    path = tmp_path / "schemas.json"
+
+    assert SaveToolEnabled(functions, str(path))
+    mtime = path.stat().st_mtime_ns
+
+    assert not SaveToolEnabled(functions, str(path))
+    assert path.stat().st_mtime_ns == mtime
+
+    path.write_text(path.read_text().replace("test", "tset"))  # Same size, different content
+    assert SaveToolEnabled(functions, str(path))
+    assert path.read_text() == json.dumps(FindToolEnabledSchemas(functions))
+    assert [x.name for x in tmp_path.iterdir()] == ["schemas.json"]  # No temporary files
+
+
+def test_SaveToolEnabled_cached(tmp_path, monkeypatch):
+    calls = []
+    dumps = json.dumps
+
+    def counting_dumps(*args, **kwargs):
+        calls.append(args)
+        return dumps(*args, **kwargs)
+
+    monkeypatch.setattr(json, "dumps", counting_dumps)
+
+    # Each schema is serialised at most once, rather than once per pass over the schemas
+    assert SaveToolEnabled(functions, str(tmp_path / "a.json"))
+    assert SaveToolEnabled(functions, str(tmp_path / "b.json"))
+    assert len(calls) <= len(FindToolEnabled(functions))
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+def test_SaveToolEnabled_mode(tmp_path):
+    path = tmp_path / "schemas.json"
+    umask = os.umask(0o022)
+
+    try:
+        # New files have the same permissions as with open
+        assert SaveToolEnabled(functions, str(path))
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+        # Existing files keep their permissions
+        path.chmod(0o640)
+        assert SaveToolEnabled(functions, str(path), save_format=SaveFormat.COMPACT)
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    finally:
+        os.umask(umask)
+
+
+def test_SaveToolEnabled_no_functions(tmp_path):
+    path = tmp_path / "schemas.json"
+
+    assert SaveToolEnabled(copy, str(path))
+    assert path.read_text() == "[]"
@@ -0,0 +1,222 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tool2schema import LoadToolEnabled, StreamingArgumentsParser, ToolCallStream
+from tool2schema.schema import ParseException
+
+from . import functions
+
+
+def feed(parser: StreamingArgumentsParser, arguments: str, size: int) -> list[str]:
+    """
+    Feed the arguments to the parser in chunks of the given size.
+    """
+    completed = []
+
+    for i in range(0, len(arguments), size):
+        completed.extend(parser.feed(arguments[i:i + size]))
+
+    return completed
+
+
+##############################
+#  Test streaming arguments  #
+##############################
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+@pytest.mark.parametrize(
+    "function, arguments",
+    [
+        (functions.function_no_params, "{}"),
+        (functions.function, '{"a": 1, "b": "test"}'),
+        (functions.function, '{"a": -12, "b": "a \\"quoted\\" \\\\ string", "c": true}'),
+        (functions.function, '{ "a" : 1 , "b" : "{[,]}" , "d" : [ 1, 2, 3 ] }'),
+        (functions.function, '{"a": 1, "b": "\\u00e9", "e": {"x": [1, {"y": "}"}]}}'),
+        (functions.function_float, '{"a": 1.5e3}'),
+        (functions.function_enum, '{"a": "Y"}'),
+        (functions.function_union, '{"a": null, "b": "x"}'),
+        (functions.function_literal, '\n{\n  "a": 2,\n  "b": "c"\n}\n'),
+    ],
+)
+def test_streaming_arguments(function, arguments, size):
+    parser = StreamingArgumentsParser(function)
+    completed = feed(parser, arguments, size)
+
+    assert parser.done
+    assert completed == list(json.loads(arguments))
+    assert parser.close() == LoadToolEnabled(
+        functions, {"name": function.__name__, "arguments": arguments}
+    )[1]
+
+
+def test_streaming_arguments_early():
+    parser = StreamingArgumentsParser(functions.function)
+
+    assert parser.feed('{"a": 1') == []
+    assert parser.feed(', "b": "x') == ["a"]  # Scalar values complete at the next delimiter
+    assert parser.arguments == {"a": 1}
+    assert parser.feed('", "d": [1, 2]') == ["b", "d"]
+    assert parser.arguments == {"a": 1, "b": "x", "d": [1, 2]}
+    assert not parser.done
+
+    with pytest.raises(ParseException):
+        parser.close()  # Incomplete
+
+
+@pytest.mark.parametrize(
+    "chunks",
+    [
+        ['{"a": "x"', ', "b": "y"}'],  # Invalid value for a
+        ['{"a": 1, "b": 2,', "}"],  # Invalid value for b
+        ['{"a": 1, "d": [1, "a"]', "}"],  # Invalid array value
+        ["[", "1]"],  # Not a dictionary
+        ['{"a" 1', "}"],  # Missing colon
+        ['{"a": 1 "b"', "}"],  # Missing comma
+        ['{"a": 1,}', ""],  # Trailing comma
+        ['{"a": tru,', "}"],  # Invalid literal
+        ['{"a": 1, "b": "x"} x', ""],  # Trailing data
+    ],
+)
+def test_streaming_arguments_invalid(chunks):
+    parser = StreamingArgumentsParser(functions.function)
+
+    # The error is raised before the last chunk is received
+    with pytest.raises(ParseException):
+        parser.feed(chunks[0])
+
+
+def test_streaming_arguments_hallucinated():
+    parser = StreamingArgumentsParser(functions.function, ignore_hallucinations=False)
+
+    with pytest.raises(ParseException):
+        parser.feed('{"a": 1, "e"')
+
+    parser = StreamingArgumentsParser(functions.function)
+    assert parser.feed('{"a": 1, "e": [1, 2], "b": "x"}') == ["a", "e", "b"]
+    assert parser.close() == {"a": 1, "b": "x"}
+
+
+def test_streaming_arguments_missing():
+    parser = StreamingArgumentsParser(functions.function)
+    parser.feed('{"a": 1}')
+
+    with pytest.raises(ParseException):
+        parser.close()
+
+
+###########################
+#  Test tool call stream  #
+###########################
+
+
+def openai_chunk(index: int, name: str = None, arguments: str = "", finish: bool = False):
+    """
+    Create an OpenAI chat completion chunk with a tool call delta.
+    """
+    function = {"arguments": arguments}
+
+    if name is not None:
+        function["name"] = name
+
+    delta = {"index": index, "id": f"call_{index}" if name else None, "function": function}
+    return {
+        "choices": [
+            {
+                "index": 0,
+                "delta": {"tool_calls": [delta]},
+                "finish_reason": "tool_calls" if finish else None,
+            }
+        ]
+    }
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(2) as executor:
+        yield executor
+
+
+def test_openai_tool_call_stream(executor):
+    stream = ToolCallStream(functions, executor)
+
+    assert stream.feed(openai_chunk(0, "function", "")) == []
+    assert stream.feed(openai_chunk(0, arguments='{"a": 1, ')) == []
+
+    # The first call is submitted as soon as its arguments are complete
+    [call] = stream.feed(openai_chunk(0, arguments='"b": "x"}'))
+    assert call.id == "call_0"
+    assert call.arguments == {"a": 1, "b": "x"}
+    assert call.future.result() == (1, "x", False, [1, 2, 3])
+
+    assert stream.feed(openai_chunk(1, "function_enum", '{"a": ')) == []
+    assert stream.feed(openai_chunk(2, "function_no_params")) == []
+    assert stream.feed(openai_chunk(1, arguments='"Y"}')) == [stream.calls[1]]
+    assert stream.calls[1].future.result() == functions.CustomEnum.Y
+
+    # Functions without arguments are completed when the message finishes
+    assert stream.feed({"choices": [{"delta": {}, "finish_reason": "tool_calls"}]}) == [
+        stream.calls[2]
+    ]
+
+    calls = stream.close()
+    assert [x.name for x in calls] == ["function", "function_enum", "function_no_params"]
+    assert all(x.exception is None for x in calls)
+
+
+def test_openai_tool_call_stream_invalid(executor):
+    stream = ToolCallStream(functions, executor)
+
+    # Failures are reported as soon as they are detected
+    [call] = stream.feed(openai_chunk(0, "function", '{"a": "x",'))
+    assert isinstance(call.exception, ParseException)
+    assert call.future is None
+
+    [call] = stream.feed(openai_chunk(1, "not_a_function", "{"))
+    assert isinstance(call.exception, ParseException)
+
+    assert stream.feed(openai_chunk(2, "function", '{"a": 1')) == []
+    [call] = stream.close()[2:]
+    assert isinstance(call.exception, ParseException)  # Incomplete arguments
+
+
+def test_anthropic_tool_call_stream(executor):
+    stream = ToolCallStream(functions, executor)
+    events = [
+        {"type": "message_start", "message": {}},
+        {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+        {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Hi"}},
+        {"type": "content_block_stop", "index": 0},
+        {
+            "type": "content_block_start",
+            "index": 1,
+            "content_block": {"type": "tool_use", "id": "toolu_1", "name": "function", "input": {}},
+        },
+        {
+            "type": "content_block_delta",
+            "index": 1,
+            "delta": {"type": "input_json_delta", "partial_json": '{"a": 2, "b"'},
+        },
+        {
+            "type": "content_block_delta",
+            "index": 1,
+            "delta": {"type": "input_json_delta", "partial_json": ': "y"}'},
+        },
+        {"type": "content_block_stop", "index": 1},
+        {
+            "type": "content_block_start",
+            "index": 2,
+            "content_block": {"type": "tool_use", "id": "toolu_2", "name": "function_no_params"},
+        },
+        {"type": "content_block_stop", "index": 2},
+        {"type": "message_stop"},
+    ]
+
+    completed = [[x.id for x in stream.feed(event)] for event in events]
+    assert completed == [[], [], [], [], [], [], ["toolu_1"], [], [], ["toolu_2"], []]
+
+    calls = stream.close()
+    assert [x.arguments for x in calls] == [{"a": 2, "b": "y"}, {}]
+    assert [x.future.result() for x in calls] == [(2, "y", False, [1, 2, 3]), None]
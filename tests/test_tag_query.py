@@ -0,0 +1,136 @@
+import json
+
+import pytest
+
+from tool2schema import (
+    DumpToolEnabledSchemas,
+    EnableTool,
+    FindToolEnabledByTag,
+    FindToolEnabledByTagSchemas,
+    TagQuery,
+    ToolRegistry,
+)
+
+
+def make_tool(name: str, tags: list[str]):
+    def f(a: int):
+        """
+        This is a test function.
+
+        :param a: This is a parameter
+        """
+        return a
+
+    f.__name__ = f.__qualname__ = name
+    return EnableTool(f, tags=tags)
+
+
+@pytest.fixture
+def registry():
+    return ToolRegistry(
+        [
+            make_tool("invoice", ["billing"]),
+            make_tool("refund", ["billing", "admin"]),
+            make_tool("contact", ["crm"]),
+            make_tool("purge", ["crm", "admin"]),
+            make_tool("weather", []),
+        ]
+    )
+
+
+def names(tools) -> list[str]:
+    return [x.__name__ for x in tools]
+
+
+##################
+#  Test TagQuery  #
+##################
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("billing", "billing"),
+        ("billing OR crm", "billing OR crm"),
+        ("(billing OR crm) AND NOT admin", "(billing OR crm) AND NOT admin"),
+        ("billing OR crm AND NOT admin", "billing OR (crm AND NOT admin)"),
+        ("NOT NOT admin", "NOT NOT admin"),
+        ("a AND (b AND c)", "a AND b AND c"),
+        ('"two words" OR "AND"', '"two words" OR "AND"'),
+        ("  ( a )  ", "a"),
+    ],
+)
+def test_parse(expression, expected):
+    query = TagQuery.parse(expression)
+    assert str(query) == expected
+    assert TagQuery.parse(str(query)) == query
+
+
+@pytest.mark.parametrize(
+    "expression", ["", "AND", "a OR", "(a", "a)", "a b", "NOT", '"a', "a AND OR b"]
+)
+def test_parse_invalid(expression):
+    with pytest.raises(ValueError):
+        TagQuery.parse(expression)
+
+
+def test_operators():
+    billing, crm, admin = TagQuery.tag("billing"), TagQuery.tag("crm"), TagQuery.tag("admin")
+
+    assert (billing | crm) & ~admin == TagQuery.parse("(billing OR crm) AND NOT admin")
+    assert billing | "crm" == TagQuery.parse("billing OR crm")
+    assert hash(billing & crm) == hash(TagQuery.parse("billing AND crm"))
+    assert repr(~admin) == "TagQuery.parse('NOT admin')"
+
+
+###############################
+#  Test registry tag queries  #
+###############################
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("billing", ["invoice", "refund"]),
+        ("billing OR crm", ["invoice", "refund", "contact", "purge"]),
+        ("(billing OR crm) AND NOT admin", ["invoice", "contact"]),
+        ("NOT admin", ["invoice", "contact", "weather"]),
+        ("billing AND crm", []),
+        ("missing OR admin", ["refund", "purge"]),
+        ("NOT missing", ["invoice", "refund", "contact", "purge", "weather"]),
+    ],
+)
+def test_registry_query(registry, expression, expected):
+    query = TagQuery.parse(expression)
+
+    assert names(registry.query(query)) == expected
+    assert names(FindToolEnabledByTag(registry, query)) == expected
+    assert len(FindToolEnabledByTagSchemas(registry, query)) == len(expected)
+
+
+def test_registry_query_add(registry):
+    query = TagQuery.parse("admin")
+    assert names(registry.query(query)) == ["refund", "purge"]
+
+    # Adding a function invalidates the memoized results
+    registry.add(make_tool("audit", ["admin"]))
+    assert names(registry.query(query)) == ["refund", "purge", "audit"]
+    assert names(registry.query("admin")) == ["refund", "purge", "audit"]
+
+
+def test_dump_tag_query(registry):
+    query = TagQuery.parse("crm AND NOT admin")
+    dump = DumpToolEnabledSchemas(registry, tags=query)
+
+    assert [x["function"]["name"] for x in json.loads(dump)] == ["contact"]
+    assert DumpToolEnabledSchemas(registry, tags=TagQuery.parse("crm AND NOT admin")) is dump
+    assert DumpToolEnabledSchemas(registry, tags="crm") == DumpToolEnabledSchemas(
+        registry.get_by_tag("crm")
+    )
+
+    # Modifying a schema invalidates the memoized arrays
+    registry.get("contact").schema.add_enum("a", [1, 2])
+    assert DumpToolEnabledSchemas(registry, tags=query) != dump
+    assert DumpToolEnabledSchemas(registry, tags=query) == DumpToolEnabledSchemas(
+        [registry.get("contact")]
+    )
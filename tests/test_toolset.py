@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+
+from tool2schema import (
+    DispatchToolEnabled,
+    EnableTool,
+    FindToolEnabled,
+    FindToolEnabledByName,
+    FindToolEnabledByTag,
+    FindToolEnabledSchemas,
+    LoadToolEnabled,
+    LoadToolEnabledBatch,
+    Toolset,
+)
+from tool2schema.schema import ParseException
+
+from . import functions
+
+
+class Calculator:
+    def __init__(self, offset: int):
+        self.offset = offset
+
+    @EnableTool(tags=["math"])
+    def add(self, a: int, b: int) -> int:
+        """
+        Add two numbers to the offset.
+
+        :param a: First number
+        :param b: Second number
+        """
+        return self.offset + a + b
+
+    @EnableTool
+    async def negate(self, a: int) -> int:
+        """
+        Negate a number.
+
+        :param a: Number to negate
+        """
+        return -a
+
+    @staticmethod
+    @EnableTool
+    def double(a: int) -> int:
+        """
+        Double a number.
+
+        :param a: Number to double
+        """
+        return 2 * a
+
+    @property
+    def not_a_tool(self):
+        raise AssertionError("Properties are not evaluated")
+
+
+@EnableTool
+def function(a: str):
+    """
+    This function has the same name as a function in the test module.
+
+    :param a: This is a parameter
+    """
+    return a
+
+
+def names(toolset: Toolset) -> list[str]:
+    return [x.__name__ for x in toolset]
+
+
+##################
+#  Test Toolset  #
+##################
+
+
+def test_toolset_module():
+    toolset = Toolset(functions)
+
+    assert names(toolset) == names(FindToolEnabled(functions))
+    assert FindToolEnabled(toolset) == FindToolEnabled(functions)
+    assert FindToolEnabledSchemas(toolset) == FindToolEnabledSchemas(functions)
+    assert toolset.schemas() == FindToolEnabledSchemas(functions)
+    assert FindToolEnabledByName(toolset, "function") is functions.function
+    assert FindToolEnabledByTag(toolset, "test") == [functions.function_tags]
+
+
+def test_toolset_class():
+    toolset = Toolset(Calculator)
+
+    assert names(toolset) == ["add", "negate", "double"]
+    assert toolset.get("add") is Calculator.add
+    assert toolset.get("double")(2) == 4
+
+
+def test_toolset_instance():
+    calculator = Calculator(10)
+    toolset = Toolset(calculator)
+
+    assert names(toolset) == ["add", "negate", "double"]
+    assert toolset.get("add")(1, 2) == 13
+    assert toolset.get("add") == calculator.add
+    assert toolset.get("add").to_json() == Calculator.add.to_json()
+    assert FindToolEnabledByTag(toolset, "math") == [calculator.add]
+
+    f, arguments = LoadToolEnabled(toolset, {"name": "add", "arguments": '{"a": 1, "b": 2}'})
+    assert f(**arguments) == 13
+
+    calls = LoadToolEnabledBatch(toolset, [{"name": "negate", "arguments": {"a": 1}}])
+    assert asyncio.run(DispatchToolEnabled(calls)) == [-1]
+
+
+def test_toolset_sources():
+    toolset = Toolset([functions.function, functions.function_enum], Calculator(0))
+
+    assert names(toolset) == ["function", "function_enum", "add", "negate", "double"]
+    assert repr(toolset) == "Toolset(function, function_enum, add, negate, double)"
+
+    with pytest.raises(TypeError):
+        Toolset("functions")
+
+
+def test_toolset_collision():
+    # The same function found in more than one source is only added once
+    assert len(Toolset(functions, functions.function, Toolset(functions))) == len(
+        FindToolEnabled(functions)
+    )
+
+    with pytest.raises(ValueError):
+        Toolset(functions, function)
+
+    with pytest.raises(ValueError):
+        Toolset(Calculator(1), Calculator(2))
+
+
+def test_toolset_union_difference():
+    first = Toolset(functions.function, functions.function_float)
+    second = Toolset(Calculator(1))
+
+    union = first | second
+    assert names(union) == ["function", "function_float", "add", "negate", "double"]
+    assert names(union - first) == ["add", "negate", "double"]
+    assert names(union - [functions.function, second]) == ["function_float"]
+    assert names(first | functions.function) == names(first)
+
+    with pytest.raises(ValueError):
+        first | function
+
+
+def test_toolset_load():
+    toolset = Toolset(functions, Calculator(0))
+    function = {"name": "function", "arguments": {"a": 1, "b": "b"}}
+
+    assert LoadToolEnabled(toolset, function) == (functions.function, {"a": 1, "b": "b"})
+
+    with pytest.raises(ParseException, match="not defined in given toolset"):
+        LoadToolEnabled(toolset, {"name": "not_a_function", "arguments": {}})
+
+    [result, error] = LoadToolEnabledBatch(toolset, [function, {"name": "x", "arguments": {}}])
+    assert result[0] is functions.function
+    assert isinstance(error, ParseException)
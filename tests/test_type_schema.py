@@ -1,9 +1,12 @@
+import json
 from enum import Enum
 from typing import List, Literal, Optional, Type, Union
 
 import pytest
 from pydantic import TypeAdapter
 
+from tool2schema import type_schema
+from tool2schema.artifact import compile_plan
 from tool2schema.type_schema import TypeSchema
 
 ############################################
@@ -102,3 +105,115 @@ def test_list_optional_encode_decode_enum(array):
     assert type_schema.encode(array) == encoding
     assert type_schema.decode(encoding) == array
     assert type_schema.decode(array) == array
+
+
+##############################
+#  Test compiled validators  #
+##############################
+
+
+@pytest.mark.parametrize(
+    "type_object",
+    [
+        int,
+        str,
+        float,
+        bool,
+        dict,
+        list,
+        List[int],
+        List[float],
+        Optional[str],
+        Union[int, float],
+        Literal["a", "b", "c"],
+        Union[str, float, None],
+        Union[int, list[Literal[1, 2, 3]]],
+        List[Optional[Literal["a", "b", "c"]]],
+        CustomEnum,
+        List[CustomEnum],
+    ],
+)
+@pytest.mark.parametrize(
+    "value",
+    [0, 1, 1.5, True, None, "a", "YES", [], [1, 2], [1.5], ["a", None], ["YES"], [[1]], {}],
+)
+def test_validator(type_object: Type, value):
+    schema = TypeSchema.create(type_object)
+    assert schema.validator()(value) == schema.validate(value)
+
+    # Validators compiled from a serialised validation plan are equivalent
+    plan = json.loads(json.dumps(schema.plan()))
+    assert compile_plan(plan)(value) == schema.validate(value)
+
+
+############################
+#  Test compiled decoders  #
+############################
+
+
+@pytest.mark.parametrize(
+    "type_object",
+    [int, str, List[int], Optional[str], Union[int, float], Literal["a", "b"], List[Literal["a"]]],
+)
+def test_decoder_identity(type_object: Type):
+    assert TypeSchema.create(type_object).decoder() is None
+
+
+@pytest.mark.parametrize(
+    "type_object, value",
+    [
+        (CustomEnum, "YES"),
+        (CustomEnum, CustomEnum.NO),
+        (List[CustomEnum], ["YES", "NO"]),
+        (List[Optional[CustomEnum]], ["YES", None]),
+        (Union[int, CustomEnum, float], "MAYBE"),
+        (Union[int, CustomEnum, float], 1),
+        (Optional[CustomEnum], None),
+    ],
+)
+def test_decoder(type_object: Type, value):
+    type_schema = TypeSchema.create(type_object)
+    assert type_schema.decoder()(value) == type_schema.decode(value)
+
+
+#################################
+#  Test type schema resolution  #
+#################################
+
+
+@pytest.fixture
+def restore_type_schemas():
+    type_schemas = list(type_schema.TYPE_SCHEMAS)
+    yield
+    type_schema.TYPE_SCHEMAS[:] = type_schemas
+    type_schema.RESOLVED_TYPE_SCHEMAS.clear()
+
+
+def test_create_resolved():
+    assert isinstance(TypeSchema.create(List[int]), type_schema.ListTypeSchema)
+    assert type_schema.RESOLVED_TYPE_SCHEMAS[List[int]] is type_schema.ListTypeSchema
+
+
+def test_sub_types_resolved_once():
+    schema = TypeSchema.create(Optional[List[int]])
+    sub_types = schema._get_sub_types()
+    assert schema._get_sub_types() is sub_types
+    assert schema._sorted_sub_types() is schema._sorted_sub_types()
+
+
+def test_register_type_schema(restore_type_schemas):
+    schema = TypeSchema.create(Optional[int])
+    assert schema.to_json() == {"anyOf": [{"type": "integer"}, {"type": "null"}]}
+
+    @type_schema.ToolTypeSchema
+    class IntTypeSchema(type_schema.ValueTypeSchema):
+        @staticmethod
+        def matches(p_type) -> bool:
+            return p_type is int
+
+        def _get_type(self) -> dict:
+            return {"type": "integer", "format": "int64"}
+
+    # Registering a new type schema invalidates the resolved types
+    assert isinstance(TypeSchema.create(int), IntTypeSchema)
+    assert schema.to_json() == {"anyOf": [{"type": "integer", "format": "int64"}, {"type": "null"}]}
@@ -1,8 +1,25 @@
 # flake8: noqa
 __version__ = "v2.1.0"
 
-from .config import Config, SchemaType
+from .artifact import BuildToolArtifact, LoadToolArtifact, SaveToolArtifact, ToolArtifact
+from .budget import (
+    BudgetUnit,
+    EstimateTokens,
+    FittedSchemas,
+    FitToolEnabledSchemas,
+    Trim,
+    TrimStep,
+)
+from .config import Config, ConfigSnapshot, SaveFormat, SchemaType
+from .disk_cache import SchemaDiskCache
+from .dispatch import DispatchToolEnabled
+from .executor import ToolExecutor
+from .json_backend import SetJsonBackend
+from .metrics import DisableMetrics, EnableMetrics, ToolMetrics
+from .registry import ToolRegistry
+from .relevance import RelevanceIndex
 from .schema import (
+    DumpToolEnabledSchemas,
     EnableTool,
     FindToolEnabled,
     FindToolEnabledByName,
@@ -11,8 +28,13 @@ from .schema import (
     FindToolEnabledByTagSchemas,
     FindToolEnabledSchemas,
     LoadToolEnabled,
+    LoadToolEnabledBatch,
     SaveToolEnabled,
+    WarmupToolEnabled,
 )
+from .streaming import StreamedToolCall, StreamingArgumentsParser, ToolCallStream
+from .tag_query import TagQuery
+from .toolset import Toolset
 
 # Default global configuration
 CONFIG = Config()
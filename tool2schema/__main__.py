@@ -0,0 +1,35 @@
+import argparse
+import importlib
+import sys
+from typing import Optional
+
+from tool2schema.artifact import SaveToolArtifact
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Command line interface of tool2schema.
+
+    :param argv: Command line arguments (None indicates `sys.argv`)
+    :return: Exit code
+    """
+    parser = argparse.ArgumentParser(prog="python -m tool2schema")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser(
+        "build", help="Build an artifact with the schemas of all functions in the given modules"
+    )
+    build.add_argument("modules", nargs="+", help="Modules containing ToolEnabled functions")
+    build.add_argument("-o", "--output", default="tools.t2s", help="Path of the artifact")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        modules = [importlib.import_module(m) for m in args.modules]
+        SaveToolArtifact(modules, args.output)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
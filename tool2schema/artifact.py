@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import importlib
+from inspect import Parameter
+from types import ModuleType
+from typing import Any, Callable, Iterable, Optional, Union
+
+import tool2schema
+from tool2schema import json_backend
+from tool2schema.config import SchemaType
+from tool2schema.registry import ToolRegistry
+from tool2schema.schema import (
+    ParseException,
+    ToolEnabled,
+    _compile_arguments_validator,
+    _copy_json,
+    _parse_function_dict,
+)
+from tool2schema.type_schema import TypeSchema
+
+# Version of the artifact format, incremented on incompatible changes
+ARTIFACT_FORMAT = 1
+
+# Types which can be checked by identity when compiling validation plans
+BUILTIN_TYPES = {
+    f"{t.__module__}.{t.__qualname__}": t for t in (int, str, bool, list, dict, type(None))
+}
+
+
+def BuildToolArtifact(modules: Union[ModuleType, Iterable[ModuleType]]) -> dict:
+    """
+    Build an artifact containing, for each function with the EnableTool decorator, the schemas
+    for all schema types and the plans to validate its arguments. The artifact can be saved
+    and loaded (see `SaveToolArtifact` and `LoadToolArtifact`) to serve schemas and validate
+    arguments without importing the functions or inspecting their signatures.
+
+    :param modules: Module or modules (or toolsets) to search for ToolEnabled functions
+    :return: A JSON-serialisable dictionary
+    """
+    if isinstance(modules, (ModuleType, ToolRegistry)):
+        modules = [modules]
+
+    return {
+        "format": ARTIFACT_FORMAT,
+        "version": tool2schema.__version__,
+        "tools": [_build_tool(x) for module in modules for x in ToolRegistry.of(module)],
+    }
+
+
+def _build_tool(tool: ToolEnabled) -> dict:
+    """
+    Build the artifact entry for a single function.
+
+    :param tool: Function with the EnableTool decorator
+    """
+    return {
+        "name": tool.__name__,
+        "module": tool.__module__,
+        "qualname": tool.__qualname__,
+        "tags": list(tool.tags),
+        "schema_type": tool.config.schema_type.name,
+        "schemas": {t.name: tool.to_json(t) for t in SchemaType},
+        "parameters": [
+            [n, p.parameter.default == Parameter.empty, _get_plan(p.type_schema)]
+            for n, p in tool.schema.parameter_schemas.items()
+        ],
+    }
+
+
+def _get_plan(type_schema: TypeSchema) -> list:
+    """
+    Get the validation plan of a parameter, or an `import` plan if its type schema (or any
+    of its sub-types) does not support validation plans, so that values are validated by
+    the function itself, imported on first use (see `ArtifactTool.validate_arguments`).
+
+    :param type_schema: Type schema of the parameter
+    """
+    try:
+        return type_schema.plan()
+    except NotImplementedError:
+        return ["import"]
+
+
+def SaveToolArtifact(modules: Union[ModuleType, Iterable[ModuleType]], path: str) -> None:
+    """
+    Build an artifact (see `BuildToolArtifact`) and save it to a file.
+
+    :param modules: Module or modules to search for ToolEnabled functions
+    :param path: Path to save the artifact to
+    """
+    with open(path, "w") as f:
+        f.write(json_backend.dumps(BuildToolArtifact(modules)))
+
+
+def LoadToolArtifact(path: str) -> ToolArtifact:
+    """
+    Load an artifact saved with `SaveToolArtifact`.
+
+    :param path: Path of the artifact
+    :return: The loaded artifact
+    """
+    with open(path) as f:
+        return ToolArtifact(json_backend.loads(f.read()))
+
+
+class ToolArtifact:
+    """
+    Functions loaded from an artifact (see `BuildToolArtifact`).
+    """
+
+    def __init__(self, data: dict):
+        """
+        Create a new artifact from its dictionary representation.
+
+        :param data: Dictionary returned by `BuildToolArtifact`
+        """
+        if data.get("format") != ARTIFACT_FORMAT:
+            raise ValueError(f"Unsupported artifact format: {data.get('format')}")
+
+        self.version = data["version"]
+        self.tools = [ArtifactTool(x) for x in data["tools"]]
+        self._by_name: dict[str, ArtifactTool] = {}
+
+        for tool in self.tools:
+            self._by_name.setdefault(tool.__name__, tool)
+
+    def get(self, name: str) -> Optional[ArtifactTool]:
+        """
+        Get a function by name.
+
+        :param name: Name of the function to find
+        :return: The function, or None if not present
+        """
+        return self._by_name.get(name)
+
+    def schemas(self, schema_type: Optional[SchemaType] = None) -> list[dict]:
+        """
+        Get the schemas of all functions (see `FindToolEnabledSchemas`).
+
+        :param schema_type: Type of schema to return (None indicates the default
+            schema type of each function when the artifact was built)
+        """
+        return [x.to_json(schema_type) for x in self.tools]
+
+    def load(
+        self, function: dict, validate: bool = True, ignore_hallucinations: bool = True
+    ) -> tuple[ArtifactTool, dict[str, Any]]:
+        """
+        Load a function and its arguments, in the same way as `LoadToolEnabled`.
+
+        :param function: A dictionary with keys `name` and `arguments`
+        :param validate: Whether to validate the function arguments
+        :param ignore_hallucinations: Whether to ignore hallucinated arguments
+        :return: A tuple consisting of the function and a dictionary of argument values
+        :raises ParseException: See `LoadToolEnabled`
+        """
+        name, arguments = _parse_function_dict(function)
+
+        if (f := self.get(name)) is None:
+            raise ParseException(f"Function with name '{name}' is not defined in the artifact")
+
+        if validate:
+            arguments = f.validate_arguments(arguments, ignore_hallucinations)
+
+        return f, arguments
+
+
+class ArtifactTool:
+    """
+    Function loaded from an artifact. The function itself is imported on first call.
+    """
+
+    def __init__(self, data: dict):
+        """
+        Create a new function from its artifact entry.
+
+        :param data: Artifact entry of the function
+        """
+        self.__name__ = data["name"]
+        self.__module__ = data["module"]
+        self.__qualname__ = data["qualname"]
+        self.tags: list[str] = data["tags"]
+        self.schema_type = SchemaType[data["schema_type"]]
+        self._schemas: dict[str, dict] = data["schemas"]
+        self._parameters: list[list] = data["parameters"]
+        self._validator: Optional[Callable[[dict, bool], dict]] = None
+        self._tool: Optional[ToolEnabled] = None
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def resolve(self) -> ToolEnabled:
+        """
+        Import the function this entry was built from.
+
+        :return: The function with the EnableTool decorator
+        """
+        if self._tool is None:
+            tool: Any = importlib.import_module(self.__module__)
+
+            for name in self.__qualname__.split("."):
+                tool = getattr(tool, name)
+
+            self._tool = tool
+
+        return self._tool  # type: ignore
+
+    def to_json(self, schema_type: Optional[SchemaType] = None) -> dict:
+        """
+        Return JSON schema for the function.
+
+        :param schema_type: None indicates the default schema type when the artifact was built
+        :return: JSON schema
+        """
+        return _copy_json(self._schemas[(schema_type or self.schema_type).name])
+
+    def has(self, tag: str) -> bool:
+        return tag in self.tags
+
+    def validate_arguments(self, arguments: dict, ignore_hallucinations: bool = True) -> dict:
+        """
+        Validate the arguments for this function (see `LoadToolEnabled`).
+
+        :param arguments: Arguments to validate, which are not modified
+        :param ignore_hallucinations: Whether to ignore hallucinated arguments
+        :return: A dictionary of validated arguments
+        """
+        if self._validator is None:
+            self._validator = _compile_arguments_validator(
+                [(n, required, self._compile_plan(n, p)) for n, required, p in self._parameters]
+            )
+
+        return self._validator(arguments, ignore_hallucinations)
+
+    def _compile_plan(self, name: str, plan: list) -> Callable[[Any], bool]:
+        """
+        Compile the validation plan of a parameter. Parameters with an `import` plan are
+        validated by the type schema of the function, imported on first use.
+
+        :param name: Name of the parameter
+        :param plan: Validation plan of the parameter
+        """
+        if plan[0] != "import":
+            return compile_plan(plan)
+
+        validators: list[Callable[[Any], bool]] = []
+
+        def validate(value) -> bool:
+            if not validators:
+                schema = self.resolve().schema.parameter_schemas[name]
+                validators.append(schema.type_schema.validator())
+
+            return validators[0](value)
+
+        return validate
+
+
+def compile_plan(plan: list) -> Callable[[Any], bool]:
+    """
+    Compile a validation plan (see `TypeSchema.plan`) into a function validating values.
+
+    :param plan: The validation plan
+    :return: A function taking a value and returning true if the value is valid
+    """
+    kind = plan[0]
+
+    if kind == "value":
+        if (name := plan[1]) is None:
+            return lambda value: False
+
+        if name == "builtins.float":
+            # Allow implicit conversion from int to float
+            return lambda value: type(value) is float or type(value) is int
+
+        if (p_type := BUILTIN_TYPES.get(name)) is not None:
+            return lambda value: type(value) is p_type
+
+        return lambda value: f"{type(value).__module__}.{type(value).__qualname__}" == name
+
+    if kind == "list":
+        if plan[1] is None:
+            return lambda value: type(value) is list
+
+        validate = compile_plan(plan[1])
+        return lambda value: type(value) is list and all(map(validate, value))
+
+    if kind == "union":
+        validators = tuple(compile_plan(p) for p in plan[1])
+        return lambda value: any(validate(value) for validate in validators)
+
+    if kind == "enum":
+        values = plan[1]
+        return lambda value: value in values
+
+    if kind == "import":
+        raise ValueError("Import validation plans require the function, see `ArtifactTool`")
+
+    raise ValueError(f"Unknown validation plan: {kind}")
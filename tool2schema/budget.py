@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import math
+import re
+from enum import Enum
+from types import ModuleType
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple, Optional, Sequence, Union
+
+from tool2schema import json_backend
+from tool2schema.registry import ToolRegistry
+
+if TYPE_CHECKING:
+    from tool2schema.config import SchemaType
+    from tool2schema.schema import ToolEnabled
+
+
+class BudgetUnit(Enum):
+    """Enum for the units of a schema budget, see `FitToolEnabledSchemas`."""
+
+    TOKENS = 0  # Estimated tokens (see `EstimateTokens`)
+    BYTES = 1  # Bytes of the UTF-8 encoded JSON
+
+
+class TrimStep(Enum):
+    """Enum for the steps taken to shrink schemas, see `FitToolEnabledSchemas`."""
+
+    TRUNCATE_DESCRIPTIONS = 0  # Keep the first sentence of descriptions, up to a maximum length
+    DROP_DEFAULTS = 1  # Remove the default values of parameters
+    DROP_OPTIONAL_PARAMETER_DESCRIPTIONS = 2  # Remove the descriptions of optional parameters
+    DROP_PARAMETER_DESCRIPTIONS = 3  # Remove the descriptions of all parameters
+    DROP_FUNCTION_DESCRIPTIONS = 4  # Remove the descriptions of functions
+
+
+# Steps taken to shrink schemas, from the least to the most damaging
+DEFAULT_TRIM_STEPS = tuple(TrimStep)
+
+# Maximum length of a description truncated by `TrimStep.TRUNCATE_DESCRIPTIONS`
+DESCRIPTION_LENGTH = 100
+
+# Pieces of text estimated separately: words, numbers, whitespace and punctuation
+_PIECE = re.compile(r"[^\W\d_]+|\d+|\s+|[^\w\s]+|_+")
+
+# End of the first sentence of a description
+_SENTENCE_END = re.compile(r"[.!?](?=\s|$)")
+
+
+class Trim(NamedTuple):
+    """
+    Record of a step taken to shrink the schema of a function, see `FitToolEnabledSchemas`.
+    """
+
+    function: str  # Name of the function
+    step: TrimStep
+    saved: int  # Reduction of the size of the schema, in the unit of the budget
+
+
+class FittedSchemas(NamedTuple):
+    """
+    Schemas shrunk to fit a budget, see `FitToolEnabledSchemas`.
+    """
+
+    schemas: list[dict]
+    payload: str  # The schemas serialised to a compact JSON array
+    size: int  # Size of the payload, in the unit of the budget
+    fits: bool  # Whether the size of the payload is within the budget
+    trimmed: list[Trim]  # Steps taken to shrink the schemas, in the order they were taken
+
+
+def EstimateTokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text, without depending on the tokenizer of any model.
+    Words count as one token every 6 letters, numbers one token every 3 digits, whitespace
+    other than a single space one token, and punctuation one token every 2 characters
+    (JSON punctuation such as `":"` is typically merged into a few tokens).
+
+    :param text: The text
+    :return: The estimated number of tokens
+    """
+    tokens = 0
+
+    for piece in _PIECE.findall(text):
+        if piece[0].isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        elif piece[0].isspace():
+            tokens += piece != " "
+        elif piece[0].isalpha():
+            tokens += math.ceil(len(piece) / 6)
+        else:
+            tokens += math.ceil(len(piece) / 2)
+
+    return tokens
+
+
+def FitToolEnabledSchemas(
+    tools: Union[ModuleType, ToolRegistry, Iterable[ToolEnabled]],
+    budget: int,
+    schema_type: Optional[SchemaType] = None,
+    unit: BudgetUnit = BudgetUnit.TOKENS,
+    steps: Sequence[TrimStep] = DEFAULT_TRIM_STEPS,
+    estimator: Callable[[str], int] = EstimateTokens,
+) -> FittedSchemas:
+    """
+    Shrink the schemas of the given functions until, serialised to a compact JSON array, they
+    fit the given budget. Each step is taken in order, first on the largest schemas, and only
+    as far as needed to fit the budget, so that as little as possible is removed. Functions are
+    never removed, thus the schemas may not fit the budget after all steps are taken.
+
+    :param tools: Module or toolset to search for ToolEnabled functions, or the functions
+    :param budget: Maximum size of the serialised schemas, in the given unit
+    :param schema_type: Type of schema to return (None indicates default)
+    :param unit: Unit of the budget
+    :param steps: Steps to take to shrink the schemas, in order of priority
+    :param estimator: Function estimating the number of tokens of a text, used when the unit
+        of the budget is tokens (e.g. the tokenizer of the model, if available)
+    :return: The shrunk schemas, along with the steps taken
+    """
+    if isinstance(tools, (ModuleType, ToolRegistry)):
+        tools = ToolRegistry.of(tools)
+
+    measure = estimator if unit == BudgetUnit.TOKENS else _count_bytes
+    trimmer = _Trimmer(list(tools), schema_type, measure)
+    target = budget
+
+    while True:
+        reached = trimmer.trim(steps, target)
+        payload = trimmer.payload()
+
+        if (size := measure(payload)) <= budget or not reached:
+            break
+
+        # The size of the array may differ from the sum of the sizes of the schemas
+        # (e.g. tokens merged across schemas), thus lower the target accordingly
+        target -= size - budget
+
+    return FittedSchemas(trimmer.schemas(), payload, size, size <= budget, trimmer.trimmed)
+
+
+class _Trimmer:
+    """
+    Schemas of functions being shrunk, see `FitToolEnabledSchemas`.
+    """
+
+    def __init__(
+        self, tools: list[ToolEnabled], schema_type: Optional[SchemaType], measure: Callable
+    ):
+        self.tools = tools
+        self.schema_type = schema_type
+        self.measure = measure
+        self.strings = [x.to_json_string(schema_type) for x in tools]
+        self.sizes = [measure(x) for x in self.strings]
+        self.overhead = measure("[" + "," * (len(tools) - 1) + "]")
+        self.trimmed: list[Trim] = []
+        self._schemas: dict[int, dict] = {}  # Schemas trimmed so far, by function index
+
+    def trim(self, steps: Sequence[TrimStep], target: int) -> bool:
+        """
+        Take the given steps until the sum of the sizes of the schemas fits the target.
+
+        :param steps: Steps to take, in order of priority
+        :param target: Target size
+        :return: True if the target was reached
+        """
+        total = sum(self.sizes) + self.overhead
+
+        for step in steps:
+            # Trim the largest schemas first, so that as few schemas as possible are trimmed
+            for i in sorted(range(len(self.tools)), key=self.sizes.__getitem__, reverse=True):
+                if total <= target:
+                    return True
+
+                total -= self._trim(i, step)
+
+        return total <= target
+
+    def _trim(self, i: int, step: TrimStep) -> int:
+        """
+        Take a step on the schema of a function.
+
+        :param i: Index of the function
+        :param step: Step to take
+        :return: Reduction of the size of the schema
+        """
+        # Parsing the cached string is a cheap way to copy the schema
+        schema = self._schemas.get(i) or json_backend.loads(self.strings[i])
+
+        if not _TRIM_STEPS[step](*_get_function_parameters(schema)):
+            return 0
+
+        self._schemas[i] = schema
+        self.strings[i] = json_backend.dumps(schema)
+        size = self.measure(self.strings[i])
+        saved, self.sizes[i] = self.sizes[i] - size, size
+        self.trimmed.append(Trim(self.tools[i].__name__, step, saved))
+        return saved
+
+    def payload(self) -> str:
+        """
+        Serialise the schemas to a compact JSON array.
+        """
+        return "[" + ",".join(self.strings) + "]"
+
+    def schemas(self) -> list[dict]:
+        """
+        Get the schemas, where those not trimmed are copies of the schemas of the functions.
+        """
+        return [
+            self._schemas[i] if i in self._schemas else x.to_json(self.schema_type)
+            for i, x in enumerate(self.tools)
+        ]
+
+
+def _count_bytes(text: str) -> int:
+    return len(text.encode())
+
+
+def _get_function_parameters(schema: dict) -> tuple[dict, dict, list]:
+    """
+    Get the parts of a schema of any schema type which can be trimmed.
+
+    :param schema: The schema of a function
+    :return: A tuple consisting of the function dictionary (with the name and description),
+        the parameter properties and the names of the required parameters
+    """
+    function = schema["function"] if schema.get("type") == "function" else schema
+    parameters = function.get("parameters") or function.get("input_schema") or {}
+    return function, parameters.get("properties", {}), parameters.get("required", [])
+
+
+def _truncate(description: str) -> str:
+    """
+    Truncate a description to its first sentence, up to `DESCRIPTION_LENGTH` characters.
+    """
+    if match := _SENTENCE_END.search(description):
+        description = description[: match.end()]
+
+    if len(description) > DESCRIPTION_LENGTH:
+        words = description[: DESCRIPTION_LENGTH - 3].rsplit(" ", 1)[0]
+        description = words.rstrip(",;:") + "..."
+
+    return description
+
+
+def _truncate_descriptions(function: dict, properties: dict, required: list) -> bool:
+    changed = False
+
+    for x in [function, *properties.values()]:
+        if isinstance(description := x.get("description"), str):
+            if (truncated := _truncate(description)) != description:
+                x["description"] = truncated
+                changed = True
+
+    return changed
+
+
+def _drop_defaults(function: dict, properties: dict, required: list) -> bool:
+    return _drop(properties.values(), "default")
+
+
+def _drop_optional_parameter_descriptions(
+    function: dict, properties: dict, required: list
+) -> bool:
+    return _drop([x for n, x in properties.items() if n not in required], "description")
+
+
+def _drop_parameter_descriptions(function: dict, properties: dict, required: list) -> bool:
+    return _drop(properties.values(), "description")
+
+
+def _drop_function_descriptions(function: dict, properties: dict, required: list) -> bool:
+    return _drop([function], "description")
+
+
+def _drop(schemas: Iterable[dict], key: str) -> bool:
+    """
+    Remove a key from the given schemas.
+
+    :return: True if the key was present in any of the schemas
+    """
+    found = [x for x in schemas if key in x]
+
+    for x in found:
+        del x[key]
+
+    return bool(found)
+
+
+# Implementation of each step, returning true if the schema was modified
+_TRIM_STEPS: dict[TrimStep, Callable[[dict, dict, list], bool]] = {
+    TrimStep.TRUNCATE_DESCRIPTIONS: _truncate_descriptions,
+    TrimStep.DROP_DEFAULTS: _drop_defaults,
+    TrimStep.DROP_OPTIONAL_PARAMETER_DESCRIPTIONS: _drop_optional_parameter_descriptions,
+    TrimStep.DROP_PARAMETER_DESCRIPTIONS: _drop_parameter_descriptions,
+    TrimStep.DROP_FUNCTION_DESCRIPTIONS: _drop_function_descriptions,
+}
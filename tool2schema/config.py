@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import copy
 from enum import Enum
-from typing import Optional
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from tool2schema.disk_cache import SchemaDiskCache
 
 
 class SchemaType(Enum):
@@ -13,15 +16,44 @@ class SchemaType(Enum):
     ANTHROPIC_CLAUDE = 2
 
 
+class SaveFormat(Enum):
+    """Enum for the formats of saved schemas."""
+
+    JSON = 0  # JSON array
+    NDJSON = 1  # One JSON schema per line
+    COMPACT = 2  # JSON array without whitespace
+
+
+class ConfigSnapshot(NamedTuple):
+    """
+    Immutable snapshot of all the settings of a configuration, see `Config.snapshot`.
+    """
+
+    schema_type: SchemaType
+    ignore_parameters: tuple[str, ...]
+    ignore_parameter_descriptions: bool
+    ignore_function_description: bool
+    ignore_all_parameters: bool
+    schema_cache: Optional[SchemaDiskCache]
+
+
 class Config:
     """
     Configuration class for tool2schema.
     """
 
+    # Incremented whenever any configuration is modified, so that snapshots
+    # can be reused in constant time as long as no configuration changed
+    _generation = 0
+
     def __init__(self, parent: Optional[Config] = None, **settings):
         self._parent = parent
         self._settings = settings
         self._initial_settings = copy.deepcopy(settings)
+        self._mutations = 0  # Number of times this configuration was modified
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._snapshot_version = 0
+        self._snapshot_generation = -1
 
     @property
     def schema_type(self) -> SchemaType:
@@ -98,11 +130,62 @@ class Config:
         if (fget := Config.ignore_all_parameters.fget) is not None:
             self._set_setting(fget.__name__, value)
 
+    @property
+    def schema_cache(self) -> Optional[SchemaDiskCache]:
+        """
+        Persistent cache to store the generated schemas in (None to disable).
+        """
+        default_value = None
+        if (fget := Config.schema_cache.fget) is not None:
+            return self._get_setting(fget.__name__, default_value)
+        return default_value
+
+    @schema_cache.setter
+    def schema_cache(self, value: Optional[SchemaDiskCache]):
+        if (fget := Config.schema_cache.fget) is not None:
+            self._set_setting(fget.__name__, value)
+
+    @property
+    def version(self) -> int:
+        """
+        Version of the configuration, incremented whenever this configuration
+        or any of its parents is modified.
+        """
+        self.snapshot()
+        return self._snapshot_version
+
+    def snapshot(self) -> ConfigSnapshot:
+        """
+        Resolve all settings, including those inherited from the parent configurations, into
+        an immutable snapshot. The snapshot is cached until any configuration is modified, so
+        that reading the settings from the snapshot does not walk the parent configurations.
+
+        Settings must be modified by assigning them (e.g. modifying the list of
+        `ignore_parameters` in place does not update the snapshot).
+
+        :return: The snapshot of the current settings
+        """
+        if self._snapshot_generation != Config._generation or self._snapshot is None:
+            generation = Config._generation
+            self._snapshot = ConfigSnapshot(
+                schema_type=self.schema_type,
+                ignore_parameters=tuple(self.ignore_parameters),
+                ignore_parameter_descriptions=self.ignore_parameter_descriptions,
+                ignore_function_description=self.ignore_function_description,
+                ignore_all_parameters=self.ignore_all_parameters,
+                schema_cache=self.schema_cache,
+            )
+            self._snapshot_version = self._mutations + (self._parent.version if self._parent else 0)
+            self._snapshot_generation = generation
+
+        return self._snapshot
+
     def reset_default(self):
         """
         Reset the configuration to the default settings.
         """
         self._settings = copy.deepcopy(self._initial_settings)
+        self._mutated()
 
     def _get_setting(self, name: str, default):
         """
@@ -125,3 +208,11 @@ class Config:
         :param value: Value to set
         """
         self._settings[name] = value
+        self._mutated()
+
+    def _mutated(self):
+        """
+        Record a modification of this configuration, invalidating all snapshots.
+        """
+        self._mutations += 1
+        Config._generation += 1
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import typing
+from enum import Enum
+from inspect import isclass
+from typing import Any, Callable, Optional
+
+import tool2schema
+from tool2schema import json_backend
+from tool2schema.type_schema import TYPE_SCHEMAS
+
+# Number of writes after which the cache directory is scanned again, to account for
+# entries written and removed by other processes
+RESCAN_WRITES = 1000
+
+
+class SchemaDiskCache:
+    """
+    Persistent cache of function schemas shared by multiple processes. Each entry is stored in
+    its own file, keyed by a fingerprint of the function (see `fingerprint`), so that processes
+    can reuse the schemas of unchanged functions without inspecting them.
+
+    Entries are written to a temporary file and atomically renamed, so that concurrent readers
+    never observe partially written entries. When the cache exceeds its size, the least recently
+    used entries are evicted. The size of the cache is tracked as entries are written, and the
+    directory is only scanned when the size may exceed the limits, or every `RESCAN_WRITES` writes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: int = 100_000,
+    ):
+        """
+        Create a new disk cache.
+
+        :param path: Directory to store the entries in (None indicates
+            `$XDG_CACHE_HOME/tool2schema`, or `~/.cache/tool2schema` if not set)
+        :param max_bytes: Maximum total size of the entries
+        :param max_entries: Maximum number of entries
+        """
+        if path is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+            path = os.path.join(cache_home, "tool2schema")
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        # Estimated total size and number of entries, None until the directory is scanned
+        self._size: Optional[tuple[int, int]] = None
+        self._writes_since_scan = 0
+
+    def __deepcopy__(self, memo: dict) -> SchemaDiskCache:
+        # The cache is a shared resource, configuration copies refer to the same cache
+        return self
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get an entry from the cache.
+
+        :param key: Key of the entry
+        :return: The cached value, or None if not present
+        """
+        entry = os.path.join(self.path, f"{key}.json")
+
+        try:
+            with open(entry, encoding="utf-8") as f:
+                value = json_backend.loads(f.read())
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        try:
+            os.utime(entry)  # Mark the entry as recently used
+        except OSError:
+            pass
+
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Add an entry to the cache, replacing any existing entry with the same key.
+        Failures to write the entry (e.g. read-only file system) are ignored, and values
+        which would not be read back unchanged (e.g. containing dates or tuples, which
+        some JSON backends convert to strings and lists) are not stored.
+
+        :param key: Key of the entry
+        :param value: JSON-serialisable value
+        """
+        try:
+            data = json_backend.dumps(value)
+
+            if json_backend.loads(data) != value:
+                return
+        except (TypeError, ValueError):
+            return  # The value cannot be encoded by the JSON backend
+
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            fd, temp = tempfile.mkstemp(dir=self.path, prefix=".", suffix=".tmp")
+
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    size = f.write(data.encode("utf-8"))
+                os.replace(temp, os.path.join(self.path, f"{key}.json"))
+            except BaseException:
+                os.unlink(temp)
+                raise
+
+        except OSError:
+            return
+
+        self.writes += 1
+        self._writes_since_scan += 1
+
+        if self._size is not None and self._writes_since_scan < RESCAN_WRITES:
+            # Replaced entries are counted again, which overestimates the size
+            total, count = self._size[0] + size, self._size[1] + 1
+            self._size = (total, count)
+
+            if total <= self.max_bytes and count <= self.max_entries:
+                return
+
+        self._evict()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get the cache counters of this process.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+    def _evict(self) -> None:
+        """
+        Scan the cache directory, and remove the least recently used entries if the cache
+        exceeds its size limits.
+        """
+        entries = []
+
+        with os.scandir(self.path) as it:
+            for e in it:
+                if e.name.endswith(".json") and not e.name.startswith("."):
+                    try:
+                        stat = e.stat()
+                    except OSError:
+                        continue  # Removed by another process
+                    entries.append((stat.st_mtime, stat.st_size, e.path))
+
+        total, count = sum(size for _, size, _ in entries), len(entries)
+        self._writes_since_scan = 0
+
+        if total > self.max_bytes or count > self.max_entries:
+            # Evict down to 90% of the limits, so that the directory is not scanned again
+            # until a number of entries are written
+            total, count = self._remove(sorted(entries), total, count)
+
+        self._size = (total, count)
+
+    def _remove(self, entries: list, total: int, count: int) -> tuple[int, int]:
+        """
+        Remove the given entries, from the first, until the cache is within 90% of its limits.
+
+        :param entries: Tuples consisting of the modification time, size and path of each entry
+        :param total: Total size of the entries
+        :param count: Number of entries
+        :return: The total size and number of entries remaining
+        """
+        max_bytes, max_entries = self.max_bytes * 0.9, self.max_entries * 0.9
+
+        for _, size, path in entries:
+            if total <= max_bytes and count <= max_entries:
+                break
+
+            try:
+                os.unlink(path)
+                self.evictions += 1
+            except OSError:
+                pass  # Already removed by another process
+
+            total -= size
+            count -= 1
+
+        return total, count
+
+
+def fingerprint(f: Callable, *state: Any) -> Optional[str]:
+    """
+    Compute a fingerprint of everything the schema of the given function depends on: its code
+    object, annotations, default values and docstring, the registered type schemas, the library
+    version and any additional state (e.g. configuration settings).
+
+    :param f: The function
+    :param state: Additional state the schema depends on, which must have a stable `repr`
+    :return: A hexadecimal fingerprint, or None if the function cannot be fingerprinted
+    """
+    if (code := getattr(f, "__code__", None)) is None:
+        return None
+
+    h = hashlib.sha256()
+
+    for part in (
+        tool2schema.__version__,
+        f.__module__,
+        f.__qualname__,
+        code.co_code,
+        code.co_varnames,
+        code.co_argcount,
+        code.co_posonlyargcount,
+        code.co_kwonlyargcount,
+        code.co_flags,
+        [(n, _describe_annotation(a)) for n, a in f.__annotations__.items()],
+        f.__defaults__,
+        f.__kwdefaults__,
+        f.__doc__,
+        [f"{t.__module__}.{t.__qualname__}" for t in TYPE_SCHEMAS],
+        state,
+    ):
+        h.update(repr(part).encode())
+        h.update(b"\0")
+
+    return h.hexdigest()
+
+
+def _describe_annotation(annotation: Any) -> str:
+    """
+    Describe a type annotation, including the members of any enumeration it refers to.
+
+    :param annotation: The type annotation
+    """
+    parts = [repr(annotation)]
+
+    if isclass(annotation) and issubclass(annotation, Enum):
+        parts.append(repr([e.name for e in annotation]))
+
+    for arg in typing.get_args(annotation):
+        parts.append(_describe_annotation(arg))
+
+    return " ".join(parts)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Iterable, Optional, Union
+
+from tool2schema.schema import AsyncToolEnabled, BoundToolEnabled
+
+
+async def DispatchToolEnabled(
+    calls: Iterable[Union[tuple[Callable, dict[str, Any]], BaseException]],
+    timeout: Optional[Union[float, dict[str, float]]] = None,
+    executor: Optional[Executor] = None,
+    return_exceptions: bool = True,
+) -> list[Any]:
+    """
+    Run the given tool calls concurrently. Coroutine functions are awaited on the running event
+    loop, while regular functions are run in `executor` so that they do not block the loop.
+
+    If the returned coroutine is cancelled, all the tool calls still running are cancelled.
+    Note that regular functions which already started running in a thread cannot be interrupted,
+    thus they will keep running in the background even after being cancelled or timing out.
+
+    :param calls: The tool calls to run, where each call is a tuple consisting of the function
+        and a dictionary of argument values, as returned by `LoadToolEnabled`. Exceptions (such as
+        those returned by `LoadToolEnabledBatch`) are included in the results as they are.
+    :param timeout: Maximum number of seconds each tool call is allowed to run, either as a single
+        value applying to all tool calls, or as a dictionary with function names as keys. The
+        calls exceeding their timeout are cancelled and result in `asyncio.TimeoutError`.
+    :param executor: Executor to run regular functions in (None indicates the default executor
+        of the event loop)
+    :param return_exceptions: When true, exceptions raised by the tool calls are included in the
+        results; when false, the first exception raised is propagated and the remaining tool calls
+        are cancelled
+    :return: A list with the result of each tool call, in the same order as `calls`
+    """
+    tasks = [_run_tool_call(call, timeout, executor) for call in calls]
+
+    if return_exceptions:
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    tasks = [asyncio.ensure_future(t) for t in tasks]
+
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        # Cancel the remaining tool calls if any of them failed
+        for task in tasks:
+            task.cancel()
+
+
+async def _run_tool_call(
+    call: Union[tuple[Callable, dict[str, Any]], BaseException],
+    timeout: Optional[Union[float, dict[str, float]]],
+    executor: Optional[Executor],
+) -> Any:
+    """
+    Run a single tool call, see `DispatchToolEnabled`.
+
+    :param call: A tuple consisting of the function and a dictionary of argument values
+    :param timeout: Timeout in seconds, or dictionary of timeouts
+    :param executor: Executor to run regular functions in
+    :return: The value returned by the function
+    """
+    if isinstance(call, BaseException):
+        raise call
+
+    f, arguments = call
+
+    if isinstance(timeout, dict):
+        timeout = timeout.get(getattr(f, "__name__", ""))
+
+    aw: Awaitable
+    if _is_async(f):
+        aw = f(**arguments)
+    else:
+        loop = asyncio.get_running_loop()
+        aw = loop.run_in_executor(executor, functools.partial(f, **arguments))
+
+    if timeout is None:
+        return await aw
+
+    return await asyncio.wait_for(aw, timeout)
+
+
+def _is_async(f: Callable) -> bool:
+    """
+    Determine whether the given function returns an awaitable.
+
+    :param f: The function to check
+    :return: True if `f` is a coroutine function or a wrapper around one
+    """
+    if isinstance(f, BoundToolEnabled):
+        f = f.__func__
+
+    return isinstance(f, AsyncToolEnabled) or inspect.iscoroutinefunction(f)
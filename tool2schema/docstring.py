@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import functools
+import re
+
+# Sphinx fields terminating a parameter description
+FIELD_PATTERN = re.compile(r":(?:param|type|return|rtype)")
+
+# Parameter field, matched at the position of a field
+PARAM_PATTERN = re.compile(r":param ([^:]*): ")
+
+
+class Docstring:
+    """
+    Function description and parameter descriptions extracted from a Sphinx docstring.
+    """
+
+    def __init__(self, description: str, parameters: dict[str, str]):
+        """
+        Create a new parsed docstring.
+
+        :param description: The function description
+        :param parameters: Dictionary with parameter names as keys and descriptions as values
+        """
+        self.description = description
+        self.parameters = parameters
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def parse(docstring: str) -> Docstring:
+        """
+        Parse the given docstring in a single pass. The result is cached, so that
+        the docstring of each function is parsed once and shared by all its parameters.
+
+        :param docstring: The function docstring
+        :return: The parsed docstring
+        """
+        text = " ".join(docstring.split())  # Normalise whitespace
+
+        # The function description is the text preceding the first parameter
+        if (end := text.find(":param")) < 0:
+            end = len(text)
+
+        description = text[:end].strip()
+
+        # Positions of all fields, each parameter description extends to the next field
+        fields = [m.start() for m in FIELD_PATTERN.finditer(text)]
+        fields.append(len(text))
+
+        parameters: dict[str, str] = {}
+
+        for start, end in zip(fields, fields[1:]):
+            if (m := PARAM_PATTERN.match(text, start)) is None:
+                continue
+
+            name, desc = m.group(1), text[m.end():end]
+
+            if desc and name not in parameters:
+                # Descriptions that are empty are omitted
+                parameters[name] = desc.strip()
+
+        return Docstring(description, parameters)
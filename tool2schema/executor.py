@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import functools
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+from tool2schema.schema import AsyncToolEnabled, BoundToolEnabled, ToolEnabled
+
+
+class ToolExecutor(Executor):
+    """
+    Executor running the functions with the EnableTool decorator and any of the
+    given tags in a process pool, and all other functions in a thread pool. This
+    allows CPU-bound functions to run in parallel without blocking the caller.
+
+    The functions sent to the process pool are pickled by reference, thus they must be
+    importable by their module and qualified name. Their arguments are decoded in the
+    worker process, which means enumeration names and other JSON values can be sent
+    as they are returned by `LoadToolEnabled`.
+    """
+
+    def __init__(
+        self,
+        tags: Iterable[str],
+        max_workers: Optional[int] = None,
+        thread_executor: Optional[Executor] = None,
+        **kwargs,
+    ):
+        """
+        Create a new tool executor.
+
+        :param tags: Tags of the functions to run in the process pool
+        :param max_workers: Maximum number of worker processes (None indicates the number
+            of processors on the machine)
+        :param thread_executor: Executor for all other functions (None indicates a new
+            thread pool, which is shut down together with this executor)
+        :param kwargs: Additional arguments to pass to `ProcessPoolExecutor`
+        """
+        self.tags = set(tags)
+        self._process_executor = ProcessPoolExecutor(max_workers, **kwargs)
+        self._thread_executor = thread_executor or ThreadPoolExecutor()
+        self._owns_thread_executor = thread_executor is None
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        """
+        Schedule the given function to be executed as `fn(*args, **kwargs)`.
+
+        :param fn: The function to execute, or a `functools.partial` wrapping it
+        :return: A future representing the execution of the function
+        """
+        if self.is_process_bound(fn):
+            return self._process_executor.submit(fn, *args, **kwargs)
+        return self._thread_executor.submit(fn, *args, **kwargs)
+
+    def is_process_bound(self, fn: Callable) -> bool:
+        """
+        Determine whether the given function is executed in the process pool.
+
+        :param fn: The function to execute, or a `functools.partial` wrapping it
+        :return: True if the function is executed in the process pool
+        """
+        while isinstance(fn, functools.partial):
+            fn = fn.func
+
+        if isinstance(fn, BoundToolEnabled):
+            # Methods bound to an instance have the tags of the method
+            fn = fn.__func__
+
+        return (
+            isinstance(fn, ToolEnabled)
+            and not isinstance(fn, AsyncToolEnabled)
+            and not self.tags.isdisjoint(fn.tags)
+        )
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._process_executor.shutdown(wait, cancel_futures=cancel_futures)
+
+        if self._owns_thread_executor:
+            self._thread_executor.shutdown(wait, cancel_futures=cancel_futures)
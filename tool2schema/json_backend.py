@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import importlib
+import json
+from typing import Any, Callable, Optional
+
+# Backends in order of preference when detecting the installed backends
+BACKENDS = ("orjson", "msgspec", "ujson", "stdlib")
+
+# Name of the active backend, see `SetJsonBackend`
+name = "stdlib"
+
+
+# Parse a JSON string with the active backend, raising ValueError if the string is not
+# valid JSON regardless of the backend
+loads: Callable[[str], Any] = json.loads
+
+# Serialise a value to a compact JSON string (without whitespace) with the active backend,
+# where backends may differ in the escaping of non-ASCII characters
+dumps: Callable[[Any], str] = lambda value: json.dumps(value, separators=(",", ":"))
+
+
+def SetJsonBackend(backend: Optional[str] = None) -> str:
+    """
+    Set the library used to parse and serialise JSON, which includes the arguments of tool calls,
+    the cached serialised schemas, saved schemas, artifacts and the disk cache.
+
+    :param backend: One of `orjson`, `msgspec`, `ujson` or `stdlib` (None indicates the
+        first installed backend in this order, which is the default when importing tool2schema)
+    :return: The name of the backend set
+    :raises ValueError: Thrown if the backend is unknown
+    :raises ImportError: Thrown if the backend is not installed
+    """
+    global name, loads, dumps
+
+    if backend is None:
+        for candidate in BACKENDS:
+            try:
+                return SetJsonBackend(candidate)
+            except ImportError:
+                continue
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {backend}")
+
+    loads, dumps = _create_backend(backend)
+    name = backend
+    return name
+
+
+def _create_backend(backend: str) -> tuple[Callable[[str], Any], Callable[[Any], str]]:
+    """
+    Create the functions to parse and serialise JSON with the given backend.
+
+    :param backend: Name of the backend
+    :return: A tuple consisting of the `loads` and `dumps` functions
+    """
+    if backend == "stdlib":
+        return json.loads, lambda value: json.dumps(value, separators=(",", ":"))
+
+    module: Any = importlib.import_module("msgspec.json" if backend == "msgspec" else backend)
+
+    if backend == "orjson":
+        # orjson.JSONDecodeError is a subclass of ValueError
+        return module.loads, lambda value: module.dumps(value).decode()
+
+    if backend == "ujson":
+        # ujson.JSONDecodeError is a subclass of ValueError
+        return module.loads, lambda value: module.dumps(value, escape_forward_slashes=False)
+
+    decode, encode = module.decode, module.encode
+    errors = importlib.import_module("msgspec").DecodeError
+
+    def loads_msgspec(value: str) -> Any:
+        try:
+            return decode(value)
+        except errors as e:
+            raise ValueError(str(e)) from e
+
+    return loads_msgspec, lambda value: encode(value).decode()
+
+
+SetJsonBackend()
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Iterable, Optional
+
+# Upper bounds (in seconds) of the default latency histogram buckets
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Descriptions of the recorded metrics, used by the Prometheus renderer
+DESCRIPTIONS = {
+    "loads": "Tool calls loaded with LoadToolEnabled",
+    "load_errors": "Tool calls that failed to load",
+    "calls": "Function invocations",
+    "call_errors": "Function invocations that raised an exception",
+    "parse_seconds": "Time spent parsing the arguments of tool calls",
+    "lookup_seconds": "Time spent finding the function of tool calls",
+    "validate_seconds": "Time spent validating the arguments of tool calls",
+    "decode_seconds": "Time spent converting arguments to the types expected by functions",
+    "execute_seconds": "Time spent running functions",
+}
+
+# Metrics being recorded, or None if disabled (see `EnableMetrics`)
+ACTIVE: Optional[ToolMetrics] = None
+
+
+def EnableMetrics(buckets: Optional[Iterable[float]] = None) -> ToolMetrics:
+    """
+    Start recording metrics of `LoadToolEnabled` and of the invocations of functions with
+    the EnableTool decorator, replacing any metrics previously being recorded. When metrics
+    are disabled (the default), the only overhead is checking whether they are enabled.
+
+    :param buckets: Upper bounds of the latency histogram buckets in seconds
+        (None indicates `DEFAULT_BUCKETS`)
+    :return: The metrics being recorded
+    """
+    global ACTIVE
+    ACTIVE = ToolMetrics(buckets)
+    return ACTIVE
+
+
+def DisableMetrics() -> Optional[ToolMetrics]:
+    """
+    Stop recording metrics.
+
+    :return: The metrics recorded until now, or None if metrics were not enabled
+    """
+    global ACTIVE
+    metrics, ACTIVE = ACTIVE, None
+    return metrics
+
+
+class _Histogram:
+    """
+    Latency histogram with fixed buckets.
+    """
+
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+
+
+class ToolMetrics:
+    """
+    Per-tool counters and latency histograms. Each thread records into its own shard,
+    so that recording does not need any lock; shards are merged when taking a snapshot.
+    """
+
+    def __init__(self, buckets: Optional[Iterable[float]] = None):
+        """
+        Create new empty metrics.
+
+        :param buckets: Upper bounds of the latency histogram buckets in seconds
+            (None indicates `DEFAULT_BUCKETS`)
+        """
+        self.buckets = tuple(sorted(DEFAULT_BUCKETS if buckets is None else buckets))
+        self._local = threading.local()
+        self._shards: list[dict[tuple[str, str], _Histogram]] = []
+        self._counters: list[dict[tuple[str, str], int]] = []
+        self._lock = threading.Lock()  # Only held when adding shards or taking a snapshot
+
+    def increment(self, tool: str, counter: str) -> None:
+        """
+        Increment a counter.
+
+        :param tool: Name of the function
+        :param counter: Name of the counter (e.g. `calls`)
+        """
+        counters = self._get_shard()[1]
+        key = (tool, counter)
+        counters[key] = counters.get(key, 0) + 1
+
+    def observe(self, tool: str, histogram: str, seconds: float) -> None:
+        """
+        Record a duration in a histogram.
+
+        :param tool: Name of the function
+        :param histogram: Name of the histogram (e.g. `execute_seconds`)
+        :param seconds: The duration in seconds
+        """
+        histograms = self._get_shard()[0]
+
+        if (h := histograms.get(key := (tool, histogram))) is None:
+            h = histograms[key] = _Histogram(len(self.buckets) + 1)
+
+        h.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        h.sum += seconds
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Get the current value of all metrics. Values recorded by other threads while the
+        snapshot is being taken may or may not be included.
+
+        :return: A dictionary with function names as keys, and dictionaries as values with
+            keys `counters` (counter names to values) and `histograms` (histogram names to
+            dictionaries with keys `count`, `sum` and `buckets`, the latter mapping the upper
+            bound of each bucket to the cumulative count, as in Prometheus)
+        """
+        tools: dict[str, dict] = {}
+
+        with self._lock:
+            shards = list(zip(self._shards, self._counters))
+
+        for histograms, counters in shards:
+            for (tool, name), value in list(counters.items()):
+                entry = tools.setdefault(tool, {"counters": {}, "histograms": {}})
+                entry["counters"][name] = entry["counters"].get(name, 0) + value
+
+            for (tool, name), h in list(histograms.items()):
+                entry = tools.setdefault(tool, {"counters": {}, "histograms": {}})
+                merged = entry["histograms"].setdefault(
+                    name, {"count": 0, "sum": 0.0, "counts": [0] * (len(self.buckets) + 1)}
+                )
+                merged["sum"] += h.sum
+                merged["counts"] = [a + b for a, b in zip(merged["counts"], list(h.counts))]
+
+        for entry in tools.values():
+            for h in entry["histograms"].values():
+                counts, cumulative = h.pop("counts"), 0
+                h["buckets"] = {}
+
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    h["buckets"][bound] = cumulative
+
+                h["count"] = cumulative
+
+        return tools
+
+    def render_prometheus(self, prefix: str = "tool2schema") -> str:
+        """
+        Render the current value of all metrics in the Prometheus text exposition format.
+
+        :param prefix: Prefix of the metric names
+        :return: The metrics in Prometheus text format
+        """
+        snapshot = self.snapshot()
+        counters: dict[str, list[str]] = {}
+        histograms: dict[str, list[str]] = {}
+
+        for tool in sorted(snapshot):
+            label = f'tool="{_escape_label(tool)}"'
+
+            for name, value in sorted(snapshot[tool]["counters"].items()):
+                counters.setdefault(name, []).append(f"{prefix}_{name}_total{{{label}}} {value}")
+
+            for name, h in sorted(snapshot[tool]["histograms"].items()):
+                lines = histograms.setdefault(name, [])
+
+                for bound, count in h["buckets"].items():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{prefix}_{name}_bucket{{{label},le="{le}"}} {count}')
+
+                lines.append(f"{prefix}_{name}_sum{{{label}}} {h['sum']!r}")
+                lines.append(f"{prefix}_{name}_count{{{label}}} {h['count']}")
+
+        output = []
+
+        for kind, metrics, suffix in (
+            ("counter", counters, "_total"),
+            ("histogram", histograms, ""),
+        ):
+            for name, lines in sorted(metrics.items()):
+                output.append(f"# HELP {prefix}_{name}{suffix} {DESCRIPTIONS.get(name, name)}")
+                output.append(f"# TYPE {prefix}_{name}{suffix} {kind}")
+                output.extend(lines)
+
+        return "".join(f"{line}\n" for line in output)
+
+    def reset(self) -> None:
+        """
+        Discard all recorded values.
+        """
+        with self._lock:
+            for histograms, counters in zip(self._shards, self._counters):
+                histograms.clear()
+                counters.clear()
+
+    def _get_shard(self) -> tuple[dict[tuple[str, str], _Histogram], dict[tuple[str, str], int]]:
+        """
+        Get the histograms and counters of the current thread.
+        """
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = ({}, {})
+
+            with self._lock:
+                self._shards.append(shard[0])
+                self._counters.append(shard[1])
+
+            return shard
+
+
+def _escape_label(value: str) -> str:
+    """
+    Escape a Prometheus label value.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import re
 from inspect import Parameter
 from typing import Any, Optional, Union
 
-from tool2schema import Config
+from tool2schema.config import Config
+from tool2schema.docstring import Docstring
 from tool2schema.type_schema import EnumTypeSchema, TypeSchema
 
 
@@ -62,16 +62,10 @@ class ParameterSchema:
         to be added to the JSON schema. Return `Parameter.empty` to omit the description
         from the schema.
         """
-        if self.docstring is None or self.config.ignore_parameter_descriptions:
+        if self.docstring is None or self.config.snapshot().ignore_parameter_descriptions:
             return Parameter.empty
 
-        docstring = " ".join([x.strip() for x in self.docstring.replace("\n", " ").split()])
-        params = re.findall(r":param ([^:]*): (.*?)(?=:param|:type|:return|:rtype|$)", docstring)
-        for name, desc in params:
-            if name == self.parameter.name and desc:
-                return desc.strip()
-
-        return Parameter.empty
+        return Docstring.parse(self.docstring).parameters.get(self.parameter.name, Parameter.empty)
 
     def _get_default(self) -> Any:
         """
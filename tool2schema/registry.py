@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import itertools
+import weakref
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Union
+
+from tool2schema.tag_query import TagQuery
+
+if TYPE_CHECKING:
+    from tool2schema.schema import ToolEnabled
+
+# Maximum number of distinct tag queries memoized by each registry
+QUERY_CACHE_SIZE = 1024
+
+# Translation of the binary string of a bitset to bytes, see `ToolRegistry._tools_of`
+_BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+class ToolRegistry:
+    """
+    Index of functions with the EnableTool decorator, providing constant
+    time lookup by name and by tag. Each function is identified by its position
+    in the registry, and each tag by the bitset of the functions with the tag,
+    so that tag queries are evaluated with bitwise operations.
+    """
+
+    # Number of changes to each module, by module name: incremented when a function defined in
+    # the module is decorated with EnableTool, and when an attribute of a scanned module is set
+    # or deleted, so that registries built from a module are rebuilt only after changes
+    _changes: dict[Optional[str], int] = {}
+
+    # Registries built from modules, along with the number of attributes and changes of the
+    # module when it was scanned, see `ToolRegistry.of`
+    _modules: weakref.WeakKeyDictionary[ModuleType, tuple[tuple[int, int], ToolRegistry]] = (
+        weakref.WeakKeyDictionary()
+    )
+
+    # Classes of scanned modules, tracking changes to their attributes, by original class
+    _tracked: dict[type, type] = {}
+
+    def __init__(self, tools: Iterable[ToolEnabled] = ()):
+        """
+        Create a new registry containing the given functions.
+
+        :param tools: Functions with the EnableTool decorator
+        """
+        self.tools: list[ToolEnabled] = []
+        self._by_name: dict[str, ToolEnabled] = {}
+        self._by_tag: dict[str, list[ToolEnabled]] = {}
+        self._tag_bits: dict[str, int] = {}
+        # Memoized results of tag queries, cleared when functions are added
+        self._queries: dict[TagQuery, list[ToolEnabled]] = {}
+        self._dumps: dict[Any, tuple[Any, str]] = {}  # See `DumpToolEnabledSchemas`
+
+        for tool in tools:
+            self.add(tool)
+
+    @staticmethod
+    def of(module: Union[ModuleType, ToolRegistry], refresh: bool = False) -> ToolRegistry:
+        """
+        Get the registry of all functions with the EnableTool decorator in the given module.
+        The module is scanned once, and scanned again only if attributes are added to the module,
+        set or deleted, or functions defined in the module are decorated with EnableTool, so that
+        the cost of later lookups does not depend on the size of the module. Replacing an entry
+        of the module dictionary directly (e.g. with `globals()` or `module.__dict__`) is not
+        detected, in which case the module must be scanned again with `refresh`.
+
+        :param module: Module to search for ToolEnabled functions, or a registry (such as
+            a `Toolset`), which is returned as is
+        :param refresh: Whether to scan the module again regardless of changes
+        :return: The registry for the module
+        """
+        if isinstance(module, ToolRegistry):
+            return module
+
+        key = (len(module.__dict__), ToolRegistry._changes.get(module.__name__, 0))
+        entry = ToolRegistry._modules.get(module)
+
+        if entry is not None and entry[0] == key and not refresh:
+            return entry[1]
+
+        if entry is None:
+            _track_attributes(module)
+
+        registry = ToolRegistry(x for x in module.__dict__.values() if hasattr(x, "tool_enabled"))
+        ToolRegistry._modules[module] = (key, registry)
+        return registry
+
+    @staticmethod
+    def changed(module_name: Optional[str]) -> None:
+        """
+        Record a change to the functions of a module, so that its registry is rebuilt.
+
+        :param module_name: Name of the module
+        """
+        ToolRegistry._changes[module_name] = ToolRegistry._changes.get(module_name, 0) + 1
+
+    def add(self, tool: ToolEnabled) -> None:
+        """
+        Add a function to the registry.
+
+        :param tool: Function with the EnableTool decorator
+        """
+        bit = 1 << len(self.tools)
+        self.tools.append(tool)
+        self._by_name.setdefault(tool.__name__, tool)
+
+        for tag in set(tool.tags):
+            self._by_tag.setdefault(tag, []).append(tool)
+            self._tag_bits[tag] = self._tag_bits.get(tag, 0) | bit
+
+        self._queries.clear()
+        self._dumps.clear()
+
+    def get(self, name: str) -> Optional[ToolEnabled]:
+        """
+        Get a function by name.
+
+        :param name: Name of the function to find
+        :return: The function, or None if not present
+        """
+        return self._by_name.get(name)
+
+    def get_by_tag(self, tag: str) -> list[ToolEnabled]:
+        """
+        Get all functions with the given tag.
+
+        :param tag: Tag to search for
+        :return: A list of functions with the given tag
+        """
+        return list(self._by_tag.get(tag, ()))
+
+    def query(self, query: Union[str, TagQuery]) -> list[ToolEnabled]:
+        """
+        Get all functions matching the given tag query. The result of each distinct query
+        is memoized until functions are added to the registry.
+
+        :param query: A tag query (see `TagQuery`), or the name of a single tag
+        :return: A list of functions matching the query, in the order they were added
+        """
+        if isinstance(query, str):
+            return self.get_by_tag(query)
+
+        if (tools := self._queries.get(query)) is None:
+            tools = self._tools_of(query.evaluate(self._tag_bits, (1 << len(self.tools)) - 1))
+
+            if len(self._queries) >= QUERY_CACHE_SIZE:
+                self._queries.clear()
+
+            self._queries[query] = tools
+
+        return list(tools)
+
+    def _tools_of(self, bits: int) -> list[ToolEnabled]:
+        """
+        Get the functions in the given bitset.
+
+        :param bits: Bitset of function identifiers
+        :return: A list of functions, in the order they were added
+        """
+        # Bit i of the bitset is character i of the reversed binary string, which is
+        # translated to zero and one bytes to select the functions with compress
+        return list(itertools.compress(self.tools, bin(bits)[:1:-1].encode().translate(_BITS)))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __iter__(self):
+        return iter(self.tools)
+
+    def __len__(self) -> int:
+        return len(self.tools)
+
+
+class _TrackAttributes:
+    """
+    Mixin of module classes recording changes to the attributes of the module, see
+    `ToolRegistry.of`.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        ToolRegistry.changed(self.__name__)  # type: ignore
+
+    def __delattr__(self, name: str) -> None:
+        super().__delattr__(name)
+        ToolRegistry.changed(self.__name__)  # type: ignore
+
+
+def _track_attributes(module: ModuleType) -> None:
+    """
+    Change the class of a module to a subclass recording changes to its attributes,
+    unless the class of the module cannot be changed.
+
+    :param module: The module
+    """
+    cls = type(module)
+
+    if issubclass(cls, _TrackAttributes):
+        return
+
+    if (tracked := ToolRegistry._tracked.get(cls)) is None:
+        tracked = type(cls.__name__, (_TrackAttributes, cls), {"__slots__": ()})
+        ToolRegistry._tracked[cls] = tracked
+
+    try:
+        module.__class__ = tracked
+    except TypeError:
+        pass  # Changes to the attributes are only detected when added or deleted
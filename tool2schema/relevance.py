@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from types import ModuleType
+from typing import TYPE_CHECKING, Iterable, Union
+
+from tool2schema.registry import ToolRegistry
+
+if TYPE_CHECKING:
+    from tool2schema.schema import ToolEnabled
+
+# Words in snake_case, camelCase and free text, along with numbers
+_WORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+|[^\W\d_A-Za-z]+")
+
+# Common English words which are ignored when indexing and searching
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from get how i in is it me my of on or please the "
+    "this that to what which with".split()
+)
+
+# Number of times the terms in the name and tags of a function are counted, relative to the
+# terms in its descriptions, since they tend to summarise what the function does
+NAME_WEIGHT = 2
+
+
+class RelevanceIndex:
+    """
+    Lexical index of functions with the EnableTool decorator, ranking the functions by their
+    relevance to a query with BM25 over the name, description, parameter names and descriptions,
+    and tags of each function. The index is built locally, and functions can be added at any time
+    without rebuilding it.
+    """
+
+    def __init__(
+        self,
+        tools: Union[ModuleType, ToolRegistry, Iterable[ToolEnabled]] = (),
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        """
+        Create a new index containing the given functions.
+
+        :param tools: Module or toolset to search for ToolEnabled functions, or the functions
+        :param k1: BM25 term frequency saturation
+        :param b: BM25 document length normalisation
+        """
+        self.k1 = k1
+        self.b = b
+        self.tools: list[ToolEnabled] = []
+        self._ids: dict[ToolEnabled, int] = {}
+        self._postings: dict[str, dict[int, int]] = {}  # Term frequencies by function id
+        self._lengths: list[int] = []  # Number of terms of each function
+        self._total_length = 0
+        # BM25 weight of each term for each function, computed when the term is first searched
+        # and cleared when functions are added, since they depend on all the functions indexed
+        self._weights: dict[str, dict[int, float]] = {}
+
+        if isinstance(tools, (ModuleType, ToolRegistry)):
+            tools = ToolRegistry.of(tools)
+
+        for tool in tools:
+            self.add(tool)
+
+    def add(self, tool: ToolEnabled) -> None:
+        """
+        Add a function to the index. Adding a function already in the index has no effect.
+        The text of the function is indexed when added, thus later changes to its description
+        or configuration are not reflected in the index.
+
+        :param tool: Function with the EnableTool decorator
+        """
+        if tool in self._ids:
+            return
+
+        i = self._ids[tool] = len(self.tools)
+        terms = _get_terms(tool)
+        self.tools.append(tool)
+        self._lengths.append(len(terms))
+        self._total_length += len(terms)
+        self._weights.clear()
+
+        for term in terms:
+            postings = self._postings.setdefault(term, {})
+            postings[i] = postings.get(i, 0) + 1
+
+    def search(self, query: str, k: int = 10) -> list[ToolEnabled]:
+        """
+        Find the functions most relevant to the given query.
+
+        :param query: Text to search for, such as the message of a user
+        :param k: Maximum number of functions to return
+        :return: A list of up to `k` functions, from the most relevant; functions sharing no
+            terms with the query are not included
+        """
+        scores = self._score(query)
+        # Functions with the same score are ranked in the order they were added
+        best = heapq.nlargest(k, scores.items(), key=lambda x: (x[1], -x[0]))
+        return [self.tools[i] for i, _ in best]
+
+    def _score(self, query: str) -> dict[int, float]:
+        """
+        Compute the BM25 score of the functions sharing terms with the query.
+
+        :param query: Text to search for
+        :return: A dictionary with function ids as keys and scores as values
+        """
+        weights = [w for term in set(_tokenize(query)) if (w := self._get_weights(term))]
+
+        if not weights:
+            return {}
+
+        # Start from the term found in the most functions, so that it is copied rather than added
+        weights.sort(key=len, reverse=True)
+        scores = dict(weights[0])
+
+        for term_weights in weights[1:]:
+            for i, weight in term_weights.items():
+                scores[i] = scores.get(i, 0.0) + weight
+
+        return scores
+
+    def _get_weights(self, term: str) -> dict[int, float]:
+        """
+        Get the BM25 weight of a term for each function containing it.
+
+        :param term: The term
+        :return: A dictionary with function ids as keys and weights as values
+        """
+        if (weights := self._weights.get(term)) is not None:
+            return weights
+
+        if (postings := self._postings.get(term)) is None:
+            return {}
+
+        n, k1, b = len(self.tools), self.k1, self.b
+        average = self._total_length / n or 1
+        idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+        weights = self._weights[term] = {
+            i: idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * self._lengths[i] / average))
+            for i, tf in postings.items()
+        }
+        return weights
+
+    def __contains__(self, tool: ToolEnabled) -> bool:
+        return tool in self._ids
+
+    def __len__(self) -> int:
+        return len(self.tools)
+
+
+def _get_terms(tool: ToolEnabled) -> list[str]:
+    """
+    Get the terms of a function to index, see `RelevanceIndex`.
+
+    :param tool: Function with the EnableTool decorator
+    :return: A list of terms, where terms appearing more than once are repeated
+    """
+    schema = tool.schema
+    names = [tool.__name__, *tool.tags, *schema.parameter_schemas]
+    texts = [schema._get_description() or ""]
+
+    for parameter in schema.parameter_schemas.values():
+        if isinstance(description := parameter._get_description(), str):
+            texts.append(description)
+
+    return _tokenize(" ".join(names)) * NAME_WEIGHT + _tokenize(" ".join(texts))
+
+
+def _tokenize(text: str) -> list[str]:
+    """
+    Split a text into lowercase terms, splitting identifiers in snake_case and camelCase
+    into words, and ignoring stop words. Plural nouns are reduced to the singular.
+
+    :param text: Text to split
+    :return: A list of terms
+    """
+    terms = []
+
+    for word in _WORD.findall(text):
+        if (word := word.lower()) in _STOPWORDS:
+            continue
+
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+
+        terms.append(word)
+
+    return terms
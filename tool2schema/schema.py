@@ -1,18 +1,42 @@
 from __future__ import annotations
 
-import copy
 import functools
+import hashlib
 import inspect
 import json
-import re
+import os
+import stat
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from inspect import Parameter
 from types import ModuleType
-from typing import Any, Callable, Generic, Literal, Optional, TypeVar, Union, overload
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    TypeVar,
+    Union,
+    overload,
+)
 
 import tool2schema
-from tool2schema.config import Config, SchemaType
+from tool2schema import json_backend, metrics
+from tool2schema.config import Config, SaveFormat, SchemaType
+from tool2schema.disk_cache import fingerprint
+from tool2schema.docstring import Docstring
+from tool2schema.metrics import ToolMetrics
 from tool2schema.parameter_schema import ParameterSchema
+from tool2schema.registry import QUERY_CACHE_SIZE, ToolRegistry
+from tool2schema.tag_query import TagQuery
+from tool2schema.toolset import Toolset
+from tool2schema.type_schema import TYPE_SCHEMAS
 
 if sys.version_info < (3, 10):
     from typing_extensions import ParamSpec
@@ -20,48 +44,44 @@ else:
     from typing import ParamSpec
 
 
-def FindToolEnabled(module: ModuleType) -> list[ToolEnabled]:
+def FindToolEnabled(module: Union[ModuleType, Toolset]) -> list[ToolEnabled]:
     """
     Find all functions with the EnableTool decorator.
 
-    :param module: Module to search for ToolEnabled functions
+    :param module: Module or toolset to search for ToolEnabled functions
     """
-    return [x for x in module.__dict__.values() if hasattr(x, "tool_enabled")]
+    return list(ToolRegistry.of(module).tools)
 
 
 def FindToolEnabledSchemas(
-    module: ModuleType, schema_type: Optional[SchemaType] = None
+    module: Union[ModuleType, Toolset], schema_type: Optional[SchemaType] = None
 ) -> list[dict]:
     """
     Find all function schemas with the EnableTool decorator.
 
-    :param module: Module to search for ToolEnabled functions
+    :param module: Module or toolset to search for ToolEnabled functions
     :param schema_type: Type of schema to return (None indicates default)
     """
-    return [x.to_json(schema_type) for x in FindToolEnabled(module)]
+    return [x.to_json(schema_type) for x in ToolRegistry.of(module)]
 
 
-def FindToolEnabledByName(module: ModuleType, name: str) -> Optional[ToolEnabled]:
+def FindToolEnabledByName(module: Union[ModuleType, Toolset], name: str) -> Optional[ToolEnabled]:
     """
     Find a function with the EnableTool decorator by name.
 
-    :param module: Module to search for ToolEnabled functions
+    :param module: Module or toolset to search for ToolEnabled functions
     :param name: Name of the function to find
     """
-    func: ToolEnabled
-    for func in FindToolEnabled(module):
-        if func.__name__ == name:
-            return func
-    return None
+    return ToolRegistry.of(module).get(name)
 
 
 def FindToolEnabledByNameSchema(
-    module: ModuleType, name: str, schema_type: Optional[SchemaType] = None
+    module: Union[ModuleType, Toolset], name: str, schema_type: Optional[SchemaType] = None
 ) -> Optional[dict]:
     """
     Find a function schema with the EnableTool decorator by name.
 
-    :param module: Module to search for ToolEnabled functions
+    :param module: Module or toolset to search for ToolEnabled functions
     :param name: Name of the function to find
     :param schema_type: Type of schema to return (None indicates default)
     """
@@ -70,39 +90,241 @@ def FindToolEnabledByNameSchema(
     return func.to_json(schema_type)
 
 
-def FindToolEnabledByTag(module: ModuleType, tag: str) -> list[ToolEnabled]:
+def FindToolEnabledByTag(
+    module: Union[ModuleType, Toolset], tag: Union[str, TagQuery]
+) -> list[ToolEnabled]:
     """
     Find all functions with the EnableTool decorator by tag.
 
-    :param module: Module to search for ToolEnabled functions
-    :param tag: Tag to search for
+    :param module: Module or toolset to search for ToolEnabled functions
+    :param tag: Tag to search for, or a query combining tags (see `TagQuery`)
     """
-    return [x for x in FindToolEnabled(module) if x.has(tag)]
+    return ToolRegistry.of(module).query(tag)
 
 
 def FindToolEnabledByTagSchemas(
-    module: ModuleType, tag: str, schema_type: Optional[SchemaType] = None
+    module: Union[ModuleType, Toolset],
+    tag: Union[str, TagQuery],
+    schema_type: Optional[SchemaType] = None,
 ) -> list[dict]:
     """
     Find all function schemas with the EnableTool decorator by tag.
 
-    :param module: Module to search for ToolEnabled functions
-    :param tag: Tag to search for
+    :param module: Module or toolset to search for ToolEnabled functions
+    :param tag: Tag to search for, or a query combining tags (see `TagQuery`)
     :param schema_type: Type of schema to return (None indicates default)
     """
     return [x.to_json(schema_type) for x in FindToolEnabledByTag(module, tag)]
 
 
-def SaveToolEnabled(module: ModuleType, path: str, schema_type: Optional[SchemaType] = None):
+def DumpToolEnabledSchemas(
+    tools: Union[ModuleType, Toolset, Iterable[ToolEnabled]],
+    schema_type: Optional[SchemaType] = None,
+    tags: Optional[Union[str, TagQuery]] = None,
+) -> str:
     """
-    Save all function schemas with the EnableTool decorator to a file.
+    Serialise the schemas of the given functions to a JSON array. The schema of each function is
+    serialised once and cached (see `ToolEnabled.to_json_string`), so that any subset of functions
+    can be serialised by joining the cached strings.
 
-    :param module: Module to search for ToolEnabled functions
+    :param tools: Module or toolset to search for ToolEnabled functions, or the functions
+        to serialise
+    :param schema_type: Type of schema to return (None indicates default)
+    :param tags: Only serialise the functions matching the given tag or tag query (see
+        `TagQuery`). The array serialised for each distinct query is memoized until a function
+        is added or any schema or configuration is modified.
+    :return: A compact JSON array of function schemas (see `SetJsonBackend`)
+    """
+    if isinstance(tools, (ModuleType, Toolset)):
+        tools = ToolRegistry.of(tools)
+
+    if tags is not None:
+        if not isinstance(tools, ToolRegistry):
+            tools = ToolRegistry(tools)
+
+        return _dump_tag_query(tools, tags, schema_type)
+
+    return "[" + ",".join([x.to_json_string(schema_type) for x in tools]) + "]"
+
+
+def _dump_tag_query(
+    registry: ToolRegistry, tags: Union[str, TagQuery], schema_type: Optional[SchemaType]
+) -> str:
+    """
+    Serialise the schemas of the functions matching a tag query, see `DumpToolEnabledSchemas`.
+
+    :param registry: The registry of functions to search
+    :param tags: Tag or tag query to match
+    :param schema_type: Type of schema to return (None indicates default)
+    :return: A compact JSON array of function schemas
+    """
+    key = (TagQuery.of(tags), schema_type)
+    state = (Config._generation, len(TYPE_SCHEMAS), FunctionSchema.generation)
+
+    if (entry := registry._dumps.get(key)) is not None and entry[0] == state:
+        return entry[1]
+
+    dump = DumpToolEnabledSchemas(registry.query(key[0]), schema_type)
+
+    if len(registry._dumps) >= QUERY_CACHE_SIZE:
+        registry._dumps.clear()
+
+    registry._dumps[key] = (state, dump)
+    return dump
+
+
+def WarmupToolEnabled(
+    modules: Union[ModuleType, Iterable[ModuleType]], parallel: Union[bool, int] = False
+) -> dict[ToolEnabled, float]:
+    """
+    Eagerly create the schemas of all functions with the EnableTool decorator, which are
+    otherwise created on first use (see `ToolEnabled.warmup`).
+
+    :param modules: Module or modules (or toolsets) to search for ToolEnabled functions
+    :param parallel: Number of threads to create the schemas with, where true indicates the
+        default number of threads of `ThreadPoolExecutor`, and false a single thread
+    :return: A dictionary with the functions as keys and the time taken to create
+        their schemas (in seconds) as values
+    """
+    if isinstance(modules, (ModuleType, Toolset)):
+        modules = [modules]
+
+    tools = [x for module in modules for x in ToolRegistry.of(module)]
+
+    def warmup(tool: ToolEnabled) -> float:
+        start = time.perf_counter()
+        tool.warmup()
+        return time.perf_counter() - start
+
+    if parallel is False:
+        return {x: warmup(x) for x in tools}
+
+    max_workers = None if parallel is True else parallel
+    with ThreadPoolExecutor(max_workers) as executor:
+        return dict(zip(tools, executor.map(warmup, tools)))
+
+
+def SaveToolEnabled(
+    module: Union[ModuleType, Toolset],
+    path: str,
+    schema_type: Optional[SchemaType] = None,
+    save_format: SaveFormat = SaveFormat.JSON,
+) -> bool:
+    """
+    Save all function schemas with the EnableTool decorator to a file. The schemas are streamed
+    one function at a time to a temporary file, which atomically replaces the file once complete,
+    so that readers never observe a partially written file. If the file already has the same
+    content, it is left untouched.
+
+    :param module: Module or toolset to search for ToolEnabled functions
     :param path: Path to save the schemas to
     :param schema_type: Type of schema to return (None indicates default)
+    :param save_format: Format of the saved file
+    :return: True if the file was written, false if its content was unchanged
+    """
+    tools = ToolRegistry.of(module)
+
+    # The serialised schemas are cached, so they are cheap to generate a second time
+    # when writing the file, without holding the whole content in memory
+    if _file_matches(path, _dump_schema_chunks(tools, schema_type, save_format)):
+        return False
+
+    directory = os.path.dirname(os.path.abspath(path))
+    mode = _get_file_mode(path)
+    fd, temp = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.writelines(_dump_schema_chunks(tools, schema_type, save_format))
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file readable by its owner only
+        os.chmod(temp, mode)
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
+    try:
+        # Persist the rename itself (not supported on all platforms)
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
+
+    return True
+
+
+def _get_file_mode(path: str) -> int:
     """
-    schemas = FindToolEnabledSchemas(module, schema_type)
-    json.dump(schemas, open(path, "w"))
+    Get the permissions to save a file with: those of the existing file, or the permissions
+    a new file would be created with by `open` (read and write for all, minus the umask).
+
+    :param path: Path of the file
+    :return: The permission bits
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _dump_schema_chunks(
+    tools: ToolRegistry, schema_type: Optional[SchemaType], save_format: SaveFormat
+) -> Iterator[bytes]:
+    """
+    Serialise the schemas of the given functions one at a time, see `SaveToolEnabled`.
+
+    :param tools: Functions to serialise
+    :param schema_type: Type of schema to return (None indicates default)
+    :param save_format: Format of the serialised schemas
+    :return: An iterator over the encoded content
+    """
+    for i, x in enumerate(tools):
+        if save_format == SaveFormat.NDJSON:
+            yield x.to_json_string(schema_type).encode() + b"\n"
+        elif save_format == SaveFormat.COMPACT:
+            yield (b"," if i else b"[") + x.to_json_string(schema_type).encode()
+        else:
+            # Serialised with the standard library, so that the file does not depend on the
+            # JSON backend installed (see `SetJsonBackend`)
+            yield (b", " if i else b"[") + x.schema._dump_json(schema_type).encode()
+
+    if save_format != SaveFormat.NDJSON:
+        yield b"]" if tools else b"[]"
+
+
+def _file_matches(path: str, chunks: Iterator[bytes]) -> bool:
+    """
+    Determine whether a file has exactly the given content, comparing content hashes.
+
+    :param path: Path of the file
+    :param chunks: Content to compare the file to
+    :return: True if the file exists and has the same content
+    """
+    expected, size = hashlib.sha256(), 0
+
+    for chunk in chunks:
+        expected.update(chunk)
+        size += len(chunk)
+
+    try:
+        if os.stat(path).st_size != size:
+            return False
+
+        actual = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(1 << 16):
+                actual.update(chunk)
+    except OSError:
+        return False
+
+    return actual.digest() == expected.digest()
 
 
 class ParseException(Exception):
@@ -111,7 +333,7 @@ class ParseException(Exception):
 
 
 def LoadToolEnabled(
-    module: ModuleType,
+    module: Union[ModuleType, Toolset],
     function: dict,
     validate: bool = True,
     ignore_hallucinations: bool = True,
@@ -122,7 +344,7 @@ def LoadToolEnabled(
     `module`. When `validate` is true, validate the arguments and raise `ParseException` if the
     arguments are not valid (see more information below).
 
-    :param module: The module where the function is defined
+    :param module: The module or toolset where the function is defined
     :param function: A dictionary with keys `name` and `arguments`, where `name` is the name of
         the function to find, and `arguments` is either a dictionary of argument values or a JSON
         string that can be parsed to a dictionary of argument values.
@@ -131,7 +353,8 @@ def LoadToolEnabled(
         an exception is raised if any hallucinated arguments are found. `validate` must be true.
     :return: A tuple consisting of the function and a dictionary of argument values
     :raises ParseException: Thrown when any of the following conditions is met:
-        - Function isn't defined in the given module, or is not decorated with `EnableTool`
+        - Function isn't defined in the given module or toolset, or is not decorated with
+          `EnableTool`
         - The arguments are given as string and the string is not valid, meaning it is:
             - Not parsable as JSON, or;
             - Is not parsed into a dictionary of argument values
@@ -140,23 +363,197 @@ def LoadToolEnabled(
         - The dictionary contains an argument that is not expected by the function, `validate` is
           true and `ignore_hallucinations` is false
     """
+    return _load_tool_enabled(
+        ToolRegistry.of(module), module, function, validate, ignore_hallucinations
+    )
+
+
+def LoadToolEnabledBatch(
+    module: Union[ModuleType, Toolset],
+    functions: list,
+    validate: bool = True,
+    ignore_hallucinations: bool = True,
+) -> list[Union[tuple[Callable, dict[str, Any]], ParseException]]:
+    """
+    Load a batch of tool calls, such as all the parallel tool calls returned by the model in
+    a single response. Each call is loaded as with `LoadToolEnabled`, but the failure of a
+    call does not prevent the other calls in the batch from being loaded.
+
+    :param module: The module or toolset where the functions are defined
+    :param functions: A list of tool calls, each one being either a dictionary with keys
+        `name` and `arguments` (see `LoadToolEnabled`), an OpenAI tool call (with keys `id`,
+        `type` and `function`), or an Anthropic `tool_use` content block (with keys `type`,
+        `id`, `name` and `input`). Objects with a `model_dump` method (as returned by the
+        OpenAI and Anthropic clients) are converted to dictionaries.
+    :param validate: Whether to validate the function arguments
+    :param ignore_hallucinations: When true, any hallucinated arguments are ignored; when false,
+        an exception is raised if any hallucinated arguments are found. `validate` must be true.
+    :return: A list with one entry per tool call, in the same order as `functions`; each entry
+        is either a tuple consisting of the function and a dictionary of argument values, or the
+        `ParseException` raised when loading the tool call
+    """
+    registry = ToolRegistry.of(module)
+    results: list[Union[tuple[Callable, dict[str, Any]], ParseException]] = []
+
+    for function in functions:
+        try:
+            function = _get_function_dict(function)
+            results.append(
+                _load_tool_enabled(registry, module, function, validate, ignore_hallucinations)
+            )
+        except ParseException as e:
+            results.append(e)
+
+    return results
+
+
+def _get_function_dict(call: Any) -> dict:
+    """
+    Convert a tool call to a dictionary with keys `name` and `arguments`.
+
+    :param call: A tool call in any of the formats accepted by `LoadToolEnabledBatch`
+    :return: A dictionary with keys `name` and `arguments`
+    """
+    if not isinstance(call, dict) and hasattr(call, "model_dump"):
+        call = call.model_dump()
+
+    if not isinstance(call, dict):
+        raise ParseException(f"Tool call cannot be of type {type(call)}")
+
+    if call.get("type") == "tool_use":
+        # Anthropic tool use content block
+        return {"name": call.get("name"), "arguments": call.get("input")}
+
+    if isinstance(function := call.get("function"), dict):
+        # OpenAI tool call
+        return function
+
+    return call
 
+
+def _load_tool_enabled(
+    registry: ToolRegistry,
+    module: Union[ModuleType, Toolset],
+    function: dict,
+    validate: bool,
+    ignore_hallucinations: bool,
+) -> tuple[Callable, dict[str, Any]]:
+    """
+    Load a function from the given registry, see `LoadToolEnabled`.
+
+    :param registry: The registry of functions defined in `module`
+    :param module: The module where the function is defined
+    :param function: A dictionary with keys `name` and `arguments`
+    :param validate: Whether to validate the function arguments
+    :param ignore_hallucinations: Whether to ignore hallucinated arguments
+    :return: A tuple consisting of the function and a dictionary of argument values
+    """
+    if (m := metrics.ACTIVE) is not None:
+        return _load_tool_enabled_measured(
+            m, registry, module, function, validate, ignore_hallucinations
+        )
+
+    name, arguments = _parse_function_dict(function)
+    f = _find_tool_enabled(registry, module, name)
+
+    if validate:
+        arguments = _validate_arguments(f, arguments, ignore_hallucinations)
+
+    return f, arguments
+
+
+def _load_tool_enabled_measured(
+    m: ToolMetrics,
+    registry: ToolRegistry,
+    module: Union[ModuleType, Toolset],
+    function: dict,
+    validate: bool,
+    ignore_hallucinations: bool,
+) -> tuple[Callable, dict[str, Any]]:
+    """
+    Load a function from the given registry, recording the time taken by each step (see
+    `EnableMetrics`). Tool calls which fail before the function is found are recorded
+    under an empty function name.
+    """
+    tool = ""
+
+    try:
+        start = time.perf_counter()
+        name, arguments = _parse_function_dict(function)
+        parsed = time.perf_counter()
+        f = _find_tool_enabled(registry, module, name)
+        found = time.perf_counter()
+        tool = f.__name__
+
+        if validate:
+            arguments = _validate_arguments(f, arguments, ignore_hallucinations)
+
+        validated = time.perf_counter()
+
+    except ParseException:
+        m.increment(tool, "load_errors")
+        raise
+
+    m.increment(tool, "loads")
+    m.observe(tool, "parse_seconds", parsed - start)
+    m.observe(tool, "lookup_seconds", found - parsed)
+
+    if validate:
+        m.observe(tool, "validate_seconds", validated - found)
+
+    return f, arguments
+
+
+def _find_tool_enabled(
+    registry: ToolRegistry, module: Union[ModuleType, Toolset], name: str
+) -> ToolEnabled:
+    """
+    Find a function by name in the given registry, see `LoadToolEnabled`.
+
+    :param registry: The registry of functions defined in `module`
+    :param module: The module or toolset where the function is defined
+    :param name: Name of the function to find
+    :return: The function with the EnableTool decorator
+    """
+    if not (f := registry.get(name)):
+        # A function with the given name was not found
+        source = f"module '{module.__name__}'" if isinstance(module, ModuleType) else "toolset"
+        raise ParseException(
+            f"Function with name '{name}' is not defined in given {source} "
+            f"or is missing 'EnableTool' decorator"
+        )
+
+    return f
+
+
+def _parse_function_dict(function: dict) -> tuple[str, dict]:
+    """
+    Get the function name and the dictionary of argument values from a function dictionary,
+    parsing the arguments if given as a JSON string (see `LoadToolEnabled`).
+
+    :param function: A dictionary with keys `name` and `arguments`
+    :return: A tuple consisting of the function name and a dictionary of argument values
+    """
     if not (name := function.get("name", None)):
         raise ParseException("'name' key is missing from the dictionary")
 
+    if not isinstance(name, str):
+        raise ParseException("Function name is not a string")
+
     if (arguments := function.get("arguments", None)) is None:
         raise ParseException("'arguments' key is missing from the dictionary")
 
     if isinstance(arguments, dict):
-        # Avoid altering the original dictionary
-        arguments = copy.deepcopy(arguments)
+        # Avoid sharing the original dictionary with the caller; the values are not copied,
+        # as they are never modified (validation and decoding build new values)
+        arguments = dict(arguments)
 
     elif isinstance(arguments, str):
         # Parse the JSON string
         try:
-            arguments = json.loads(arguments)
+            arguments = json_backend.loads(arguments)
 
-        except json.decoder.JSONDecodeError:
+        except ValueError:
             raise ParseException("Arguments are not in valid JSON format")
 
         if type(arguments) is not dict:
@@ -166,19 +563,7 @@ def LoadToolEnabled(
         # Invalid type
         raise ParseException(f"Arguments cannot be of type {type(arguments)}")
 
-    f = FindToolEnabledByName(module, name)
-
-    if not f:
-        # A function with the given name was not found
-        raise ParseException(
-            f"Function with name '{name}' is not defined in given module "
-            f"'{module.__name__}' or is missing 'EnableTool' decorator"
-        )
-
-    if validate:
-        arguments = _validate_arguments(f, arguments, ignore_hallucinations)
-
-    return f, arguments
+    return name, arguments
 
 
 def _validate_arguments(f: ToolEnabled, arguments: dict, ignore_hallucinations: bool) -> dict:
@@ -188,32 +573,16 @@ def _validate_arguments(f: ToolEnabled, arguments: dict, ignore_hallucinations:
     arguments and `ignore_hallucinations` is false.
 
     :param f: A EnableTool-decorated function
-    :param arguments: Arguments to validate
+    :param arguments: Arguments to validate, which are not modified
     :param ignore_hallucinations: Whether to ignore hallucinated arguments or throw an exception
         if any are present
     :return: A dictionary of validated arguments
     """
-    validated = {}
-
-    for key, param in f.schema.parameter_schemas.items():
-        value = arguments.pop(key, Parameter.empty)
-
-        if value == Parameter.empty:
-            # The parameter is missing from the arguments
-            if param.parameter.default == Parameter.empty:
-                # The parameter does not have a default value
-                raise ParseException(f"Required argument '{key}' is missing")
-        else:
-            if not param.type_schema.validate(value):
-                raise ParseException(f"Argument '{key}' cannot accept value '{value}'")
+    return f.schema._get_arguments_validator()(arguments, ignore_hallucinations)
 
-            validated[key] = value
-
-    if not ignore_hallucinations and arguments:
-        raise ParseException(f"Hallucinated argument(s): {', '.join(arguments.keys())}")
-
-    return validated
 
+# Lock preventing the schema of a function from being created concurrently
+_SCHEMA_LOCK = threading.Lock()
 
 P = ParamSpec("P")  # User-provided function parameters type
 T = TypeVar("T")  # User-provided function return type
@@ -224,26 +593,102 @@ class ToolEnabled(Generic[P, T]):
         self.func = func
         self.tags = kwargs.pop("tags", [])
         self.config = Config(tool2schema.CONFIG, **kwargs)
-        self.schema = FunctionSchema(func, self.config)
+        self._schema: Optional[FunctionSchema] = None  # Created on first access
         self.__name__ = func.__name__
+        self.__qualname__ = func.__qualname__
         functools.update_wrapper(self, func)
+        ToolRegistry.changed(getattr(func, "__module__", None))
+
+    @property
+    def schema(self) -> FunctionSchema:
+        """
+        Schema of the function. The schema is created on first access, so that decorating a
+        function does not require inspecting its signature (see also `WarmupToolEnabled`).
+        """
+        if (schema := self._schema) is None:
+            with _SCHEMA_LOCK:
+                if (schema := self._schema) is None:
+                    schema = self._schema = FunctionSchema(self.func, self.config)
+
+        return schema
+
+    def warmup(self) -> None:
+        """
+        Create the schema of the function, along with the JSON schemas for all schema types and
+        the compiled validators and decoders, which are otherwise created on first use.
+        """
+        schema = self.schema
+        schema._get_arguments_validator()
+        schema._get_decode_plan()
+
+        for schema_type in SchemaType:
+            schema.to_json_string(schema_type)
 
     def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:
+        if (m := metrics.ACTIVE) is not None:
+            return self._call_measured(m, args, kwargs)
 
-        args_list = list(args)  # Tuple is immutable, thus convert to list
+        args, kwargs = self._decode_arguments(args, kwargs)  # type: ignore
+        return self.func(*args, **kwargs)
 
-        for i, arg in enumerate(args_list):
-            for p in self.schema.parameter_schemas.values():
-                if p.index == i:
+    def _call_measured(self, m: ToolMetrics, args: tuple, kwargs: dict) -> T:
+        """
+        Call the function, recording the time taken to decode the arguments and to run
+        the function (see `EnableMetrics`).
+        """
+        m.increment(self.__name__, "calls")
+        start = time.perf_counter()
+
+        try:
+            args, kwargs = self._decode_arguments(args, kwargs)
+            decoded = time.perf_counter()
+            m.observe(self.__name__, "decode_seconds", decoded - start)
+
+            try:
+                return self.func(*args, **kwargs)
+            finally:
+                m.observe(self.__name__, "execute_seconds", time.perf_counter() - decoded)
+
+        except BaseException:
+            m.increment(self.__name__, "call_errors")
+            raise
+
+    def _decode_arguments(self, args: tuple, kwargs: dict) -> tuple[tuple, dict]:
+        """
+        Convert the JSON values of the given arguments to the types expected by the function.
+
+        :param args: Positional arguments
+        :param kwargs: Keyword arguments
+        :return: A tuple consisting of the decoded positional and keyword arguments
+        """
+        positional, named = self.schema._get_decode_plan()
+
+        if positional and args:
+            args_list = list(args)  # Tuple is immutable, thus convert to list
+
+            for i, decode in positional:
+                if i < len(args_list):
+                    # Convert the JSON value to the type expected by the method
+                    args_list[i] = decode(args_list[i])
+
+            args = tuple(args_list)
+
+        if named and kwargs:
+            for key, value in kwargs.items():
+                if (decode := named.get(key)) is not None:
                     # Convert the JSON value to the type expected by the method
-                    args_list[i] = p.type_schema.decode(arg)
+                    kwargs[key] = decode(value)
 
-        for key in kwargs:
-            if key in self.schema.parameter_schemas:
-                # Convert the JSON value to the type expected by the method
-                kwargs[key] = self.schema.parameter_schemas[key].type_schema.decode(kwargs[key])
+        return args, kwargs
 
-        return self.func(*args_list, **kwargs)  # type: ignore
+    def __reduce__(self):
+        # Pickle by reference (module and qualified name), so that the function is imported
+        # by the receiving process rather than serialising its schema and configuration
+        return self.__qualname__
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        # Bind methods with the EnableTool decorator to the instance they are accessed from
+        return self if instance is None else BoundToolEnabled(self, instance)
 
     def tool_enabled(self) -> bool:
         return True
@@ -257,10 +702,109 @@ class ToolEnabled(Generic[P, T]):
         """
         return self.schema.to_json(schema_type)
 
+    def to_json_string(self, schema_type: Optional[SchemaType] = None) -> str:
+        """
+        Return JSON schema for the function, serialised to a compact string (see `SetJsonBackend`).
+
+        :param schema_type: None indicates default schema type
+        :return: JSON schema string
+        """
+        return self.schema.to_json_string(schema_type)
+
     def has(self, tag: str) -> bool:
         return tag in self.tags
 
 
+class AsyncToolEnabled(ToolEnabled[P, T]):
+    """
+    Wrapper for coroutine functions with the EnableTool decorator. Calling the
+    wrapper returns an awaitable, and the arguments are decoded when awaited.
+    """
+
+    def __init__(self, func: Callable[P, T], **kwargs) -> None:
+        super().__init__(func, **kwargs)
+
+        if sys.version_info >= (3, 12):
+            # Make inspect.iscoroutinefunction recognise the wrapper
+            inspect.markcoroutinefunction(self)
+
+    async def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:  # type: ignore
+        if (m := metrics.ACTIVE) is not None:
+            return await self._call_measured(m, args, kwargs)  # type: ignore
+
+        args, kwargs = self._decode_arguments(args, kwargs)  # type: ignore
+        return await self.func(*args, **kwargs)  # type: ignore
+
+    async def _call_measured(self, m: ToolMetrics, args: tuple, kwargs: dict) -> T:  # type: ignore
+        """
+        Await the function, recording the time taken to decode the arguments and to run
+        the function (see `EnableMetrics`).
+        """
+        m.increment(self.__name__, "calls")
+        start = time.perf_counter()
+
+        try:
+            args, kwargs = self._decode_arguments(args, kwargs)
+            decoded = time.perf_counter()
+            m.observe(self.__name__, "decode_seconds", decoded - start)
+
+            try:
+                return await self.func(*args, **kwargs)  # type: ignore
+            finally:
+                m.observe(self.__name__, "execute_seconds", time.perf_counter() - decoded)
+
+        except BaseException:
+            m.increment(self.__name__, "call_errors")
+            raise
+
+
+class BoundToolEnabled:
+    """
+    Method with the EnableTool decorator bound to an instance, as returned when accessing the
+    method from the instance. The schema, tags and configuration are those of the method, where
+    `self` is ignored by default (see `Config.ignore_parameters`).
+    """
+
+    def __init__(self, tool: ToolEnabled, instance: Any) -> None:
+        self.__func__ = tool
+        self.__self__ = instance
+        self.__name__ = tool.__name__
+        self.__module__ = tool.__module__
+        self.__qualname__ = tool.__qualname__
+        self.__doc__ = tool.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.__func__(self.__self__, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        return getattr(self.__func__, name)
+
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, BoundToolEnabled)
+            and self.__func__ is other.__func__
+            and self.__self__ is other.__self__
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.__func__, id(self.__self__)))
+
+
+def _create_tool_enabled(func: Callable[P, T], **kwargs) -> ToolEnabled[P, T]:
+    """
+    Create the appropriate ToolEnabled wrapper for the given function.
+
+    :param func: The function to wrap
+    :param kwargs: Arguments to pass to the wrapper (see `EnableTool`)
+    """
+    if inspect.iscoroutinefunction(func):
+        return AsyncToolEnabled(func, **kwargs)  # type: ignore
+    return ToolEnabled(func, **kwargs)
+
+
 @overload
 def EnableTool(func: Callable[P, T], **kwargs) -> ToolEnabled[P, T]: ...
 
@@ -272,18 +816,79 @@ def EnableTool(func: Literal[None] = None, **kwargs) -> Callable[[Callable[P, T]
 def EnableTool(func: Optional[Callable[P, T]] = None, **kwargs) -> Union[ToolEnabled[P, T], Callable[[Callable[P, T]], ToolEnabled[P, T]]]:
     """Decorator to generate a function schema for OpenAI."""
     if func is not None:
-        return ToolEnabled(func, **kwargs)
+        return _create_tool_enabled(func, **kwargs)
     else:
 
         def wrapper(function: Callable[P, T]) -> ToolEnabled[P, T]:
-            return ToolEnabled(function, **kwargs)
+            return _create_tool_enabled(function, **kwargs)
 
         return wrapper
 
 
+def _compile_arguments_validator(
+    parameters: list[tuple[str, bool, Callable[[Any], bool]]]
+) -> Callable[[dict, bool], dict]:
+    """
+    Create a function validating the arguments passed to a function (see `_validate_arguments`).
+    The arguments are not modified, and the values in the returned dictionary are not copied.
+
+    :param parameters: A list of tuples, one per parameter, consisting of the parameter name,
+        whether the parameter is required, and a function validating the parameter value
+    :return: A function taking the arguments to validate and whether to ignore hallucinated
+        arguments, and returning a dictionary of validated arguments
+    """
+
+    names = frozenset(key for key, _, _ in parameters)
+
+    def validate_arguments(arguments: dict, ignore_hallucinations: bool) -> dict:
+        validated = {}
+
+        for key, required, validate in parameters:
+            value = arguments.get(key, Parameter.empty)
+
+            if value is Parameter.empty:
+                # The parameter is missing from the arguments
+                if required:
+                    # The parameter does not have a default value
+                    raise ParseException(f"Required argument '{key}' is missing")
+            else:
+                if not validate(value):
+                    raise ParseException(f"Argument '{key}' cannot accept value '{value}'")
+
+                validated[key] = value
+
+        # All the arguments are validated unless there are hallucinated arguments
+        if not ignore_hallucinations and len(validated) != len(arguments):
+            hallucinated = [k for k in arguments if k not in names]
+            raise ParseException(f"Hallucinated argument(s): {', '.join(hallucinated)}")
+
+        return validated
+
+    return validate_arguments
+
+
+def _copy_json(value: Any) -> Any:
+    """
+    Copy a JSON-like structure of dictionaries and lists. This is considerably
+    faster than `copy.deepcopy`, as other values are immutable or shared as is.
+
+    :param value: The value to copy
+    :return: A copy of the value
+    """
+    if type(value) is dict:
+        return {k: _copy_json(v) for k, v in value.items()}
+    if type(value) is list:
+        return [_copy_json(v) for v in value]
+    return value
+
+
 class FunctionSchema:
     """Automatically create a function schema for OpenAI."""
 
+    # Incremented whenever any schema is modified, so that caches spanning many
+    # functions (see `DumpToolEnabledSchemas`) can detect modified schemas
+    generation = 0
+
     def __init__(self, f: Callable, config: Config):
         """
         Initialize FunctionSchema for the given function.
@@ -293,14 +898,90 @@ class FunctionSchema:
         """
         self.f = f
         self.config = config
-        self._all_parameter_schemas: dict[str, ParameterSchema] = self._get_all_parameter_schemas()
+        self._enums: dict[str, list] = {}  # Enums added with add_enum, part of the fingerprint
+        self._revision = 0  # Incremented whenever the schema is modified (e.g. by add_enum)
+        self._cache: dict[Any, Any] = {}
+        self._cache_state: Optional[tuple] = None
 
     def to_json(self, schema_type: Optional[SchemaType] = None) -> dict:
         """
-        Convert schema to JSON.
+        Convert schema to JSON. The schema is generated once per schema type and cached
+        until the function schema or its configuration changes; each call returns a copy
+        of the cached schema, which the caller is free to modify.
+
+        :param schema_type: Type of schema to return
+        """
+        return _copy_json(self._get_json(schema_type or self.config.snapshot().schema_type))
+
+    def to_json_string(self, schema_type: Optional[SchemaType] = None) -> str:
+        """
+        Convert schema to a compact JSON string (see `SetJsonBackend`). The string is cached
+        in the same way as the schema returned by `to_json`.
+
+        :param schema_type: Type of schema to return
+        """
+        schema_type = schema_type or self.config.snapshot().schema_type
+        return self._get_cached(
+            ("to_json_string", schema_type), lambda: json_backend.dumps(self._get_json(schema_type))
+        )
+
+    def _dump_json(self, schema_type: Optional[SchemaType] = None) -> str:
+        """
+        Convert schema to a JSON string with the standard library, in its default format
+        (see `SaveToolEnabled`). The string is cached in the same way as `to_json_string`.
+
+        :param schema_type: Type of schema to return
+        """
+        schema_type = schema_type or self.config.snapshot().schema_type
+        return self._get_cached(
+            ("dump_json", schema_type), lambda: json.dumps(self._get_json(schema_type))
+        )
+
+    def _get_json(self, schema_type: SchemaType) -> dict:
+        """
+        Get the cached JSON schema for the given schema type. The returned
+        dictionary is shared, and must not be modified.
+
         :param schema_type: Type of schema to return
         """
-        schema_type = schema_type or self.config.schema_type
+        return self._get_cached(("to_json", schema_type), lambda: self._load_json(schema_type))
+
+    def _load_json(self, schema_type: SchemaType) -> dict:
+        """
+        Load the JSON schema for the given schema type from the disk cache (see
+        `Config.schema_cache`), building and storing it if not present. On a hit, the
+        function signature and docstring are not inspected.
+
+        :param schema_type: Type of schema to load
+        """
+        if (cache := self.config.snapshot().schema_cache) is None:
+            return self._build_json(schema_type)
+
+        if (fp := self._get_cached("fingerprint", self._get_fingerprint)) is None:
+            return self._build_json(schema_type)
+
+        key = f"{fp}-{schema_type.name}"
+
+        if (schema := cache.get(key)) is None:
+            schema = self._build_json(schema_type)
+            cache.put(key, schema)
+
+        return schema
+
+    def _get_fingerprint(self) -> Optional[str]:
+        """
+        Compute the fingerprint identifying the schemas of this function in the disk cache.
+        """
+        # The default schema type and the cache itself do not affect the cached schemas
+        settings = self.config.snapshot()._replace(schema_type=None, schema_cache=None)
+        return fingerprint(self.f, settings, sorted(self._enums.items()))
+
+    def _build_json(self, schema_type: SchemaType) -> dict:
+        """
+        Build the JSON schema for the given schema type, bypassing the cache.
+
+        :param schema_type: Type of schema to build
+        """
         if schema_type == SchemaType.OPENAI_TUNE:
             return self._get_function_schema(schema_type)
         elif schema_type == SchemaType.ANTHROPIC_CLAUDE:
@@ -317,8 +998,98 @@ class FunctionSchema:
         :return: This function schema
         """
         self._all_parameter_schemas[n].add_enum(enum)
+        self._enums[n] = enum
+        self._revision += 1
+        FunctionSchema.generation += 1
         return self
 
+    def _get_cached(self, key: Any, factory: Callable[[], Any]) -> Any:
+        """
+        Get a value derived from this schema from the cache, creating it with `factory`
+        if not present. The cache is cleared whenever the schema is modified or any of
+        the relevant configuration settings (local or inherited) changes.
+
+        :param key: Key identifying the cached value
+        :param factory: Function creating the value when it is not cached
+        :return: The cached value
+        """
+        if (state := self._get_cache_state()) != self._cache_state:
+            self._cache.clear()
+            self._cache_state = state
+
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = factory()
+            return value
+
+    def _get_arguments_validator(self) -> Callable[[dict, bool], dict]:
+        """
+        Get the arguments validator for this function, see `_compile_arguments_validator`.
+        """
+        return self._get_cached("arguments_validator", self._compile_arguments_validator)
+
+    def _compile_arguments_validator(self) -> Callable[[dict, bool], dict]:
+        """
+        Compile the parameter schemas into a single function validating the arguments
+        passed to this function. The parameter schemas and type validators are resolved
+        once, so that validating the arguments does not need to traverse the schemas.
+
+        :return: A function taking the arguments to validate and whether to ignore hallucinated
+            arguments, and returning a dictionary of validated arguments (see `_validate_arguments`)
+        """
+        parameters = [(n, *p) for n, p in self._get_parameter_validators().items()]
+        return _compile_arguments_validator(parameters)
+
+    def _get_parameter_validators(self) -> dict[str, tuple[bool, Callable[[Any], bool]]]:
+        """
+        Get the compiled type validator of each parameter.
+
+        :return: A dictionary with parameter names as keys, and tuples consisting of whether
+            the parameter is required and the function validating its value as values
+        """
+        return self._get_cached(
+            "parameter_validators",
+            lambda: {
+                n: (p.parameter.default == Parameter.empty, p.type_schema.validator())
+                for n, p in self.parameter_schemas.items()
+            },
+        )
+
+    def _get_decode_plan(self) -> tuple[list[tuple[int, Callable]], dict[str, Callable]]:
+        """
+        Get the decode plan for this function, see `_compile_decode_plan`.
+        """
+        return self._get_cached("decode_plan", self._compile_decode_plan)
+
+    def _compile_decode_plan(self) -> tuple[list[tuple[int, Callable]], dict[str, Callable]]:
+        """
+        Compile the decoders for the parameters whose values may need to be converted from
+        their JSON representation when invoking the function. Parameters whose type never
+        requires conversion (e.g. `int` or `str`) are omitted.
+
+        :return: A tuple containing a list of positional indices and decoders, and a
+            dictionary with parameter names as keys and decoders as values
+        """
+        positional, named = [], {}
+
+        for n, p in self.parameter_schemas.items():
+            if (decode := p.type_schema.decoder()) is not None:
+                positional.append((p.index, decode))
+                named[n] = decode
+
+        return positional, named
+
+    def _get_cache_state(self) -> tuple:
+        """
+        Get a tuple identifying the state the cached values depend on.
+        """
+        return (
+            self._revision,
+            len(TYPE_SCHEMAS),  # Type schemas registered after the cached values were created
+            self.config.version,
+        )
+
     def _get_schema(self) -> dict:
         """
         Get the complete schema dictionary.
@@ -370,10 +1141,18 @@ class FunctionSchema:
 
         return schema
 
-    def _get_all_parameter_schemas(self) -> dict[str, ParameterSchema]:
+    @functools.cached_property
+    def docstring(self) -> Optional[Docstring]:
+        """
+        The parsed function docstring, shared with the parameter schemas (see Docstring.parse).
+        """
+        return Docstring.parse(self.f.__doc__) if self.f.__doc__ else None
+
+    @functools.cached_property
+    def _all_parameter_schemas(self) -> dict[str, ParameterSchema]:
         """
         Get a dictionary of all parameter schemas for the function
-        (including ignored parameters).
+        (including ignored parameters). The signature is inspected on first access.
 
         :return: A dictionary with parameter names as keys and
             parameter schemas as values
@@ -392,14 +1171,10 @@ class FunctionSchema:
 
         :return: The function description, or None if not present
         """
-        if not (docstring := self.f.__doc__) or self.config.ignore_function_description:
+        if self.docstring is None or self.config.snapshot().ignore_function_description:
             return None
 
-        docstring = " ".join([x.strip() for x in docstring.replace("\n", " ").split()])
-        if desc := re.findall(r"(.*?):param", docstring):
-            return desc[0].strip()
-
-        return docstring.strip()
+        return self.docstring.description
 
     def _get_required_parameters(self) -> list[str]:
         """
@@ -423,12 +1198,13 @@ class FunctionSchema:
 
         :return: A dictionary of parameter schemas
         """
+        config = self.config.snapshot()
         return (
             {}
-            if self.config.ignore_all_parameters
+            if config.ignore_all_parameters
             else {
                 k: v
                 for k, v in self._all_parameter_schemas.items()
-                if k not in self.config.ignore_parameters
+                if k not in config.ignore_parameters
             }
         )
@@ -0,0 +1,458 @@
+from __future__ import annotations
+
+import re
+from concurrent.futures import Executor, Future
+from types import ModuleType
+from typing import Any, Optional
+
+from tool2schema import json_backend
+from tool2schema.registry import ToolRegistry
+from tool2schema.schema import ParseException, ToolEnabled, _find_tool_enabled
+
+# States of the parser
+_START = 0  # Before the opening brace of the arguments object
+_FIRST_KEY = 1  # After the opening brace, expecting a key or the closing brace
+_KEY = 2  # After a comma, expecting a key
+_COLON = 3  # After a key, expecting a colon
+_VALUE = 4  # After a colon, expecting a value
+_AFTER_VALUE = 5  # After a value, expecting a comma or the closing brace
+_DONE = 6  # After the closing brace of the arguments object
+
+WHITESPACE = " \t\n\r"
+
+# Transitions between the states outside keys and values, given the next character
+TRANSITIONS = {
+    (_START, "{"): _FIRST_KEY,
+    (_FIRST_KEY, "}"): _DONE,
+    (_COLON, ":"): _VALUE,
+    (_AFTER_VALUE, ","): _KEY,
+    (_AFTER_VALUE, "}"): _DONE,
+}
+
+# Characters terminating the scan of string contents
+STRING_SPECIAL = re.compile(r'["\\]')
+
+# Characters changing the nesting of a value, or terminating a scalar value
+VALUE_SPECIAL = re.compile(r'["\\{}\[\],\s]')
+
+
+class StreamingArgumentsParser:
+    """
+    Incremental parser of the arguments of a tool call, given as a JSON string that arrives in
+    fragments (e.g. from a streaming completion). Each argument is validated as soon as its
+    value is complete, so that invalid tool calls can be detected (and their generation
+    cancelled) before the whole string is received.
+    """
+
+    def __init__(self, f: ToolEnabled, ignore_hallucinations: bool = True):
+        """
+        Create a new parser for the arguments of the given function.
+
+        :param f: Function with the EnableTool decorator the arguments are passed to
+        :param ignore_hallucinations: When true, hallucinated arguments are ignored; when false,
+            an exception is raised as soon as the name of a hallucinated argument is received
+        """
+        self.f = f
+        self.ignore_hallucinations = ignore_hallucinations
+        self.arguments: dict[str, Any] = {}  # Arguments validated so far
+        self._parameters = f.schema._get_parameter_validators()
+        self._state = _START
+        self._key = ""  # Name of the argument whose value is being received
+        self._token: list[str] = []  # Fragments of the key or value being received
+        self._depth = 0  # Nesting of the value being received
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the closing brace of the arguments was received.
+        """
+        return self._state == _DONE
+
+    def feed(self, chunk: str) -> list[str]:
+        """
+        Parse the next fragment of the arguments.
+
+        :param chunk: The fragment of the JSON string
+        :return: The names of the arguments whose values were completed by this fragment,
+            including hallucinated arguments when ignored
+        :raises ParseException: Thrown as soon as the received fragments are not valid JSON
+            or not a dictionary, an argument has a value that is not of the expected type, or
+            a hallucinated argument is received and `ignore_hallucinations` is false
+        """
+        completed: list[str] = []
+        i, n = 0, len(chunk)
+
+        while i < n:
+            if self._state == _KEY or self._state == _VALUE:
+                i = self._scan(chunk, i, completed)
+                continue
+
+            if (c := chunk[i]) in WHITESPACE:
+                i += 1
+                continue
+
+            if self._state == _FIRST_KEY and c == '"':
+                self._state = _KEY  # Scan the key from its opening quote
+                continue
+
+            if (state := TRANSITIONS.get((self._state, c))) is None:
+                if self._state == _START:
+                    raise ParseException("Arguments are not in the form of a dictionary")
+                raise ParseException("Arguments are not in valid JSON format")
+
+            self._state = state
+            i += 1
+
+        return completed
+
+    def close(self) -> dict[str, Any]:
+        """
+        Complete the parsing of the arguments.
+
+        :return: A dictionary of validated arguments, as returned by `LoadToolEnabled`
+        :raises ParseException: Thrown if the arguments are incomplete, or a required
+            argument is missing
+        """
+        if self._state != _DONE:
+            raise ParseException("Arguments are not in valid JSON format")
+
+        for key, (required, _) in self._parameters.items():
+            if required and key not in self.arguments:
+                raise ParseException(f"Required argument '{key}' is missing")
+
+        return dict(self.arguments)
+
+    def _scan(self, chunk: str, i: int, completed: list[str]) -> int:
+        """
+        Scan the key or value being received, skipping the whitespace preceding it.
+
+        :param chunk: The fragment of the JSON string
+        :param i: Position to start scanning at
+        :param completed: List to add the names of the completed arguments to
+        :return: The position following the scanned characters
+        """
+        if not self._token:
+            if (c := chunk[i]) in WHITESPACE:
+                return i + 1
+
+            if self._state == _KEY and c != '"':
+                raise ParseException("Arguments are not in valid JSON format")
+
+        return self._scan_token(chunk, i, completed)
+
+    def _scan_token(self, chunk: str, i: int, completed: list[str]) -> int:
+        """
+        Scan the key or value being received, starting at the given position of the fragment.
+
+        :param chunk: The fragment of the JSON string
+        :param i: Position to start scanning at
+        :param completed: List to add the names of the completed arguments to
+        :return: The position following the scanned characters
+        """
+        n = len(chunk)
+        start = i
+
+        while i < n:
+            if self._in_string:
+                i = self._scan_string(chunk, i)
+
+                if not self._in_string and self._depth == 0:
+                    # End of a key or of a string value
+                    return self._complete_token(chunk[start:i], completed, i)
+
+                continue
+
+            c = chunk[i]
+
+            if c == '"':
+                self._in_string = True
+                i += 1
+            elif c in "[{":
+                self._depth += 1
+                i += 1
+            elif c in "]}" and self._depth > 0:
+                self._depth -= 1
+                i += 1
+
+                if self._depth == 0:
+                    # End of an array or object value
+                    return self._complete_token(chunk[start:i], completed, i)
+
+            elif self._depth == 0 and (c in ",}]" or c in WHITESPACE):
+                # End of a scalar value, the terminating character is parsed by the caller
+                return self._complete_token(chunk[start:i], completed, i)
+
+            elif self._depth > 0 and (m := VALUE_SPECIAL.search(chunk, i + 1)) is not None:
+                i = m.start()  # Skip to the next character which may change the nesting
+            else:
+                i = i + 1 if self._depth == 0 else n
+
+        self._token.append(chunk[start:i])
+        return i
+
+    def _scan_string(self, chunk: str, i: int) -> int:
+        """
+        Scan the contents of a string, up to and including its closing quote.
+
+        :param chunk: The fragment of the JSON string
+        :param i: Position to start scanning at
+        :return: The position following the scanned characters
+        """
+        if self._escape:
+            self._escape = False
+            return i + 1
+
+        if (m := STRING_SPECIAL.search(chunk, i)) is None:
+            return len(chunk)
+
+        if m.group() == "\\":
+            self._escape = True
+        else:
+            self._in_string = False
+
+        return m.end()
+
+    def _complete_token(self, last: str, completed: list[str], i: int) -> int:
+        """
+        Parse and validate the key or value which was completely received.
+
+        :param last: The last fragment of the key or value
+        :param completed: List to add the name of the completed argument to
+        :param i: Position following the key or value
+        :return: The position following the key or value
+        """
+        self._token.append(last)
+        text = "".join(self._token)
+        self._token.clear()
+
+        try:
+            value = json_backend.loads(text)
+        except ValueError:
+            raise ParseException("Arguments are not in valid JSON format")
+
+        if self._state == _KEY:
+            if not self.ignore_hallucinations and value not in self._parameters:
+                raise ParseException(f"Hallucinated argument(s): {value}")
+
+            self._key = value
+            self._state = _COLON
+            return i
+
+        key = self._key
+        self._state = _AFTER_VALUE
+
+        if (parameter := self._parameters.get(key)) is not None:
+            if not parameter[1](value):
+                raise ParseException(f"Argument '{key}' cannot accept value '{value}'")
+
+            self.arguments[key] = value
+
+        completed.append(key)
+        return i
+
+
+class StreamedToolCall:
+    """
+    Tool call assembled from a stream, see `ToolCallStream`.
+    """
+
+    def __init__(self, index: int, id: Optional[str] = None, name: str = ""):
+        """
+        Create a new tool call, whose arguments have not been received yet.
+
+        :param index: Position of the tool call in the stream
+        :param id: Identifier of the tool call, if given by the model
+        :param name: Name of the function (or its first fragment)
+        """
+        self.index = index
+        self.id = id
+        self.name = name
+        self.function: Optional[ToolEnabled] = None
+        self.arguments: Optional[dict[str, Any]] = None  # Set once validated
+        self.future: Optional[Future] = None  # Set once submitted to the executor
+        self.exception: Optional[ParseException] = None  # Set if the tool call is not valid
+        self._parser: Optional[StreamingArgumentsParser] = None
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the tool call was submitted to the executor or failed to load.
+        """
+        return self.future is not None or self.exception is not None
+
+
+class ToolCallStream:
+    """
+    Accumulator of the tool calls streamed by a model, which submits each tool call to an
+    executor as soon as its arguments are complete, so that the first tool calls run while
+    the model is still generating the following ones. Supports OpenAI chat completion chunks
+    (with `tool_calls` deltas) and Anthropic message stream events (with `input_json_delta`
+    deltas). Objects with a `model_dump` method (as returned by the OpenAI and Anthropic
+    clients) are converted to dictionaries.
+    """
+
+    def __init__(self, module: ModuleType, executor: Executor, ignore_hallucinations: bool = True):
+        """
+        Create a new accumulator.
+
+        :param module: The module where the functions are defined
+        :param executor: Executor to submit the tool calls to
+        :param ignore_hallucinations: Whether to ignore hallucinated arguments (see
+            `LoadToolEnabled`)
+        """
+        self.module = module
+        self.executor = executor
+        self.ignore_hallucinations = ignore_hallucinations
+        self.calls: dict[int, StreamedToolCall] = {}
+        self._registry = ToolRegistry.of(module)
+
+    def feed(self, event: Any) -> list[StreamedToolCall]:
+        """
+        Process the next chunk or event of the stream.
+
+        :param event: An OpenAI chat completion chunk, or an Anthropic message stream event
+        :return: The tool calls completed by this event, either submitted to the executor
+            or failed to load (see `StreamedToolCall.exception`)
+        """
+        if not isinstance(event, dict) and hasattr(event, "model_dump"):
+            event = event.model_dump()
+
+        completed: list[StreamedToolCall] = []
+
+        if "choices" in event:
+            self._feed_openai_chunk(event, completed)
+        else:
+            self._feed_anthropic_event(event, completed)
+
+        return completed
+
+    def _feed_openai_chunk(self, chunk: dict, completed: list[StreamedToolCall]) -> None:
+        """
+        Process an OpenAI chat completion chunk.
+
+        :param chunk: The chunk, with key `choices`
+        :param completed: List to add the completed tool calls to
+        """
+        for choice in chunk["choices"]:
+            for delta in (choice.get("delta") or {}).get("tool_calls") or ():
+                self._feed_openai(delta, completed)
+
+            if choice.get("finish_reason") is not None:
+                for call in self.calls.values():
+                    self._finish(call, completed)
+
+    def _feed_anthropic_event(self, event: dict, completed: list[StreamedToolCall]) -> None:
+        """
+        Process an Anthropic message stream event. Events unrelated to tool calls are ignored.
+
+        :param event: The event, with key `type`
+        :param completed: List to add the completed tool calls to
+        """
+        if (kind := event.get("type")) == "content_block_start":
+            if (block := event.get("content_block") or {}).get("type") == "tool_use":
+                call = StreamedToolCall(event["index"], block.get("id"), block.get("name") or "")
+                self.calls[call.index] = call
+
+        elif kind == "content_block_delta":
+            delta = event.get("delta") or {}
+
+            if delta.get("type") == "input_json_delta" and (call := self.calls.get(event["index"])):
+                self._feed_arguments(call, delta.get("partial_json") or "", completed)
+
+        elif kind == "content_block_stop" and (call := self.calls.get(event["index"])):
+            self._finish(call, completed)
+
+    def close(self) -> list[StreamedToolCall]:
+        """
+        Complete all the tool calls at the end of the stream.
+
+        :return: All the tool calls, in the order they were streamed
+        """
+        completed: list[StreamedToolCall] = []
+
+        for call in self.calls.values():
+            self._finish(call, completed)
+
+        return [self.calls[i] for i in sorted(self.calls)]
+
+    def _feed_openai(self, delta: dict, completed: list[StreamedToolCall]) -> None:
+        """
+        Process an OpenAI tool call delta.
+
+        :param delta: The tool call delta, with keys `index`, `id` and `function`
+        :param completed: List to add the completed tool calls to
+        """
+        function = delta.get("function") or {}
+
+        if (call := self.calls.get(index := delta.get("index", 0))) is None:
+            call = self.calls[index] = StreamedToolCall(index, delta.get("id"))
+
+        if call._parser is None:
+            # The name is complete once the arguments start
+            call.name += function.get("name") or ""
+
+        self._feed_arguments(call, function.get("arguments") or "", completed)
+
+    def _feed_arguments(
+        self, call: StreamedToolCall, fragment: str, completed: list[StreamedToolCall]
+    ) -> None:
+        """
+        Parse the next fragment of the arguments of a tool call, submitting the tool call
+        to the executor if its arguments are complete.
+
+        :param call: The tool call
+        :param fragment: The fragment of the arguments
+        :param completed: List to add the tool call to, if completed
+        """
+        if call.done or not fragment:
+            return
+
+        try:
+            if call._parser is None:
+                call.function = _find_tool_enabled(self._registry, self.module, call.name)
+                call._parser = StreamingArgumentsParser(call.function, self.ignore_hallucinations)
+
+            call._parser.feed(fragment)
+
+            if call._parser.done:
+                self._submit(call)
+
+        except ParseException as e:
+            call.exception = e
+
+        if call.done:
+            completed.append(call)
+
+    def _finish(self, call: StreamedToolCall, completed: list[StreamedToolCall]) -> None:
+        """
+        Complete a tool call whose arguments were entirely received.
+
+        :param call: The tool call
+        :param completed: List to add the tool call to, if not already completed
+        """
+        if call.done:
+            return
+
+        if call._parser is None:
+            # Functions without arguments may not receive any fragment
+            self._feed_arguments(call, "{}", completed)
+            return
+
+        try:
+            self._submit(call)
+        except ParseException as e:
+            call.exception = e
+
+        completed.append(call)
+
+    def _submit(self, call: StreamedToolCall) -> None:
+        """
+        Validate the complete arguments of a tool call and submit it to the executor.
+
+        :param call: The tool call
+        :raises ParseException: If the arguments are not complete or valid
+        """
+        call.arguments = call._parser.close()  # type: ignore
+        call.future = self.executor.submit(call.function, **call.arguments)  # type: ignore
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import re
+from typing import Mapping, Union
+
+# Tokens of a query: parentheses, quoted tags and unquoted tags or keywords
+_TOKEN = re.compile(r'\s*(?:(\(|\))|"([^"]*)"|([^\s()"]+))')
+
+# Tags which can be written without quotes (unless equal to a keyword)
+_UNQUOTED = re.compile(r'[^\s()"]+')
+
+_KEYWORDS = ("AND", "OR", "NOT")
+
+
+class TagQuery:
+    """
+    Boolean query over the tags of functions with the EnableTool decorator, combining tags with
+    AND, OR and NOT. Queries are immutable and hashable, so that the results of each distinct
+    query can be memoized (see `ToolRegistry.query`).
+
+    Queries are created by parsing an expression, e.g. `TagQuery.parse("(a OR b) AND NOT c")`,
+    or by combining tags with the `&`, `|` and `~` operators, e.g.
+    `(TagQuery.tag("a") | TagQuery.tag("b")) & ~TagQuery.tag("c")`.
+    """
+
+    __slots__ = ("op", "operands", "_hash")
+
+    def __init__(self, op: str, operands: tuple):
+        """
+        Create a new query, see `TagQuery.parse` and `TagQuery.tag`.
+
+        :param op: One of `tag`, `and`, `or` and `not`
+        :param operands: The tag name for `tag`, otherwise the queries to combine
+        """
+        self.op = op
+        self.operands = operands
+        self._hash = hash((op, operands))
+
+    @staticmethod
+    def tag(name: str) -> TagQuery:
+        """
+        Create a query matching the functions with the given tag.
+
+        :param name: Name of the tag
+        """
+        return TagQuery("tag", (name,))
+
+    @staticmethod
+    def parse(expression: str) -> TagQuery:
+        """
+        Parse a query expression. Tags are combined with the `AND`, `OR` and `NOT` keywords
+        (in order of increasing precedence) and parentheses. Tags containing whitespace,
+        parentheses or equal to a keyword must be enclosed in double quotes.
+
+        :param expression: The query expression, e.g. `(billing OR crm) AND NOT admin`
+        :return: The parsed query
+        :raises ValueError: Thrown if the expression is not valid
+        """
+        tokens = _tokenize(expression)
+        query, i = _parse_or(tokens, 0)
+
+        if i != len(tokens):
+            raise ValueError(f"Unexpected '{tokens[i][0]}' in tag query: {expression}")
+
+        return query
+
+    @staticmethod
+    def of(query: Union[str, TagQuery]) -> TagQuery:
+        """
+        Get a query matching a single tag if given a string, otherwise the query itself.
+
+        :param query: Name of a tag, or a query
+        """
+        return TagQuery.tag(query) if isinstance(query, str) else query
+
+    def evaluate(self, bits: Mapping[str, int], everything: int) -> int:
+        """
+        Evaluate the query over bitsets of functions, where bit `i` is set if the function with
+        identifier `i` is included.
+
+        :param bits: Bitset of the functions with each tag
+        :param everything: Bitset of all functions
+        :return: Bitset of the functions matching the query
+        """
+        if self.op == "tag":
+            return bits.get(self.operands[0], 0)
+
+        if self.op == "not":
+            return everything & ~self.operands[0].evaluate(bits, everything)
+
+        results = (x.evaluate(bits, everything) for x in self.operands)
+        result = next(results)
+
+        for x in results:
+            result = result & x if self.op == "and" else result | x
+
+        return result
+
+    def __and__(self, other: Union[str, TagQuery]) -> TagQuery:
+        return _combine("and", self, TagQuery.of(other))
+
+    def __or__(self, other: Union[str, TagQuery]) -> TagQuery:
+        return _combine("or", self, TagQuery.of(other))
+
+    def __invert__(self) -> TagQuery:
+        return TagQuery("not", (self,))
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, TagQuery)
+            and self.op == other.op
+            and self.operands == other.operands
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __str__(self) -> str:
+        if self.op == "tag":
+            name = self.operands[0]
+            return name if _UNQUOTED.fullmatch(name) and name not in _KEYWORDS else f'"{name}"'
+
+        if self.op == "not":
+            return f"NOT {_format_operand(self.operands[0])}"
+
+        return f" {self.op.upper()} ".join(_format_operand(x) for x in self.operands)
+
+    def __repr__(self) -> str:
+        return f"TagQuery.parse({str(self)!r})"
+
+
+def _combine(op: str, left: TagQuery, right: TagQuery) -> TagQuery:
+    """
+    Combine two queries with AND or OR, flattening nested queries with the same operator.
+    """
+    operands = left.operands if left.op == op else (left,)
+    operands += right.operands if right.op == op else (right,)
+    return TagQuery(op, operands)
+
+
+def _format_operand(query: TagQuery) -> str:
+    """
+    Format a query nested in another, adding parentheses where needed.
+    """
+    return str(query) if query.op in ("tag", "not") else f"({query})"
+
+
+def _tokenize(expression: str) -> list[tuple[str, bool]]:
+    """
+    Split a query expression into tokens.
+
+    :param expression: The query expression
+    :return: A list of tuples consisting of the token and whether it is a tag
+    """
+    tokens = []
+    i, end = 0, len(expression.rstrip())
+
+    while i < end:
+        if not (match := _TOKEN.match(expression, i)):
+            raise ValueError(f"Invalid tag query: {expression}")
+
+        symbol, quoted, word = match.groups()
+
+        if quoted is not None:
+            tokens.append((quoted, True))
+        else:
+            token = symbol or word
+            tokens.append((token, token not in _KEYWORDS and not symbol))
+
+        i = match.end()
+
+    return tokens
+
+
+def _parse_or(tokens: list[tuple[str, bool]], i: int) -> tuple[TagQuery, int]:
+    """
+    Parse queries separated by OR, starting from token `i`.
+
+    :return: A tuple consisting of the query and the index of the next token
+    """
+    query, i = _parse_and(tokens, i)
+
+    while i < len(tokens) and tokens[i] == ("OR", False):
+        right, i = _parse_and(tokens, i + 1)
+        query = _combine("or", query, right)
+
+    return query, i
+
+
+def _parse_and(tokens: list[tuple[str, bool]], i: int) -> tuple[TagQuery, int]:
+    """
+    Parse queries separated by AND, starting from token `i`.
+
+    :return: A tuple consisting of the query and the index of the next token
+    """
+    query, i = _parse_not(tokens, i)
+
+    while i < len(tokens) and tokens[i] == ("AND", False):
+        right, i = _parse_not(tokens, i + 1)
+        query = _combine("and", query, right)
+
+    return query, i
+
+
+def _parse_not(tokens: list[tuple[str, bool]], i: int) -> tuple[TagQuery, int]:
+    """
+    Parse a tag, a negated query or a query in parentheses, starting from token `i`.
+
+    :return: A tuple consisting of the query and the index of the next token
+    """
+    if i >= len(tokens):
+        raise ValueError("Unexpected end of tag query")
+
+    token, is_tag = tokens[i]
+
+    if is_tag:
+        return TagQuery.tag(token), i + 1
+
+    if token == "NOT":
+        query, i = _parse_not(tokens, i + 1)
+        return ~query, i
+
+    if token == "(":
+        query, i = _parse_or(tokens, i + 1)
+
+        if i >= len(tokens) or tokens[i] != (")", False):
+            raise ValueError("Missing closing parenthesis in tag query")
+
+        return query, i + 1
+
+    raise ValueError(f"Unexpected '{token}' in tag query")
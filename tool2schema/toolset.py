@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional
+
+from tool2schema.registry import ToolRegistry
+
+if TYPE_CHECKING:
+    from tool2schema.config import SchemaType
+    from tool2schema.schema import ToolEnabled
+
+
+class Toolset(ToolRegistry):
+    """
+    Collection of functions with the EnableTool decorator gathered once from any number of
+    modules, classes, instances and lists of functions, with a single index by name and by tag.
+    A toolset can be given in place of a module to `LoadToolEnabled` and the `FindToolEnabled*`
+    functions, and toolsets can be combined with `|` (union) and `-` (difference) without
+    scanning their sources again.
+    """
+
+    def __init__(self, *sources: Any):
+        """
+        Create a new toolset containing the functions of the given sources. Each source is one of:
+            - A module, contributing its functions with the EnableTool decorator
+            - A class, contributing its attributes with the EnableTool decorator (including
+              those of its base classes)
+            - An instance of a class, contributing its methods with the EnableTool decorator
+              bound to the instance
+            - A function with the EnableTool decorator, or a toolset
+            - An iterable of any of the above
+
+        :param sources: Sources of functions with the EnableTool decorator
+        :raises ValueError: Thrown if different functions have the same name
+        """
+        super().__init__(tool for source in sources for tool in _find_tools(source))
+
+    def add(self, tool: ToolEnabled) -> None:
+        """
+        Add a function to the toolset. Adding a function already in the toolset has no effect.
+
+        :param tool: Function with the EnableTool decorator
+        :raises ValueError: Thrown if a different function with the same name is in the toolset
+        """
+        if (existing := self._by_name.get(tool.__name__)) is not None:
+            if existing == tool:
+                return  # Same function found in more than one source
+
+            raise ValueError(f"Function name '{tool.__name__}' is defined more than once")
+
+        super().add(tool)
+
+    def schemas(self, schema_type: Optional[SchemaType] = None) -> list[dict]:
+        """
+        Return the schemas of all functions in the toolset.
+
+        :param schema_type: Type of schema to return (None indicates default)
+        :return: A list of JSON schemas
+        """
+        return [x.to_json(schema_type) for x in self.tools]
+
+    def __or__(self, other: Any) -> Toolset:
+        return Toolset(self, other)
+
+    def __sub__(self, other: Any) -> Toolset:
+        if not isinstance(other, ToolRegistry):
+            other = Toolset(other)
+
+        return Toolset(x for x in self.tools if x.__name__ not in other)
+
+    def __repr__(self) -> str:
+        return f"Toolset({', '.join(self._by_name)})"
+
+
+def _find_tools(source: Any) -> Iterator[ToolEnabled]:
+    """
+    Find the functions with the EnableTool decorator in the given source, see `Toolset`.
+
+    :param source: Source of functions with the EnableTool decorator
+    :return: An iterator over the functions found
+    """
+    if isinstance(source, ToolRegistry):
+        yield from source.tools
+    elif isinstance(source, ModuleType):
+        yield from ToolRegistry.of(source).tools
+    elif hasattr(source, "tool_enabled"):
+        yield source
+    elif isinstance(source, (str, bytes)):
+        raise TypeError(f"Cannot find functions in a source of type {type(source)}")
+    elif isinstance(source, Iterable) and not isinstance(source, type):
+        for item in source:
+            yield from _find_tools(item)
+    else:
+        yield from _find_attributes(source)
+
+
+def _find_attributes(source: Any) -> Iterator[ToolEnabled]:
+    """
+    Find the attributes with the EnableTool decorator of a class or instance, in the order they
+    are defined. Methods accessed from an instance are bound to it.
+
+    :param source: A class or an instance of a class
+    :return: An iterator over the functions found
+    """
+    cls = source if isinstance(source, type) else type(source)
+    attributes = {k: v for klass in reversed(cls.__mro__) for k, v in vars(klass).items()}
+
+    for name, attribute in attributes.items():
+        if isinstance(attribute, staticmethod):
+            attribute = attribute.__func__
+
+        # Only inspect the class attributes, so that properties are not evaluated
+        if hasattr(attribute, "tool_enabled"):
+            yield getattr(source, name)
@@ -3,12 +3,16 @@ from __future__ import annotations
 import typing
 from enum import Enum
 from inspect import Parameter, isclass
-from typing import Literal, Optional, Type, Union
+from typing import Any, Callable, Literal, Optional, Type, Union
 
 # Order matters: specific classes should appear before more generic ones,
 # because the first matching schema will be used
 TYPE_SCHEMAS: list[Type[TypeSchema]] = []
 
+# Type schema class matching each type annotation resolved so far (see `TypeSchema.create`),
+# cleared whenever a new type schema class is registered
+RESOLVED_TYPE_SCHEMAS: dict[Any, Optional[Type[TypeSchema]]] = {}
+
 
 def ToolTypeSchema(cls: Type[TypeSchema]):
     """
@@ -16,6 +20,7 @@ def ToolTypeSchema(cls: Type[TypeSchema]):
     """
     cls.priority = len(TYPE_SCHEMAS)
     TYPE_SCHEMAS.insert(0, cls)  # Push to the front
+    RESOLVED_TYPE_SCHEMAS.clear()
     return cls
 
 
@@ -41,9 +46,27 @@ class TypeSchema:
 
         :return: An instance of `TypeSchema`, or None if the type is not supported.
         """
+        try:
+            schema = RESOLVED_TYPE_SCHEMAS[p_type]
+        except KeyError:
+            schema = RESOLVED_TYPE_SCHEMAS[p_type] = TypeSchema._resolve(p_type)
+        except TypeError:
+            # The type annotation is not hashable
+            schema = TypeSchema._resolve(p_type)
+
+        if schema is not None:
+            return schema(p_type)
+
+    @staticmethod
+    def _resolve(p_type: Type) -> Optional[Type[TypeSchema]]:
+        """
+        Find the first registered type schema class matching the given type.
+
+        :return: The type schema class, or None if the type is not supported.
+        """
         for schema in TYPE_SCHEMAS:
             if schema.matches(p_type):
-                return schema(p_type)
+                return schema
 
     @staticmethod
     def matches(p_type: Type) -> bool:
@@ -76,6 +99,19 @@ class TypeSchema:
         """
         return value
 
+    def decoder(self) -> Optional[Callable[[Any], Any]]:
+        """
+        Compile this type schema into a function equivalent to `decode`, or return None if
+        decoding never converts the value. Child classes overriding `decode` should also
+        override this method if the conversion can be avoided or compiled.
+
+        :return: A function converting a value from its JSON representation, or None
+            if no conversion is necessary
+        """
+        if type(self).decode is TypeSchema.decode:
+            return None
+        return self.decode
+
     def validate(self, value) -> bool:
         """
         Return true if the given value can be considered an instance of this type or can be
@@ -87,6 +123,31 @@ class TypeSchema:
         """
         raise NotImplementedError()
 
+    def validator(self) -> Callable[[Any], bool]:
+        """
+        Compile this type schema into a function equivalent to `validate`. The sub-type
+        schemas are resolved once when compiling, so the returned function is considerably
+        faster than `validate` when called repeatedly. Child classes should override this
+        method whenever they override `validate`.
+
+        :return: A function taking a value and returning true if the value is
+            or can be decoded to an instance of this type
+        """
+        return self.validate
+
+    def plan(self) -> list:
+        """
+        Get a JSON-serialisable description of this type schema, from which a function
+        equivalent to `validator` can be compiled without resolving the type again (see
+        `tool2schema.artifact`). Child classes should override this method whenever they
+        override `validate`, otherwise artifacts validate the parameters of this type by
+        importing the function.
+
+        :return: A list whose first element identifies the kind of type schema
+        :raises NotImplementedError: If the type schema does not support validation plans
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support validation plans")
+
     def _get_type(self) -> dict:
         """
         Get the type dictionary to be merged in the JSON schema.
@@ -144,6 +205,19 @@ class ValueTypeSchema(TypeSchema):
             return True
         return self.type == type(value)
 
+    def plan(self) -> list:
+        if not isclass(self.type) or typing.get_origin(self.type) is not None:
+            # Generic aliases (e.g. dict[str, int]) and other annotations which are not
+            # classes are never equal to the type of a value, so no value is valid
+            return ["value", None]
+        return ["value", f"{self.type.__module__}.{self.type.__qualname__}"]
+
+    def validator(self) -> Callable[[Any], bool]:
+        p_type = self.type
+        if p_type is float:
+            return lambda value: type(value) is float or type(value) is int
+        return lambda value: p_type == type(value)
+
     def _get_type(self) -> dict:
         if self.type is not None:
             return {"type": self.TYPE_MAP.get(self.type.__name__, "object")}
@@ -155,11 +229,24 @@ class GenericTypeSchema(TypeSchema):
     Base class for generic types supporting subscription.
     """
 
+    def __init__(self, p_type: Optional[Type] = None):
+        super().__init__(p_type)
+        # Sub-type schemas, resolved once and resolved again only
+        # if new type schema classes are registered in the meantime
+        self._sub_types: list[TypeSchema] = []
+        self._sub_types_registered = -1
+
     def _get_sub_types(self) -> list[TypeSchema]:
         """
         :return: A list of type schemas corresponding to the generic type arguments.
         """
-        return [t for arg in typing.get_args(self.type) if (t := TypeSchema.create(arg)) is not None]
+        if self._sub_types_registered != len(TYPE_SCHEMAS):
+            self._sub_types = [
+                t for arg in typing.get_args(self.type) if (t := TypeSchema.create(arg)) is not None
+            ]
+            self._sub_types_registered = len(TYPE_SCHEMAS)
+
+        return self._sub_types
 
     def _get_sub_type(self) -> Optional[TypeSchema]:
         """
@@ -202,6 +289,11 @@ class ListTypeSchema(GenericTypeSchema):
 
         return value
 
+    def decoder(self) -> Optional[Callable[[Any], Any]]:
+        if (sub_type := self._get_sub_type()) is None or (decode := sub_type.decoder()) is None:
+            return None
+        return lambda value: [decode(v) for v in value]
+
     def validate(self, value) -> bool:
         if type(value) is not list:
             return False
@@ -211,6 +303,18 @@ class ListTypeSchema(GenericTypeSchema):
 
         return True
 
+    def plan(self) -> list:
+        if (sub_type := self._get_sub_type()) is None:
+            return ["list", None]
+        return ["list", sub_type.plan()]
+
+    def validator(self) -> Callable[[Any], bool]:
+        if (sub_type := self._get_sub_type()) is None:
+            return lambda value: type(value) is list
+
+        validate = sub_type.validator()
+        return lambda value: type(value) is list and all(map(validate, value))
+
 
 @ToolTypeSchema
 class UnionTypeSchema(GenericTypeSchema):
@@ -218,6 +322,11 @@ class UnionTypeSchema(GenericTypeSchema):
     Type schema for typing.Optional types.
     """
 
+    def __init__(self, p_type: Optional[Type] = None):
+        super().__init__(p_type)
+        self._sorted: list[TypeSchema] = []
+        self._sorted_source: Optional[list[TypeSchema]] = None
+
     @staticmethod
     def matches(p_type: Type) -> bool:
         return p_type != Parameter.empty and typing.get_origin(p_type) is Union
@@ -229,7 +338,14 @@ class UnionTypeSchema(GenericTypeSchema):
         """
         :return: Subtypes sorted by priority.
         """
-        return sorted(self._get_sub_types(), key=lambda t: t.priority, reverse=True)
+        sub_types = self._get_sub_types()
+
+        if self._sorted_source is not sub_types:
+            # The sub-types have been resolved again since they were last sorted
+            self._sorted = sorted(sub_types, key=lambda t: t.priority, reverse=True)
+            self._sorted_source = sub_types
+
+        return self._sorted
 
     def encode(self, value):
         # Delegate encoding to the first matching subtype
@@ -248,9 +364,32 @@ class UnionTypeSchema(GenericTypeSchema):
 
         return value
 
+    def decoder(self) -> Optional[Callable[[Any], Any]]:
+        # Subtypes that never convert the value can be skipped
+        decoders = [d for t in self._sorted_sub_types() if (d := t.decoder()) is not None]
+
+        if not decoders:
+            return None
+
+        def decode(value):
+            for sub_decode in decoders:
+                if (dec := sub_decode(value)) != value:
+                    return dec
+
+            return value
+
+        return decode
+
     def validate(self, value) -> bool:
         return any(sub_type.validate(value) for sub_type in self._get_sub_types())
 
+    def plan(self) -> list:
+        return ["union", [sub_type.plan() for sub_type in self._get_sub_types()]]
+
+    def validator(self) -> Callable[[Any], bool]:
+        validators = tuple(sub_type.validator() for sub_type in self._get_sub_types())
+        return lambda value: any(validate(value) for validate in validators)
+
 
 class EnumTypeSchema(TypeSchema):
     """
@@ -272,6 +411,27 @@ class EnumTypeSchema(TypeSchema):
     def validate(self, value) -> bool:
         return value in self.enum_values
 
+    def plan(self) -> list:
+        return ["enum", list(self.enum_values)]
+
+    def validator(self) -> Callable[[Any], bool]:
+        values = self.enum_values
+
+        try:
+            hashed_values = frozenset(values)
+        except TypeError:
+            # Some enumeration values are not hashable
+            return lambda value: value in values
+
+        def validate(value) -> bool:
+            try:
+                return value in hashed_values
+            except TypeError:
+                # The value is not hashable
+                return value in values
+
+        return validate
+
 
 @ToolTypeSchema
 class EnumClassTypeSchema(EnumTypeSchema):